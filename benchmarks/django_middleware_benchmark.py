@@ -0,0 +1,131 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+"""
+Compares the sync Django middleware with the previous implementation, which
+ran st.middleware through asgiref's async_to_sync for every request, not only
+for the ones that a recipe API may handle. Neither
+of the measured requests calls the core: a non-API path and a refresh without
+a refresh token (401).
+
+In process: python benchmarks/django_middleware_benchmark.py [iterations]
+
+Under gunicorn sync workers, serve the app with either middleware and load
+it with any HTTP load generator (wrk, hey, ab, ...):
+
+    SUPERTOKENS_BENCHMARK_MIDDLEWARE=legacy gunicorn -w 4 -k sync \\
+        --chdir benchmarks django_middleware_benchmark:application
+    SUPERTOKENS_BENCHMARK_MIDDLEWARE=current gunicorn -w 4 -k sync \\
+        --chdir benchmarks django_middleware_benchmark:application
+    wrk -t 4 -c 32 -d 30s http://127.0.0.1:8000/hello
+"""
+import os
+import sys
+from time import perf_counter
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.urls import path
+
+from supertokens_python import init, SupertokensConfig, InputAppInfo, Supertokens
+from supertokens_python.exceptions import SuperTokensError
+from supertokens_python.framework.django import middleware
+from supertokens_python.framework.django.django_request import DjangoRequest
+from supertokens_python.framework.django.django_response import DjangoResponse
+from supertokens_python.recipe import session
+from supertokens_python.recipe.session import Session
+from supertokens_python.supertokens import manage_cookies_post_response
+
+
+def legacy_middleware(get_response):
+    def __middleware(request):
+        st = Supertokens.get_instance()
+        custom_request = DjangoRequest(request)
+        response = DjangoResponse(HttpResponse())
+        try:
+            result = async_to_sync(st.middleware)(custom_request, response)
+            if result is None:
+                result = DjangoResponse(get_response(request))
+            if hasattr(request, "supertokens") and isinstance(request.supertokens, Session):
+                manage_cookies_post_response(request.supertokens, result)
+            return result.response
+        except SuperTokensError as e:
+            response = DjangoResponse(HttpResponse())
+            result = async_to_sync(st.handle_supertokens_error)(DjangoRequest(request), e, response)
+            return result.response
+
+    return __middleware
+
+
+def hello(request):
+    return JsonResponse({'status': 'OK'})
+
+
+urlpatterns = [path('hello', hello)]
+
+MIDDLEWARE = {
+    'legacy': 'django_middleware_benchmark.legacy_middleware',
+    'current': 'supertokens_python.framework.django.django_middleware.middleware'
+}
+
+if not settings.configured:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    settings.configure(
+        DEBUG=False,
+        SECRET_KEY='benchmark',
+        ALLOWED_HOSTS=['*'],
+        ROOT_URLCONF='django_middleware_benchmark',
+        MIDDLEWARE=[MIDDLEWARE[os.environ.get('SUPERTOKENS_BENCHMARK_MIDDLEWARE', 'current')]]
+    )
+    os.environ.setdefault('SUPERTOKENS_ENV', 'testing')
+    init(
+        supertokens_config=SupertokensConfig('http://localhost:3567'),
+        app_info=InputAppInfo(
+            app_name='SuperTokens Benchmark',
+            api_domain='http://localhost:8000',
+            website_domain='http://localhost:3000'
+        ),
+        framework='django',
+        mode='wsgi',
+        recipe_list=[session.init()]
+    )
+
+from django.core.wsgi import get_wsgi_application  # noqa: E402
+
+application = get_wsgi_application()
+
+
+def main():
+    from django.test import RequestFactory
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    factory = RequestFactory()
+    requests = {
+        'GET /hello': lambda: factory.get('/hello'),
+        'POST /auth/session/refresh': lambda: factory.post('/auth/session/refresh')
+    }
+    print('Django sync middleware, %d requests each' % iterations)
+    for request_name, create_request in requests.items():
+        for name, create_middleware in [('legacy', legacy_middleware), ('current', middleware)]:
+            handler = create_middleware(hello)
+            handler(create_request())
+            start = perf_counter()
+            for _ in range(iterations):
+                handler(create_request())
+            seconds = perf_counter() - start
+            print('%-28s %-8s %10.0f requests/s   %8.1f us/request' % (
+                request_name, name, iterations / seconds, seconds * 1000000 / iterations))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+"""
+Compares the JSON codecs on a large `get_users` page, i.e. decoding the
+core's /users response in the Querier and encoding it again in a framework
+response wrapper.
+
+Usage: python benchmarks/json_codec_benchmark.py [page_size] [iterations]
+"""
+import sys
+from timeit import timeit
+
+from supertokens_python.json_codec import OrjsonJSONCodec, StdlibJSONCodec
+
+
+def get_users_page(page_size: int) -> dict:
+    users = []
+    for i in range(page_size):
+        if i % 2 == 0:
+            user = {
+                'recipeId': 'emailpassword',
+                'user': {
+                    'id': 'b6d2b6c2-6f79-4a6e-9bd4-%012d' % i,
+                    'email': 'user%d@example.com' % i,
+                    'timeJoined': 1643723000000 + i
+                }
+            }
+        else:
+            user = {
+                'recipeId': 'thirdparty',
+                'user': {
+                    'id': 'c1a9f5e0-2d4b-4c1e-8f3a-%012d' % i,
+                    'email': 'user%d@gmail.com' % i,
+                    'timeJoined': 1643723000000 + i,
+                    'thirdParty': {
+                        'id': 'google',
+                        'userId': '10%018d' % i
+                    }
+                }
+            }
+        users.append(user)
+    return {'status': 'OK', 'users': users, 'nextPaginationToken': 'MTY0MzcyMzAwMDUwMA=='}
+
+
+def main():
+    page_size = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    page = get_users_page(page_size)
+
+    codecs = [StdlibJSONCodec()]
+    try:
+        codecs.append(OrjsonJSONCodec())
+    except Exception:
+        print('orjson is not installed, only benchmarking the stdlib codec')
+
+    encoded = codecs[0].dumps(page)
+    print('get_users page: %d users, %d bytes, %d iterations' % (page_size, len(encoded), iterations))
+    results = {}
+    for codec in codecs:
+        loads_ms = timeit(lambda: codec.loads(encoded), number=iterations) * 1000 / iterations
+        dumps_ms = timeit(lambda: codec.dumps(page), number=iterations) * 1000 / iterations
+        results[codec.name] = (loads_ms, dumps_ms)
+        print('%-8s loads: %8.3f ms   dumps: %8.3f ms' % (codec.name, loads_ms, dumps_ms))
+
+    if 'orjson' in results:
+        stdlib, orjson = results['stdlib'], results['orjson']
+        print('speedup  loads: %7.1fx    dumps: %7.1fx' % (stdlib[0] / orjson[0], stdlib[1] / orjson[1]))
+
+
+if __name__ == '__main__':
+    main()
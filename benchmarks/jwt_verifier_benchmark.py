@@ -0,0 +1,36 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+"""
+Reports the RS256 verifications per second of each access token verifier
+backend, i.e. the cost of verifying an access token without calling the core.
+
+Usage: python benchmarks/jwt_verifier_benchmark.py [iterations]
+"""
+import sys
+
+from supertokens_python.recipe.session.jwt import benchmark_verifier_backends, create_verifier_backend
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    results = benchmark_verifier_backends(iterations=iterations)
+    print('RS256 (2048 bit) verification, %d iterations' % iterations)
+    for name, verifications_per_second in results.items():
+        print('%-13s %10.0f verifications/s   %8.1f us/verification' % (
+            name, verifications_per_second, 1000000 / verifications_per_second))
+    print('"auto" selects: %s' % create_verifier_backend('auto').name)
+
+
+if __name__ == '__main__':
+    main()
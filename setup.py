@@ -31,6 +31,7 @@ extras_require = {
 
 exclude_list = [
     "tests",
+    "benchmarks",
     "examples",
     "hooks",
     ".gitignore",
@@ -17,6 +17,14 @@ from .supertokens import Supertokens
 from .recipe import session
 from typing import List, Union, Callable
 from .supertokens import SupertokensConfig, InputAppInfo, AppInfo
+from .connection_pool import ConnectionPoolConfig
+from .host_selector import HostSelector, RoundRobinHostSelector, HealthAwareHostSelector
+from .response_cache import ResponseCacheConfig
+from .retry import RetryConfig, deadline
+from .admission_control import AdmissionControlConfig
+from .json_codec import JSONCodec, StdlibJSONCodec, OrjsonJSONCodec
+from .hedging import HedgingConfig
+from .api_version_cache import ApiVersionCacheConfig
 from .recipe_module import RecipeModule
 try:
     from typing import Literal
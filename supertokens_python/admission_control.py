@@ -0,0 +1,229 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from threading import Event, Lock
+from time import monotonic
+from typing import Deque, Dict, List, Union
+
+from .exceptions import raise_general_exception
+from .retry import get_remaining_seconds
+
+
+class AdmissionControlConfig:
+    def __init__(self,
+                 max_concurrent_requests: Union[int, None] = 100,
+                 max_concurrent_requests_per_path: Union[Dict[str, int], None] = None,
+                 max_queue_size: int = 1000,
+                 max_queue_wait_seconds: Union[float, None] = None):
+        if max_concurrent_requests_per_path is None:
+            max_concurrent_requests_per_path = {}
+        self.max_concurrent_requests = max_concurrent_requests
+        self.max_concurrent_requests_per_path = max_concurrent_requests_per_path
+        self.max_queue_size = max_queue_size
+        self.max_queue_wait_seconds = max_queue_wait_seconds
+
+
+class _Waiter:
+    def __init__(self, loop: Union[asyncio.AbstractEventLoop, None]):
+        self.loop = loop
+        self.future = loop.create_future() if loop is not None else None
+        self.event = Event() if loop is None else None
+        self.granted = False
+
+    def wake(self):
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self.__set_result)
+
+    def __set_result(self):
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class AdmissionGate:
+    """
+    A semaphore with a bounded FIFO wait queue that can be used from any
+    event loop or thread. Once `max_queue_size` callers are waiting, new
+    callers are rejected straight away instead of piling up.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue_size: int):
+        self.name = name
+        self.limit = limit
+        self.max_queue_size = max_queue_size
+        self.in_flight = 0
+        self.__waiters: Deque[_Waiter] = deque()
+        self.__lock = Lock()
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.max_queue_depth = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def __try_enter(self, loop: Union[asyncio.AbstractEventLoop, None]) -> Union[_Waiter, None]:
+        with self.__lock:
+            if self.in_flight < self.limit and len(self.__waiters) == 0:
+                self.in_flight += 1
+                self.admitted += 1
+                return None
+            if len(self.__waiters) >= self.max_queue_size:
+                self.rejected += 1
+                raise_general_exception('Too many pending requests to the SuperTokens core for ' + self.name)
+            waiter = _Waiter(loop)
+            self.__waiters.append(waiter)
+            self.max_queue_depth = max(self.max_queue_depth, len(self.__waiters))
+            return waiter
+
+    def __on_wait_finished(self, waiter: _Waiter, start_time: float):
+        wait_seconds = monotonic() - start_time
+        with self.__lock:
+            if waiter.granted:
+                self.admitted += 1
+                self.total_wait_seconds += wait_seconds
+                self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+                return
+            self.__waiters.remove(waiter)
+            self.timed_out += 1
+        raise_general_exception('Timed out waiting to send a request to the SuperTokens core for ' + self.name)
+
+    async def acquire(self, timeout: Union[float, None]):
+        waiter = self.__try_enter(asyncio.get_event_loop())
+        if waiter is None:
+            return
+        start_time = monotonic()
+        try:
+            await asyncio.wait_for(waiter.future, timeout)
+        except asyncio.TimeoutError:
+            pass
+        except BaseException:
+            with self.__lock:
+                if not waiter.granted:
+                    self.__waiters.remove(waiter)
+                    raise
+            # the slot was handed over to us just as we were cancelled
+            self.release()
+            raise
+        self.__on_wait_finished(waiter, start_time)
+
+    def sync_acquire(self, timeout: Union[float, None]):
+        waiter = self.__try_enter(None)
+        if waiter is None:
+            return
+        start_time = monotonic()
+        waiter.event.wait(timeout)
+        self.__on_wait_finished(waiter, start_time)
+
+    def release(self):
+        with self.__lock:
+            while len(self.__waiters) > 0:
+                waiter = self.__waiters.popleft()
+                try:
+                    waiter.wake()
+                except RuntimeError:
+                    # the waiter's event loop has been closed
+                    continue
+                # the slot is handed over, so in_flight stays the same
+                waiter.granted = True
+                return
+            self.in_flight -= 1
+
+    def get_stats(self) -> dict:
+        with self.__lock:
+            waits = self.admitted
+            return {
+                'name': self.name,
+                'limit': self.limit,
+                'inFlight': self.in_flight,
+                'queueDepth': len(self.__waiters),
+                'maxQueueDepth': self.max_queue_depth,
+                'admitted': self.admitted,
+                'rejected': self.rejected,
+                'timedOut': self.timed_out,
+                'avgWaitMs': self.total_wait_seconds * 1000 / waits if waits > 0 else 0.0,
+                'maxWaitMs': self.max_wait_seconds * 1000
+            }
+
+
+class AdmissionController:
+    """
+    Limits the number of concurrent requests sent to the SuperTokens core,
+    both in total and per core API path. A request first waits for its path
+    gate (if any) and then for the global gate.
+    """
+
+    def __init__(self, config: Union[AdmissionControlConfig, None] = None):
+        if config is None:
+            config = AdmissionControlConfig()
+        self.config = config
+        self.__global_gate = None
+        if config.max_concurrent_requests is not None:
+            self.__global_gate = AdmissionGate('all paths', config.max_concurrent_requests, config.max_queue_size)
+        self.__path_gates = {
+            path: AdmissionGate(path, limit, config.max_queue_size)
+            for path, limit in config.max_concurrent_requests_per_path.items()
+        }
+
+    def __get_gates(self, path: str) -> List[AdmissionGate]:
+        gates = []
+        path_gate = self.__path_gates.get(path)
+        if path_gate is not None:
+            gates.append(path_gate)
+        if self.__global_gate is not None:
+            gates.append(self.__global_gate)
+        return gates
+
+    def __get_timeout(self) -> Union[float, None]:
+        timeout = self.config.max_queue_wait_seconds
+        remaining = get_remaining_seconds()
+        if remaining is not None:
+            timeout = max(0.0, remaining) if timeout is None else max(0.0, min(timeout, remaining))
+        return timeout
+
+    async def acquire(self, path: str) -> List[AdmissionGate]:
+        acquired = []
+        try:
+            for gate in self.__get_gates(path):
+                await gate.acquire(self.__get_timeout())
+                acquired.append(gate)
+        except BaseException:
+            self.release(acquired)
+            raise
+        return acquired
+
+    def sync_acquire(self, path: str) -> List[AdmissionGate]:
+        acquired = []
+        try:
+            for gate in self.__get_gates(path):
+                gate.sync_acquire(self.__get_timeout())
+                acquired.append(gate)
+        except BaseException:
+            self.release(acquired)
+            raise
+        return acquired
+
+    @staticmethod
+    def release(gates: List[AdmissionGate]):
+        for gate in reversed(gates):
+            gate.release()
+
+    def get_stats(self) -> dict:
+        return {
+            'global': self.__global_gate.get_stats() if self.__global_gate is not None else None,
+            'paths': [gate.get_stats() for gate in self.__path_gates.values()]
+        }
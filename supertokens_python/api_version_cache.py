@@ -0,0 +1,96 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import json
+import os
+from tempfile import NamedTemporaryFile
+from typing import Union
+
+from .constants import SUPPORTED_CDI_VERSIONS
+from .utils import get_timestamp_ms
+
+API_VERSION_CACHE_FILE_ENV_VAR = 'SUPERTOKENS_API_VERSION_CACHE_FILE'
+
+
+class ApiVersionCacheConfig:
+    def __init__(self, file_path: Union[str, None] = None, ttl_seconds: float = 24 * 60 * 60):
+        self.file_path = file_path
+        self.ttl_seconds = ttl_seconds
+
+
+class ApiVersionFileCache:
+    """
+    Persists the CDI version negotiated with the core in a local JSON file,
+    keyed by connection URI, so that new processes (serverless cold starts,
+    new gunicorn workers, ...) do not have to call /apiversion again. The
+    file path comes from the config or the SUPERTOKENS_API_VERSION_CACHE_FILE
+    environment variable. Any error while reading or writing the file is
+    ignored, since the version can always be fetched from the core.
+    """
+
+    def __init__(self, config: ApiVersionCacheConfig):
+        self.config = config
+
+    def get_file_path(self) -> Union[str, None]:
+        if self.config.file_path is not None:
+            return self.config.file_path
+        return os.environ.get(API_VERSION_CACHE_FILE_ENV_VAR)
+
+    def __read(self, file_path: str) -> dict:
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            if isinstance(entries, dict):
+                return entries
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def get(self, connection_key: str) -> Union[str, None]:
+        file_path = self.get_file_path()
+        if file_path is None:
+            return None
+        entry = self.__read(file_path).get(connection_key)
+        if not isinstance(entry, dict):
+            return None
+        api_version = entry.get('apiVersion')
+        time_cached = entry.get('timeCached')
+        if api_version not in SUPPORTED_CDI_VERSIONS or not isinstance(time_cached, int):
+            return None
+        if get_timestamp_ms() - time_cached > self.config.ttl_seconds * 1000:
+            return None
+        return api_version
+
+    def put(self, connection_key: str, api_version: str):
+        file_path = self.get_file_path()
+        if file_path is None:
+            return
+        entries = self.__read(file_path)
+        entries[connection_key] = {
+            'apiVersion': api_version,
+            'timeCached': get_timestamp_ms()
+        }
+        temp_file_path = None
+        try:
+            directory = os.path.dirname(os.path.abspath(file_path))
+            with NamedTemporaryFile('w', encoding='utf-8', dir=directory, prefix='.supertokens-',
+                                    delete=False) as f:
+                temp_file_path = f.name
+                json.dump(entries, f)
+            # concurrent readers either see the old or the new file, never a partial one
+            os.replace(temp_file_path, file_path)
+        except OSError:
+            if temp_file_path is not None and os.path.exists(temp_file_path):
+                os.remove(temp_file_path)
@@ -13,11 +13,16 @@
 # under the License.
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from functools import singledispatch, wraps
 import asyncio
 import inspect
+import threading
 import types
-from typing import Any, Callable, Generator
+import weakref
+from os import getpid
+from typing import Any, Callable, Coroutine, Generator
 
 PY35 = sys.version_info >= (3, 5)
 
@@ -39,6 +44,75 @@ def check_event_loop():
             asyncio.set_event_loop(loop)
 
 
+_thread_local = threading.local()
+
+
+def _close_event_loop(loop: asyncio.AbstractEventLoop):
+    from .connection_pool import ConnectionPool
+    try:
+        ConnectionPool.close_clients_of_event_loop(loop)
+        loop.run_until_complete(loop.shutdown_asyncgens())
+    except Exception:
+        pass
+    finally:
+        loop.close()
+
+
+class _ThreadEventLoop:
+    # kept in a thread local, so it is collected (and its loop closed) when
+    # the thread exits
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.pid = getpid()
+        self.finalizer = weakref.finalize(self, _close_event_loop, loop)
+
+
+def get_thread_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns the event loop that sync code in the current thread runs its
+    coroutines on. It is created on first use and reused for every later
+    call from the same thread, so that the connections to the core and the
+    other state bound to an event loop are reused across requests. The loop
+    and its connections are closed when the thread exits.
+    """
+    thread_loop = getattr(_thread_local, 'loop', None)
+    if thread_loop is not None and thread_loop.pid != getpid():
+        # a loop inherited from the parent process cannot be used (or
+        # closed) after a fork
+        thread_loop.finalizer.detach()
+        thread_loop = None
+    if thread_loop is None or thread_loop.loop.is_closed():
+        thread_loop = _ThreadEventLoop(asyncio.new_event_loop())
+        _thread_local.loop = thread_loop
+    return thread_loop.loop
+
+
+def _is_event_loop_running() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+def _run_on_new_event_loop(co: Coroutine) -> Any:
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(co)
+    finally:
+        _close_event_loop(loop)
+
+
+def _run_coroutine(co: Coroutine) -> Any:
+    if not _is_event_loop_running():
+        return get_thread_event_loop().run_until_complete(co)
+    # sync was called from a coroutine. The running loop cannot be entered
+    # again, so the coroutine runs on a new loop in a helper thread, with the
+    # caller's context variables
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(copy_context().run, _run_on_new_event_loop, co).result()
+
+
 @singledispatch
 def sync(co: Any):
     raise TypeError('Called with unsupported argument: {}'.format(co))
@@ -49,8 +123,10 @@ def sync(co: Any):
 def sync_co(co: Generator[Any, None, Any]) -> Any:
     if not _is_awaitable(co):
         raise TypeError('Called with unsupported argument: {}'.format(co))
-    check_event_loop()
-    return asyncio.get_event_loop().run_until_complete(co)
+    if not asyncio.iscoroutine(co):
+        check_event_loop()
+        return asyncio.get_event_loop().run_until_complete(co)
+    return _run_coroutine(co)
 
 
 @sync.register(types.FunctionType)
@@ -61,7 +137,7 @@ def sync_fu(f: Callable[..., Any]) -> Callable[..., Any]:
 
     @wraps(f)
     def run(*args, **kwargs):
-        return asyncio.get_event_loop().run_until_complete(f(*args, **kwargs))
+        return _run_coroutine(f(*args, **kwargs))
 
     return run
 
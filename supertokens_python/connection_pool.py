@@ -0,0 +1,213 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import asyncio
+import atexit
+from importlib.util import find_spec
+from inspect import signature
+from threading import Lock
+from typing import Dict, Union, TYPE_CHECKING
+
+from .exceptions import raise_general_exception
+
+if TYPE_CHECKING:
+    from httpx import AsyncClient, Client, Limits
+
+
+async def _close_async_client(client: AsyncClient):
+    # once the loop that a client was used on is closed, closing a connection
+    # raises (after its socket is closed), so the connections are closed one
+    # by one
+    pool = getattr(getattr(client, '_transport', None), '_pool', None)
+    for connection in list(getattr(pool, 'connections', [])):
+        try:
+            await connection.aclose()
+        except Exception:
+            pass
+    try:
+        await client.aclose()
+    except Exception:
+        pass
+
+
+def _close_async_client_of_closed_loop(client: AsyncClient, current_loop: Union[asyncio.AbstractEventLoop, None]):
+    if current_loop is not None and current_loop.is_running():
+        task = current_loop.create_task(_close_async_client(client))
+        _closing_tasks.add(task)
+        task.add_done_callback(_closing_tasks.discard)
+        return
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(_close_async_client(client))
+    finally:
+        loop.close()
+
+
+# keeps the tasks that close clients of closed loops alive until they are done
+_closing_tasks = set()
+
+
+class ConnectionPoolConfig:
+    def __init__(self,
+                 max_connections: Union[int, None] = 100,
+                 max_keepalive_connections: Union[int, None] = 20,
+                 keepalive_expiry: Union[float, None] = 5.0,
+                 http2: bool = False):
+        if http2 and find_spec('h2') is None:
+            raise_general_exception(
+                'http2 is enabled in ConnectionPoolConfig but the h2 package is not installed. '
+                'Please run: pip install httpx[http2]')
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+
+
+class ConnectionPool:
+    """
+    Process wide pool of keep-alive connections to the SuperTokens core.
+
+    httpx clients are bound to the event loop they were first used on, so one
+    client is lazily created per event loop and reused for every core call
+    made from that loop. The clients of the loops that sync() creates for a
+    thread are closed with the loop when the thread exits, the clients of
+    other loops that have been closed once a client is created for another
+    loop. Synchronous (wsgi)
+    callers share a single thread-safe client. All clients are closed on
+    interpreter shutdown.
+    """
+    __pools = []
+
+    def __init__(self, config: Union[ConnectionPoolConfig, None] = None):
+        if config is None:
+            config = ConnectionPoolConfig()
+        self.config = config
+        self.__lock = Lock()
+        self.__clients: Dict[asyncio.AbstractEventLoop, AsyncClient] = {}
+        self.__sync_client: Union[Client, None] = None
+        ConnectionPool.__pools.append(self)
+
+    def __get_limits(self) -> Limits:
+        from httpx import Limits
+        # httpx versions older than 0.16 always use a keep-alive expiry of 5 seconds
+        if 'keepalive_expiry' in signature(Limits).parameters:
+            return Limits(max_connections=self.config.max_connections,
+                          max_keepalive_connections=self.config.max_keepalive_connections,
+                          keepalive_expiry=self.config.keepalive_expiry)
+        return Limits(max_connections=self.config.max_connections,
+                      max_keepalive_connections=self.config.max_keepalive_connections)
+
+    def __create_async_client(self) -> AsyncClient:
+        from httpx import AsyncClient
+        if self.config.http2:
+            return AsyncClient(limits=self.__get_limits(), http2=True)
+        return AsyncClient(limits=self.__get_limits())
+
+    def __create_sync_client(self) -> Client:
+        from httpx import Client
+        if self.config.http2:
+            return Client(limits=self.__get_limits(), http2=True)
+        return Client(limits=self.__get_limits())
+
+    def get_async_client(self) -> AsyncClient:
+        loop = asyncio.get_event_loop()
+        client = self.__clients.get(loop)
+        if client is not None:
+            return client
+        closed_clients = []
+        with self.__lock:
+            client = self.__clients.get(loop)
+            if client is None:
+                # the clients of closed loops can not be used anymore, but
+                # their connections are still open
+                for closed_loop in [other for other in self.__clients.keys() if other.is_closed()]:
+                    closed_clients.append(self.__clients.pop(closed_loop))
+                client = self.__create_async_client()
+                self.__clients[loop] = client
+        for closed_client in closed_clients:
+            try:
+                _close_async_client_of_closed_loop(closed_client, loop)
+            except Exception:
+                pass
+        return client
+
+    def get_sync_client(self) -> Client:
+        client = self.__sync_client
+        if client is not None:
+            return client
+        with self.__lock:
+            if self.__sync_client is None:
+                self.__sync_client = self.__create_sync_client()
+            return self.__sync_client
+
+    async def aclose(self):
+        loop = asyncio.get_event_loop()
+        with self.__lock:
+            client = self.__clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    def close(self):
+        if self in ConnectionPool.__pools:
+            ConnectionPool.__pools.remove(self)
+        with self.__lock:
+            clients = list(self.__clients.items())
+            self.__clients = {}
+            sync_client = self.__sync_client
+            self.__sync_client = None
+
+        if sync_client is not None:
+            try:
+                sync_client.close()
+            except Exception:
+                pass
+
+        try:
+            current_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+
+        for loop, client in clients:
+            try:
+                if loop.is_closed():
+                    _close_async_client_of_closed_loop(client, current_loop)
+                elif loop is current_loop:
+                    loop.create_task(client.aclose())
+                elif loop.is_running():
+                    asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=1)
+                else:
+                    loop.run_until_complete(client.aclose())
+            except Exception:
+                pass
+
+    def __close_client_of_event_loop(self, loop: asyncio.AbstractEventLoop):
+        with self.__lock:
+            client = self.__clients.pop(loop, None)
+        if client is not None:
+            loop.run_until_complete(_close_async_client(client))
+
+    @staticmethod
+    def close_clients_of_event_loop(loop: asyncio.AbstractEventLoop):
+        # for loops that are about to be closed (and are not running)
+        for pool in list(ConnectionPool.__pools):
+            pool.__close_client_of_event_loop(loop)
+
+    @staticmethod
+    def close_all():
+        for pool in list(ConnectionPool.__pools):
+            pool.close()
+
+
+atexit.register(ConnectionPool.close_all)
@@ -14,6 +14,7 @@
 from __future__ import annotations
 
 import asyncio
+
 from asgiref.sync import async_to_sync
 
 
@@ -28,14 +29,16 @@ def middleware(get_response):
     if asyncio.iscoroutinefunction(get_response):
         async def __middleware(request):
             st = Supertokens.get_instance()
-            custom_request = DjangoRequest(request)
             from django.http import HttpResponse
-            response = DjangoResponse(HttpResponse())
             try:
-                result = await st.middleware(custom_request, response)
+                result = None
+                if st.is_api_request(request.path, request.method):
+                    result = await st.middleware(DjangoRequest(request), DjangoResponse(HttpResponse()))
                 if result is None:
-                    result = await get_response(request)
-                    result = DjangoResponse(result)
+                    response = await get_response(request)
+                    if not isinstance(getattr(request, 'supertokens', None), Session):
+                        return response
+                    result = DjangoResponse(response)
                 if hasattr(request, "supertokens") and isinstance(request.supertokens, Session):
                     manage_cookies_post_response(request.supertokens, result)
                 return result.response
@@ -48,15 +51,19 @@ def middleware(get_response):
     else:
         def __middleware(request):
             st = Supertokens.get_instance()
-            custom_request = DjangoRequest(request)
             from django.http import HttpResponse
-            response = DjangoResponse(HttpResponse())
             try:
-                result = async_to_sync(st.middleware)(custom_request, response)
+                result = None
+                # async_to_sync runs sync_to_async(thread_sensitive=True) calls
+                # of overrides on this thread, where Django's connections are
+                if st.is_api_request(request.path, request.method):
+                    result = async_to_sync(st.middleware)(DjangoRequest(request), DjangoResponse(HttpResponse()))
 
                 if result is None:
-                    result = get_response(request)
-                    result = DjangoResponse(result)
+                    response = get_response(request)
+                    if not isinstance(getattr(request, 'supertokens', None), Session):
+                        return response
+                    result = DjangoResponse(response)
 
                 if hasattr(request, "supertokens") and isinstance(request.supertokens, Session):
                     manage_cookies_post_response(request.supertokens, result)
@@ -12,9 +12,9 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-import json
 from typing import Any, Union
 from supertokens_python.framework.request import BaseRequest
+from supertokens_python.json_codec import get_json_codec
 from urllib.parse import parse_qsl
 
 
@@ -29,7 +29,7 @@ class DjangoRequest(BaseRequest):
 
     async def json(self):
         try:
-            body = json.loads(self.request.body)
+            body = get_json_codec().loads(self.request.body)
             return body
         except Exception:
             return {}
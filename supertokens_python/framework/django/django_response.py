@@ -11,11 +11,11 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
-import json
 from math import ceil
 from time import time
 
 from supertokens_python.framework.response import BaseResponse
+from supertokens_python.json_codec import get_json_codec
 
 
 class DjangoResponse(BaseResponse):
@@ -64,11 +64,5 @@ class DjangoResponse(BaseResponse):
     def set_json_content(self, content):
         if not self.response_sent:
             self.set_header('Content-Type', 'application/json; charset=utf-8')
-            self.response.content = json.dumps(
-                content,
-                ensure_ascii=False,
-                allow_nan=False,
-                indent=None,
-                separators=(",", ":"),
-            ).encode("utf-8")
+            self.response.content = get_json_codec().dumps(content)
             self.response_sent = True
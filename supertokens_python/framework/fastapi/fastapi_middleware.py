@@ -11,38 +11,72 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+from supertokens_python.framework.fastapi.fastapi_request import get_scope_path
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 
-
-class Middleware(BaseHTTPMiddleware):
+class Middleware:
+    """
+    Raw ASGI middleware. Requests outside of the API base path are passed on
+    without creating any request or response wrapper, and response bodies are
+    always streamed untouched: only the `http.response.start` message is
+    changed, to add the session cookies and headers.
+    """
 
     def __init__(self, app):
-        super().__init__(app)
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request, call_next: RequestResponseEndpoint):
-        from supertokens_python.framework.fastapi.fastapi_request import FastApiRequest
-        from supertokens_python.framework.fastapi.fastapi_response import FastApiResponse
         from supertokens_python import Supertokens
         from supertokens_python.exceptions import SuperTokensError
-        from supertokens_python.recipe.session import Session
-        from supertokens_python.supertokens import manage_cookies_post_response
         st = Supertokens.get_instance()
-        from fastapi.responses import Response
+        # verify_session stores the session in the request state, which must be shared with the app
+        state = scope.setdefault('state', {})
+        response_started = False
+
+        async def send_with_session_cookies(message):
+            nonlocal response_started
+            if message['type'] == 'http.response.start':
+                response_started = True
+                if state.get('supertokens') is not None:
+                    message = add_session_cookies(state['supertokens'], message)
+            await send(message)
 
         try:
-            custom_request = FastApiRequest(request)
-            response = FastApiResponse(Response())
-            result = await st.middleware(custom_request, response)
-            if result is None:
-                response = await call_next(request)
-                result = FastApiResponse(response)
-
-            if hasattr(request.state, "supertokens") and isinstance(
-                    request.state.supertokens, Session):
-                manage_cookies_post_response(request.state.supertokens, result)
-            return result.response
+            if st.is_api_path(get_scope_path(scope)):
+                from starlette.requests import Request
+                from fastapi.responses import Response
+                from supertokens_python.framework.fastapi.fastapi_request import FastApiRequest
+                from supertokens_python.framework.fastapi.fastapi_response import FastApiResponse
+                result = await st.middleware(FastApiRequest(Request(scope, receive)), FastApiResponse(Response()))
+                if result is not None:
+                    await result.response(scope, receive, send_with_session_cookies)
+                    return
+            await self.app(scope, receive, send_with_session_cookies)
         except SuperTokensError as e:
-            response = FastApiResponse(Response())
-            result = await st.handle_supertokens_error(FastApiRequest(request), e, response)
-            return result.response
+            if response_started:
+                raise
+            from starlette.requests import Request
+            from fastapi.responses import Response
+            from supertokens_python.framework.fastapi.fastapi_request import FastApiRequest
+            from supertokens_python.framework.fastapi.fastapi_response import FastApiResponse
+            result = await st.handle_supertokens_error(FastApiRequest(Request(scope, receive)), e,
+                                                       FastApiResponse(Response()))
+            await result.response(scope, receive, send)
+
+
+def add_session_cookies(session, message: dict) -> dict:
+    from fastapi.responses import Response
+    from supertokens_python.framework.fastapi.fastapi_response import FastApiResponse
+    from supertokens_python.recipe.session import Session
+    from supertokens_python.supertokens import manage_cookies_post_response
+    if not isinstance(session, Session):
+        return message
+    response = Response(status_code=message['status'])
+    # the cookies and headers are added to the headers of the app's response
+    response.raw_headers = list(message.get('headers', []))
+    manage_cookies_post_response(session, FastApiResponse(response))
+    return {**message, 'headers': response.raw_headers}
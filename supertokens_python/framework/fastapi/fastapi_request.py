@@ -17,6 +17,16 @@ from supertokens_python.framework.request import BaseRequest
 from urllib.parse import parse_qsl
 
 
+def get_scope_path(scope) -> str:
+    # servers that follow the ASGI spec include the root_path in the path,
+    # older servers and some proxies send it separately
+    path = scope['path']
+    root_path = scope.get('root_path', '')
+    if root_path == '' or path.startswith(root_path):
+        return path
+    return root_path + path
+
+
 class FastApiRequest(BaseRequest):
 
     def __init__(self, request):
@@ -52,7 +62,7 @@ class FastApiRequest(BaseRequest):
         self.request.state.supertokens = session
 
     def get_path(self) -> str:
-        return self.request.url.path
+        return get_scope_path(self.request.scope)
 
     async def form_data(self):
         return dict(parse_qsl((await self.request.body()).decode('utf-8')))
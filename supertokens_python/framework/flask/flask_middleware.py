@@ -12,7 +12,6 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-import json
 from supertokens_python.async_to_sync_wrapper import sync
 
 
@@ -35,6 +34,10 @@ class Middleware:
             from flask import Response
 
             st = Supertokens.get_instance()
+            # the other requests are passed on without creating any wrapper or running the event loop
+            path = request.path if request.script_root == '' else request.script_root + request.path
+            if not st.is_api_request(path, request.method):
+                return None
 
             request_ = FlaskRequest(request)
             response_ = FlaskResponse(Response())
@@ -63,8 +66,9 @@ class Middleware:
             from supertokens_python import Supertokens
             from supertokens_python.framework.flask.flask_request import FlaskRequest
             from supertokens_python.framework.flask.flask_response import FlaskResponse
+            from supertokens_python.json_codec import get_json_codec
             st = Supertokens.get_instance()
-            response = Response(json.dumps({}),
+            response = Response(get_json_codec().dumps({}),
                                 mimetype='application/json',
                                 status=200)
             result = sync(st.handle_supertokens_error(FlaskRequest(request), error, FlaskResponse(response)))
@@ -0,0 +1,119 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from collections import deque
+from threading import Lock
+from typing import Deque, Set, Union
+
+from .retry import IDEMPOTENT_POST_PATHS
+
+
+class HedgingConfig:
+    def __init__(self,
+                 delay_percentile: float = 95.0,
+                 initial_delay_ms: float = 100.0,
+                 min_delay_ms: float = 5.0,
+                 max_delay_ms: Union[float, None] = None,
+                 min_samples: int = 20,
+                 window_size: int = 1000,
+                 max_hedge_ratio: float = 0.05,
+                 max_hedge_burst: float = 10,
+                 post_paths: Union[Set[str], None] = None):
+        if post_paths is None:
+            post_paths = IDEMPOTENT_POST_PATHS
+        self.delay_percentile = delay_percentile
+        self.initial_delay_ms = initial_delay_ms
+        self.min_delay_ms = min_delay_ms
+        self.max_delay_ms = max_delay_ms
+        self.min_samples = min_samples
+        self.window_size = window_size
+        self.max_hedge_ratio = max_hedge_ratio
+        self.max_hedge_burst = max_hedge_burst
+        self.post_paths = post_paths
+
+
+class HedgingPolicy:
+    """
+    Decides when a backup request is sent to another core host.
+
+    The hedge delay is the `delay_percentile` of recently observed core
+    latencies, so only requests that are slower than usual get hedged. Every
+    request earns `max_hedge_ratio` tokens and every hedge spends one, which
+    bounds the extra load on the core to that ratio (plus a small burst).
+    """
+    # the delay percentile is only recomputed after this many new samples
+    __RECOMPUTE_INTERVAL = 50
+
+    def __init__(self, config: Union[HedgingConfig, None] = None):
+        if config is None:
+            config = HedgingConfig()
+        self.config = config
+        self.__latencies_ms: Deque[float] = deque(maxlen=config.window_size)
+        self.__samples_since_recompute = 0
+        self.__delay_ms = config.initial_delay_ms
+        self.__tokens = config.max_hedge_burst
+        self.__lock = Lock()
+        self.total_requests = 0
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+        self.throttled_hedges = 0
+
+    def should_hedge(self, method: str, path: str) -> bool:
+        return method == 'GET' or (method == 'POST' and path in self.config.post_paths)
+
+    def get_delay_seconds(self) -> float:
+        with self.__lock:
+            self.total_requests += 1
+            self.__tokens = min(self.config.max_hedge_burst, self.__tokens + self.config.max_hedge_ratio)
+            return self.__delay_ms / 1000
+
+    def try_acquire_hedge(self) -> bool:
+        with self.__lock:
+            if self.__tokens < 1:
+                self.throttled_hedges += 1
+                return False
+            self.__tokens -= 1
+            self.hedged_requests += 1
+            return True
+
+    def on_hedge_won(self):
+        with self.__lock:
+            self.hedge_wins += 1
+
+    def record_latency(self, latency_ms: float):
+        with self.__lock:
+            self.__latencies_ms.append(latency_ms)
+            self.__samples_since_recompute += 1
+            if len(self.__latencies_ms) < self.config.min_samples or \
+                    self.__samples_since_recompute < min(HedgingPolicy.__RECOMPUTE_INTERVAL, self.config.min_samples):
+                return
+            self.__samples_since_recompute = 0
+            latencies = sorted(self.__latencies_ms)
+            index = min(len(latencies) - 1, int(len(latencies) * self.config.delay_percentile / 100))
+            delay_ms = max(self.config.min_delay_ms, latencies[index])
+            if self.config.max_delay_ms is not None:
+                delay_ms = min(self.config.max_delay_ms, delay_ms)
+            self.__delay_ms = delay_ms
+
+    def get_stats(self) -> dict:
+        with self.__lock:
+            return {
+                'delayMs': self.__delay_ms,
+                'totalRequests': self.total_requests,
+                'hedgedRequests': self.hedged_requests,
+                'hedgeWins': self.hedge_wins,
+                'throttledHedges': self.throttled_hedges,
+                'hedgeRatio': self.hedged_requests / self.total_requests if self.total_requests > 0 else 0.0
+            }
@@ -0,0 +1,255 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Callable, Dict, List, Set, Union
+
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
+
+if TYPE_CHECKING:
+    from .supertokens import Host
+
+CircuitState = Literal['CLOSED', 'OPEN', 'HALF_OPEN']
+
+# the latency of hosts that no request has succeeded on yet, if no other
+# host has a latency either
+DEFAULT_LATENCY_MS = 100.0
+
+
+def get_host_key(host: Host) -> str:
+    return host.domain.get_as_string_dangerous() + host.base_path.get_as_string_dangerous()
+
+
+class HostSelector(ABC):
+    """
+    Decides which of the configured SuperTokens core hosts a request is sent to.
+
+    The querier reports the outcome of every request back to the selector
+    so that implementations can keep track of host health.
+    """
+
+    @abstractmethod
+    def select_host(self, hosts: List[Host], exclude: Set[str]) -> Union[Host, None]:
+        pass
+
+    def on_request_success(self, host: Host, latency_ms: float):
+        pass
+
+    def on_request_failure(self, host: Host):
+        pass
+
+    def release_probe(self, host: Host):
+        # called once the querier is done with a host returned by select_host,
+        # however the request ended (including when it was cancelled)
+        pass
+
+    def get_host_stats(self) -> List[dict]:
+        return []
+
+
+class RoundRobinHostSelector(HostSelector):
+    def __init__(self):
+        self.__last_tried_index = 0
+        self.__lock = Lock()
+
+    def select_host(self, hosts: List[Host], exclude: Set[str]) -> Union[Host, None]:
+        with self.__lock:
+            for _ in range(len(hosts)):
+                index = self.__last_tried_index % len(hosts)
+                self.__last_tried_index = (index + 1) % len(hosts)
+                if get_host_key(hosts[index]) not in exclude:
+                    return hosts[index]
+        return None
+
+
+class HostStats:
+    def __init__(self, host: str):
+        self.host = host
+        self.state: CircuitState = 'CLOSED'
+        self.ewma_latency_ms: Union[float, None] = None
+        self.ewma_error_rate = 0.0
+        self.consecutive_failures = 0
+        self.total_requests = 0
+        self.total_failures = 0
+        self.opened_at = 0.0
+        self.probes_in_flight = 0
+
+    def to_json(self) -> dict:
+        return {
+            'host': self.host,
+            'state': self.state,
+            'ewmaLatencyMs': self.ewma_latency_ms,
+            'ewmaErrorRate': self.ewma_error_rate,
+            'consecutiveFailures': self.consecutive_failures,
+            'totalRequests': self.total_requests,
+            'totalFailures': self.total_failures,
+            'probesInFlight': self.probes_in_flight
+        }
+
+
+class HealthAwareHostSelector(HostSelector):
+    """
+    Routes requests to the healthiest core host.
+
+    Every host has a circuit breaker. Hosts with a closed circuit are ranked
+    by their exponentially weighted moving average latency (the median one
+    for hosts without a latency), penalised by their recent error rate. A circuit opens after `failure_threshold`
+    consecutive failures (or when the error rate crosses
+    `error_rate_threshold`), stays open for `open_duration_seconds` and then
+    lets up to `half_open_max_probes` probe requests through. A successful
+    probe closes the circuit again, a failed one re-opens it.
+    """
+
+    def __init__(self,
+                 ewma_alpha: float = 0.3,
+                 failure_threshold: int = 3,
+                 error_rate_threshold: float = 0.5,
+                 min_requests_for_error_rate: int = 10,
+                 open_duration_seconds: float = 10.0,
+                 half_open_max_probes: int = 1,
+                 on_state_change: Union[Callable[[str, CircuitState, CircuitState], None], None] = None):
+        self.ewma_alpha = ewma_alpha
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.min_requests_for_error_rate = min_requests_for_error_rate
+        self.open_duration_seconds = open_duration_seconds
+        self.half_open_max_probes = half_open_max_probes
+        self.on_state_change = on_state_change
+        self.__stats: Dict[str, HostStats] = {}
+        self.__lock = Lock()
+        self.__next_tie_breaker = 0
+
+    def __get_stats(self, key: str) -> HostStats:
+        stats = self.__stats.get(key)
+        if stats is None:
+            stats = HostStats(key)
+            self.__stats[key] = stats
+        return stats
+
+    def __set_state(self, stats: HostStats, state: CircuitState):
+        old_state = stats.state
+        if old_state == state:
+            return
+        stats.state = state
+        if state == 'OPEN':
+            stats.opened_at = monotonic()
+        if state != 'HALF_OPEN':
+            stats.probes_in_flight = 0
+        if self.on_state_change is not None:
+            try:
+                self.on_state_change(stats.host, old_state, state)
+            except Exception:
+                pass
+
+    @staticmethod
+    def __get_default_latency(candidates: List[HostStats]) -> float:
+        # hosts without a latency (for example because they have only failed
+        # so far) are scored as if they were as fast as the median host, so
+        # that their error rate still counts
+        latencies = sorted(stats.ewma_latency_ms for stats in candidates if stats.ewma_latency_ms is not None)
+        if len(latencies) == 0:
+            return DEFAULT_LATENCY_MS
+        return latencies[len(latencies) // 2]
+
+    @staticmethod
+    def __score(stats: HostStats, default_latency: float) -> float:
+        latency = stats.ewma_latency_ms if stats.ewma_latency_ms is not None else default_latency
+        return latency * (1 + 4 * stats.ewma_error_rate)
+
+    def select_host(self, hosts: List[Host], exclude: Set[str]) -> Union[Host, None]:
+        now = monotonic()
+        with self.__lock:
+            candidates = []
+            fallback_host = None
+            fallback_opened_at = None
+            offset = self.__next_tie_breaker
+            self.__next_tie_breaker += 1
+            for i in range(len(hosts)):
+                host = hosts[(offset + i) % len(hosts)]
+                key = get_host_key(host)
+                if key in exclude:
+                    continue
+                stats = self.__get_stats(key)
+                if stats.state == 'OPEN' and now - stats.opened_at >= self.open_duration_seconds:
+                    self.__set_state(stats, 'HALF_OPEN')
+                if stats.state == 'OPEN' or (
+                        stats.state == 'HALF_OPEN' and stats.probes_in_flight >= self.half_open_max_probes):
+                    if fallback_opened_at is None or stats.opened_at < fallback_opened_at:
+                        fallback_host = host
+                        fallback_opened_at = stats.opened_at
+                    continue
+                candidates.append((host, stats))
+
+            best_host = None
+            best_score = None
+            default_latency = self.__get_default_latency([stats for _, stats in candidates])
+            for host, stats in candidates:
+                score = self.__score(stats, default_latency)
+                if best_score is None or score < best_score:
+                    best_host = host
+                    best_score = score
+
+            if best_host is None:
+                # every remaining host is unavailable, so we try the one that
+                # has been failing for the longest instead of giving up
+                return fallback_host
+
+            stats = self.__get_stats(get_host_key(best_host))
+            if stats.state == 'HALF_OPEN':
+                stats.probes_in_flight += 1
+            return best_host
+
+    def on_request_success(self, host: Host, latency_ms: float):
+        with self.__lock:
+            stats = self.__get_stats(get_host_key(host))
+            stats.total_requests += 1
+            stats.consecutive_failures = 0
+            if stats.ewma_latency_ms is None:
+                stats.ewma_latency_ms = latency_ms
+            else:
+                stats.ewma_latency_ms += self.ewma_alpha * (latency_ms - stats.ewma_latency_ms)
+            stats.ewma_error_rate -= self.ewma_alpha * stats.ewma_error_rate
+            if stats.state != 'CLOSED':
+                self.__set_state(stats, 'CLOSED')
+
+    def on_request_failure(self, host: Host):
+        with self.__lock:
+            stats = self.__get_stats(get_host_key(host))
+            stats.total_requests += 1
+            stats.total_failures += 1
+            stats.consecutive_failures += 1
+            stats.ewma_error_rate += self.ewma_alpha * (1 - stats.ewma_error_rate)
+            if stats.state == 'HALF_OPEN':
+                self.__set_state(stats, 'OPEN')
+            elif stats.state == 'CLOSED' and (
+                    stats.consecutive_failures >= self.failure_threshold or
+                    (stats.total_requests >= self.min_requests_for_error_rate and
+                     stats.ewma_error_rate >= self.error_rate_threshold)):
+                self.__set_state(stats, 'OPEN')
+
+    def release_probe(self, host: Host):
+        with self.__lock:
+            stats = self.__get_stats(get_host_key(host))
+            if stats.state == 'HALF_OPEN' and stats.probes_in_flight > 0:
+                stats.probes_in_flight -= 1
+
+    def get_host_stats(self) -> List[dict]:
+        with self.__lock:
+            return [stats.to_json() for stats in self.__stats.values()]
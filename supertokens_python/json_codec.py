@@ -0,0 +1,107 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import json
+from abc import ABC, abstractmethod
+from importlib.util import find_spec
+from typing import Any, Union
+
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
+
+from .exceptions import raise_general_exception
+
+
+class JSONCodec(ABC):
+    """
+    Encodes and decodes the JSON sent to / received from the SuperTokens core
+    and the frontend. `dumps` always returns compact UTF-8 encoded bytes and
+    `loads` raises a `json.JSONDecodeError` for invalid input.
+    """
+    name = ''
+
+    @abstractmethod
+    def dumps(self, obj: Any, sort_keys: bool = False) -> bytes:
+        pass
+
+    @abstractmethod
+    def loads(self, data: Union[str, bytes]) -> Any:
+        pass
+
+
+class StdlibJSONCodec(JSONCodec):
+    name = 'stdlib'
+
+    def dumps(self, obj: Any, sort_keys: bool = False) -> bytes:
+        return json.dumps(
+            obj,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+            sort_keys=sort_keys
+        ).encode("utf-8")
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonJSONCodec(JSONCodec):
+    name = 'orjson'
+
+    def __init__(self):
+        if find_spec('orjson') is None:
+            raise_general_exception('The orjson JSON codec is enabled but the orjson package is not installed. '
+                                    'Please run: pip install orjson')
+        import orjson
+        self.__orjson = orjson
+
+    def dumps(self, obj: Any, sort_keys: bool = False) -> bytes:
+        option = self.__orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= self.__orjson.OPT_SORT_KEYS
+        return self.__orjson.dumps(obj, option=option)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+        return self.__orjson.loads(data)
+
+
+_codec: JSONCodec = StdlibJSONCodec()
+
+
+def create_json_codec(codec: Union[JSONCodec, Literal['stdlib', 'orjson', 'auto'], None]) -> JSONCodec:
+    if codec is None or codec == 'stdlib':
+        return StdlibJSONCodec()
+    if codec == 'orjson':
+        return OrjsonJSONCodec()
+    if codec == 'auto':
+        if find_spec('orjson') is not None:
+            return OrjsonJSONCodec()
+        return StdlibJSONCodec()
+    if isinstance(codec, JSONCodec):
+        return codec
+    raise_general_exception('json_codec must be one of "stdlib", "orjson", "auto" or a JSONCodec instance')
+
+
+def set_json_codec(codec: Union[JSONCodec, Literal['stdlib', 'orjson', 'auto'], None]):
+    global _codec
+    _codec = create_json_codec(codec)
+
+
+def get_json_codec() -> JSONCodec:
+    return _codec
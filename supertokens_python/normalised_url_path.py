@@ -14,17 +14,50 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from functools import lru_cache
+from typing import Any, Dict, TYPE_CHECKING
 from urllib.parse import urlparse
 
 if TYPE_CHECKING:
     pass
 from .exceptions import raise_general_exception
 
+# urlparse splits the path at these characters (query, fragment, params) and
+# drops tabs and newlines, so paths containing them take the full route
+_SLOW_PATH_CHARS = frozenset('?#;\t\r\n')
+
 
 class NormalisedURLPath:
+    __slots__ = ('__value',)
+
     def __init__(self, url: str):
-        self.__value = normalise_url_path_or_throw_error(url)
+        object.__setattr__(self, '_NormalisedURLPath__value', _intern_normalised_url_path(url))
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError('NormalisedURLPath is immutable')
+
+    def __delattr__(self, name: str):
+        raise AttributeError('NormalisedURLPath is immutable')
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, NormalisedURLPath):
+            return NotImplemented
+        return self.__value == other.__value
+
+    def __hash__(self) -> int:
+        return hash(self.__value)
+
+    def __repr__(self) -> str:
+        return 'NormalisedURLPath(%r)' % self.__value
+
+    def __reduce__(self):
+        return NormalisedURLPath, (self.__value,)
+
+    def __copy__(self) -> NormalisedURLPath:
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> NormalisedURLPath:
+        return self
 
     def startswith(self, other: NormalisedURLPath) -> bool:
         return self.__value.startswith(other.__value)
@@ -42,9 +75,19 @@ class NormalisedURLPath:
         return self.__value == '/recipe' or self.__value.startswith('/recipe/')
 
 
+@lru_cache(maxsize=1024)
+def _intern_normalised_url_path(url: str) -> str:
+    return normalise_url_path_or_throw_error(url)
+
+
 def normalise_url_path_or_throw_error(input_str: str) -> str:
     input_str = input_str.strip().lower()
 
+    if input_str.startswith('/') and _SLOW_PATH_CHARS.isdisjoint(input_str):
+        if input_str.endswith('/'):
+            return input_str[:-1]
+        return input_str
+
     try:
         if (not input_str.startswith('http://')) and (not input_str.startswith('https://')):
             raise Exception('converting to proper URL')
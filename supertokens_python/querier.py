@@ -15,20 +15,40 @@ from __future__ import annotations
 
 from json import JSONDecodeError
 from os import environ
-from typing import TYPE_CHECKING
-
-from httpx import AsyncClient, NetworkError, ConnectTimeout
+import asyncio
+from threading import Lock
+from time import perf_counter, sleep
+from typing import TYPE_CHECKING, Set, Union
 
 from .constants import (
     API_VERSION,
     API_KEY_HEADER,
     RID_KEY_HEADER,
     SUPPORTED_CDI_VERSIONS,
-    API_VERSION_HEADER
+    API_VERSION_HEADER,
+    USER_COUNT
 )
+from .api_version_cache import ApiVersionCacheConfig, ApiVersionFileCache
+from .admission_control import AdmissionControlConfig, AdmissionController
+from .connection_pool import ConnectionPool, ConnectionPoolConfig
+from .json_codec import get_json_codec
+from .hedging import HedgingConfig, HedgingPolicy
+from .host_selector import HostSelector, RoundRobinHostSelector, get_host_key
 from .normalised_url_path import NormalisedURLPath
+from .request_coalescer import RequestCoalescer
+from .response_cache import ResponseCache, ResponseCacheConfig
+from .retry import (
+    RetryBudget,
+    RetryConfig,
+    check_deadline,
+    get_attempt_timeout,
+    get_backoff_seconds,
+    is_connection_failure,
+    is_retryable_error
+)
 
 if TYPE_CHECKING:
+    from httpx import Response, Timeout
     from .supertokens import Host
 from .exceptions import raise_general_exception
 from .utils import (
@@ -44,8 +64,19 @@ class Querier:
     __hosts = None
     __api_key = None
     __api_version = None
-    __last_tried_index: int = 0
+    __api_version_coalescer = RequestCoalescer()
+    __api_version_lock = Lock()
+    __api_version_cache = ApiVersionFileCache(ApiVersionCacheConfig())
+    __host_selector: HostSelector = RoundRobinHostSelector()
     __hosts_alive_for_testing = set()
+    __connection_pool: Union[ConnectionPool, None] = None
+    __request_coalescer: Union[RequestCoalescer, None] = None
+    __response_cache: Union[ResponseCache, None] = None
+    __admission_controller: Union[AdmissionController, None] = None
+    __hedging_policy: Union[HedgingPolicy, None] = None
+    __retry_config: RetryConfig = RetryConfig()
+    __retry_budget: RetryBudget = RetryBudget(
+        __retry_config.retry_budget_max_tokens, __retry_config.retry_budget_token_ratio)
 
     def __init__(self, hosts: list[Host], rid_to_core=None):
         self.__hosts = hosts
@@ -73,20 +104,69 @@ class Querier:
         if Querier.__api_version is not None:
             return Querier.__api_version
 
-        ProcessState.get_instance().add_state(
-            AllowedProcessStates.CALLING_SERVICE_IN_GET_API_VERSION)
+        async def fetch_api_version():
+            # another event loop or thread may have negotiated it in the meantime
+            if Querier.__api_version is not None:
+                return Querier.__api_version
+            if Querier.__load_persisted_api_version() is not None:
+                return Querier.__api_version
+
+            ProcessState.get_instance().add_state(
+                AllowedProcessStates.CALLING_SERVICE_IN_GET_API_VERSION)
+
+            async def f(url, timeout):
+                client = Querier.__connection_pool.get_async_client()
+                return await client.get(url, headers=Querier.__get_api_key_headers(), timeout=timeout)
+
+            response = await self.__send_request_helper(
+                NormalisedURLPath(API_VERSION), 'GET', f)
+            return Querier.__set_api_version(response)
+
+        # concurrent callers share a single call to the core
+        return await Querier.__api_version_coalescer.run(API_VERSION, fetch_api_version)
+
+    def sync_get_api_version(self):
+        if Querier.__api_version is not None:
+            return Querier.__api_version
+
+        with Querier.__api_version_lock:
+            if Querier.__api_version is not None:
+                return Querier.__api_version
+            if Querier.__load_persisted_api_version() is not None:
+                return Querier.__api_version
 
-        async def f(url):
-            headers = {}
-            if Querier.__api_key is not None:
-                headers = {
-                    API_KEY_HEADER: Querier.__api_key
-                }
-            async with AsyncClient() as client:
-                return await client.get(url, headers=headers)
+            ProcessState.get_instance().add_state(
+                AllowedProcessStates.CALLING_SERVICE_IN_GET_API_VERSION)
+
+            def f(url, timeout):
+                client = Querier.__connection_pool.get_sync_client()
+                return client.get(url, headers=Querier.__get_api_key_headers(), timeout=timeout)
+
+            response = self.__sync_send_request_helper(
+                NormalisedURLPath(API_VERSION), 'GET', f)
+            return Querier.__set_api_version(response)
+
+    @staticmethod
+    def __get_connection_key() -> str:
+        return ';'.join(get_host_key(host) for host in Querier.__hosts)
+
+    @staticmethod
+    def __load_persisted_api_version():
+        api_version = Querier.__api_version_cache.get(Querier.__get_connection_key())
+        if api_version is not None:
+            Querier.__api_version = api_version
+        return api_version
+
+    @staticmethod
+    def __get_api_key_headers():
+        if Querier.__api_key is not None:
+            return {
+                API_KEY_HEADER: Querier.__api_key
+            }
+        return {}
 
-        response = await self.__send_request_helper(
-            NormalisedURLPath(API_VERSION), 'GET', f, len(self.__hosts))
+    @staticmethod
+    def __set_api_version(response):
         cdi_supported_by_server = response['versions']
         api_version = find_max_version(
             cdi_supported_by_server,
@@ -98,7 +178,7 @@ class Querier:
                                           'to find the right versions')
 
         Querier.__api_version = api_version
-        # TODO: server-less
+        Querier.__api_version_cache.put(Querier.__get_connection_key(), api_version)
         return Querier.__api_version
 
     @staticmethod
@@ -110,18 +190,68 @@ class Querier:
         return Querier(Querier.__hosts, rid_to_core)
 
     @staticmethod
-    def init(hosts: list[Host], api_key=None):
+    def init(hosts: list[Host], api_key=None, connection_pool_config: Union[ConnectionPoolConfig, None] = None,
+             host_selector: Union[HostSelector, None] = None, coalesce_get_requests: bool = False,
+             response_cache_config: Union[ResponseCacheConfig, None] = None,
+             retry_config: Union[RetryConfig, None] = None,
+             admission_control_config: Union[AdmissionControlConfig, None] = None,
+             hedging_config: Union[HedgingConfig, None] = None,
+             api_version_cache_config: Union[ApiVersionCacheConfig, None] = None):
         if not Querier.__init_called:
             Querier.__init_called = True
             Querier.__hosts = hosts
             Querier.__api_key = api_key
             Querier.__api_version = None
-            Querier.__last_tried_index = 0
+            Querier.__api_version_coalescer = RequestCoalescer()
+            Querier.__api_version_cache = ApiVersionFileCache(
+                api_version_cache_config if api_version_cache_config is not None else ApiVersionCacheConfig())
+            Querier.__host_selector = host_selector if host_selector is not None else RoundRobinHostSelector()
             Querier.__hosts_alive_for_testing = set()
+            if Querier.__connection_pool is not None:
+                Querier.__connection_pool.close()
+            Querier.__connection_pool = ConnectionPool(connection_pool_config)
+            Querier.__request_coalescer = RequestCoalescer() if coalesce_get_requests else None
+            Querier.__response_cache = ResponseCache(
+                response_cache_config) if response_cache_config is not None else None
+            Querier.__retry_config = retry_config if retry_config is not None else RetryConfig()
+            Querier.__retry_budget = RetryBudget(Querier.__retry_config.retry_budget_max_tokens,
+                                                 Querier.__retry_config.retry_budget_token_ratio)
+            Querier.__admission_controller = AdmissionController(
+                admission_control_config) if admission_control_config is not None else None
+            Querier.__hedging_policy = HedgingPolicy(hedging_config) if hedging_config is not None else None
 
-    async def __get_headers_with_api_version(self, path):
+    @staticmethod
+    def get_host_selector() -> HostSelector:
+        return Querier.__host_selector
+
+    @staticmethod
+    def get_request_coalescer() -> Union[RequestCoalescer, None]:
+        return Querier.__request_coalescer
+
+    @staticmethod
+    def get_response_cache() -> Union[ResponseCache, None]:
+        return Querier.__response_cache
+
+    @staticmethod
+    def get_retry_budget() -> RetryBudget:
+        return Querier.__retry_budget
+
+    @staticmethod
+    def get_admission_controller() -> Union[AdmissionController, None]:
+        return Querier.__admission_controller
+
+    @staticmethod
+    def get_hedging_policy() -> Union[HedgingPolicy, None]:
+        return Querier.__hedging_policy
+
+    @staticmethod
+    def close_connection_pool():
+        if Querier.__connection_pool is not None:
+            Querier.__connection_pool.close()
+
+    def __get_headers(self, path: NormalisedURLPath, api_version):
         headers = {
-            API_VERSION_HEADER: await self.get_api_version()
+            API_VERSION_HEADER: api_version
         }
         if Querier.__api_key is not None:
             headers = {
@@ -135,15 +265,85 @@ class Querier:
             }
         return headers
 
+    async def __get_headers_with_api_version(self, path):
+        return self.__get_headers(path, await self.get_api_version())
+
+    def __sync_get_headers_with_api_version(self, path):
+        return self.__get_headers(path, self.sync_get_api_version())
+
     async def send_get_request(self, path: NormalisedURLPath, params=None):
         if params is None:
             params = {}
+        response_size = [0]
+
+        async def f(url, timeout):
+            client = Querier.__connection_pool.get_async_client()
+            response = await client.get(url, params=params, headers=await self.__get_headers_with_api_version(path),
+                                        timeout=timeout)
+            response_size[0] = len(response.content)
+            return response
+
+        async def fetch():
+            if Querier.__request_coalescer is None:
+                return await self.__send_possibly_hedged_request(path, 'GET', f)
+            return await Querier.__request_coalescer.run(
+                key, lambda: self.__send_possibly_hedged_request(path, 'GET', f))
+
+        path_str = path.get_as_string_dangerous()
+        params_key = tuple(sorted(params.items()))
+        key = (path_str, params_key, self.__rid_to_core)
+        cache = Querier.__response_cache
+        if cache is None or not cache.is_cacheable(path_str):
+            return await fetch()
+
+        cached_response = cache.get(key)
+        if cached_response is not None:
+            return cached_response
+        generation = cache.get_generation(path_str)
+        response = await fetch()
+        Querier.__cache_response(key, path_str, params_key, response, response_size[0], generation)
+        return response
+
+    def sync_send_get_request(self, path: NormalisedURLPath, params=None):
+        if params is None:
+            params = {}
+        response_size = [0]
+
+        def f(url, timeout):
+            client = Querier.__connection_pool.get_sync_client()
+            response = client.get(url, params=params, headers=self.__sync_get_headers_with_api_version(path),
+                                  timeout=timeout)
+            response_size[0] = len(response.content)
+            return response
+
+        path_str = path.get_as_string_dangerous()
+        params_key = tuple(sorted(params.items()))
+        key = (path_str, params_key, self.__rid_to_core)
+        cache = Querier.__response_cache
+        if cache is None or not cache.is_cacheable(path_str):
+            return self.__sync_send_request_helper(path, 'GET', f)
+
+        cached_response = cache.get(key)
+        if cached_response is not None:
+            return cached_response
+        generation = cache.get_generation(path_str)
+        response = self.__sync_send_request_helper(path, 'GET', f)
+        Querier.__cache_response(key, path_str, params_key, response, response_size[0], generation)
+        return response
+
+    @staticmethod
+    def __cache_response(key, path_str: str, params_key, response, size: int, generation: int):
+        if isinstance(response, dict) and response.get('status') == 'OK':
+            Querier.__response_cache.put(key, path_str, params_key, response, size, generation)
 
-        async def f(url):
-            async with AsyncClient() as client:
-                return await client.get(url, params=params, headers=await self.__get_headers_with_api_version(path))
+    def invalidate_cached_responses(self, path: NormalisedURLPath, params: Union[dict, None] = None):
+        if Querier.__response_cache is not None:
+            Querier.__response_cache.invalidate(path.get_as_string_dangerous(), params)
 
-        return await self.__send_request_helper(path, 'GET', f, len(self.__hosts))
+    def invalidate_cached_user_counts(self):
+        # for when a user is created or deleted
+        self.invalidate_cached_responses(NormalisedURLPath(USER_COUNT))
+        self.invalidate_cached_responses(NormalisedURLPath('/recipe/users/count'))
 
     async def send_post_request(self, path: NormalisedURLPath, data=None, test=False):
         if data is None:
@@ -156,19 +356,48 @@ class Querier:
         headers = await self.__get_headers_with_api_version(path)
         headers['content-type'] = 'application/json; charset=utf-8'
 
-        async def f(url):
-            async with AsyncClient() as client:
-                return await client.post(url, json=data, headers=headers)
+        content = get_json_codec().dumps(data)
+
+        async def f(url, timeout):
+            client = Querier.__connection_pool.get_async_client()
+            return await client.post(url, content=content, headers=headers, timeout=timeout)
 
-        return await self.__send_request_helper(path, 'POST', f, len(self.__hosts))
+        return await self.__send_possibly_hedged_request(path, 'POST', f)
+
+    def sync_send_post_request(self, path: NormalisedURLPath, data=None, test=False):
+        if data is None:
+            data = {}
+
+        if ('SUPERTOKENS_ENV' in environ) and (
+                environ['SUPERTOKENS_ENV'] == 'testing') and test:
+            return data
+
+        headers = self.__sync_get_headers_with_api_version(path)
+        headers['content-type'] = 'application/json; charset=utf-8'
+
+        content = get_json_codec().dumps(data)
+
+        def f(url, timeout):
+            client = Querier.__connection_pool.get_sync_client()
+            return client.post(url, content=content, headers=headers, timeout=timeout)
+
+        return self.__sync_send_request_helper(path, 'POST', f)
 
     async def send_delete_request(self, path: NormalisedURLPath):
 
-        async def f(url):
-            async with AsyncClient() as client:
-                return await client.delete(url, headers=await self.__get_headers_with_api_version(path))
+        async def f(url, timeout):
+            client = Querier.__connection_pool.get_async_client()
+            return await client.delete(url, headers=await self.__get_headers_with_api_version(path), timeout=timeout)
+
+        return await self.__send_request_helper(path, 'DELETE', f)
+
+    def sync_send_delete_request(self, path: NormalisedURLPath):
 
-        return await self.__send_request_helper(path, 'DELETE', f, len(self.__hosts))
+        def f(url, timeout):
+            client = Querier.__connection_pool.get_sync_client()
+            return client.delete(url, headers=self.__sync_get_headers_with_api_version(path), timeout=timeout)
+
+        return self.__sync_send_request_helper(path, 'DELETE', f)
 
     async def send_put_request(self, path: NormalisedURLPath, data=None):
         if data is None:
@@ -177,27 +406,189 @@ class Querier:
         headers = await self.__get_headers_with_api_version(path)
         headers['content-type'] = 'application/json; charset=utf-8'
 
-        async def f(url):
-            async with AsyncClient() as client:
-                return await client.put(url, json=data, headers=headers)
+        content = get_json_codec().dumps(data)
 
-        return await self.__send_request_helper(path, 'PUT', f, len(self.__hosts))
+        async def f(url, timeout):
+            client = Querier.__connection_pool.get_async_client()
+            return await client.put(url, content=content, headers=headers, timeout=timeout)
 
-    async def __send_request_helper(self, path: NormalisedURLPath, method, http_function, no_of_tries):
-        if no_of_tries == 0:
-            raise_general_exception('No SuperTokens core available to query')
+        return await self.__send_request_helper(path, 'PUT', f)
 
+    def sync_send_put_request(self, path: NormalisedURLPath, data=None):
+        if data is None:
+            data = {}
+
+        headers = self.__sync_get_headers_with_api_version(path)
+        headers['content-type'] = 'application/json; charset=utf-8'
+
+        content = get_json_codec().dumps(data)
+
+        def f(url, timeout):
+            client = Querier.__connection_pool.get_sync_client()
+            return client.put(url, content=content, headers=headers, timeout=timeout)
+
+        return self.__sync_send_request_helper(path, 'PUT', f)
+
+    async def __send_possibly_hedged_request(self, path: NormalisedURLPath, method, http_function):
+        hedging_policy = Querier.__hedging_policy
+        if hedging_policy is None or len(self.__hosts) < 2 or \
+                not hedging_policy.should_hedge(method, path.get_as_string_dangerous()):
+            return await self.__send_request_helper(path, method, http_function)
+
+        start_time = perf_counter()
+        primary_hosts: Set[str] = set()
+        primary = asyncio.ensure_future(self.__send_request_helper(path, method, http_function, primary_hosts))
+        pending = {primary}
         try:
-            current_host_domain = self.__hosts[Querier.__last_tried_index].domain.get_as_string_dangerous()
-            current_host_base_path = self.__hosts[Querier.__last_tried_index].base_path.get_as_string_dangerous()
-            current_host = current_host_domain + current_host_base_path
-            Querier.__last_tried_index += 1
-            Querier.__last_tried_index %= len(self.__hosts)
-            url = current_host + path.get_as_string_dangerous()
+            done, pending = await asyncio.wait(pending, timeout=hedging_policy.get_delay_seconds())
+            if primary in done or not hedging_policy.try_acquire_hedge():
+                result = await primary
+                hedging_policy.record_latency((perf_counter() - start_time) * 1000)
+                return result
+
+            # the primary request is slow, so we send a backup request to
+            # another host and use whichever succeeds first
+            backup = asyncio.ensure_future(
+                self.__send_request_helper(path, method, http_function, set(primary_hosts)))
+            pending = {primary, backup}
+            while len(pending) > 0:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in (primary, backup):
+                    if task in done and task.exception() is None:
+                        hedging_policy.record_latency((perf_counter() - start_time) * 1000)
+                        if task is backup:
+                            hedging_policy.on_hedge_won()
+                        return task.result()
+            # both failed, the primary's error is the more relevant one
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def __send_request_helper(self, path: NormalisedURLPath, method, http_function,
+                                    tried_hosts: Union[Set[str], None] = None):
+        retry_config = Querier.__retry_config
+        # every host is tried once, and then `max_retries` more times
+        max_attempts = len(self.__hosts) + retry_config.max_retries
+        no_of_attempts = 0
+        retry_round = 0
+        if tried_hosts is None:
+            tried_hosts = set()
+        while True:
+            check_deadline()
+            host = Querier.__host_selector.select_host(self.__hosts, tried_hosts)
+            if host is None and no_of_attempts > 0:
+                # all hosts have been tried in this round, so we back off
+                # before starting the next one
+                retry_round += 1
+                await asyncio.sleep(get_backoff_seconds(retry_config, retry_round))
+                tried_hosts = set()
+                host = Querier.__host_selector.select_host(self.__hosts, tried_hosts)
+            if host is None:
+                raise_general_exception('No SuperTokens core available to query')
+            current_host = get_host_key(host)
+            tried_hosts.add(current_host)
+            no_of_attempts += 1
+
+            admission_controller = Querier.__admission_controller
+            admitted_gates = None
+            try:
+                if admission_controller is not None:
+                    admitted_gates = await admission_controller.acquire(path.get_as_string_dangerous())
+                # waiting in the admission queue may have used up part of the deadline
+                timeout = Querier.__get_attempt_timeout()
+                ProcessState.get_instance().add_state(
+                    AllowedProcessStates.CALLING_SERVICE_IN_REQUEST_HELPER)
+                start_time = perf_counter()
+                try:
+                    response = await http_function(current_host + path.get_as_string_dangerous(), timeout)
+                except Exception as e:
+                    self.__on_attempt_error(e, host, method, path, no_of_attempts, max_attempts, tried_hosts)
+                    continue
+            finally:
+                if admitted_gates is not None:
+                    admission_controller.release(admitted_gates)
+                # also when the request is cancelled (e.g. a hedged request
+                # that lost), which `except Exception` does not catch
+                Querier.__host_selector.release_probe(host)
+            return Querier.__on_attempt_response(host, current_host, start_time, response, method, path)
+
+    def __sync_send_request_helper(self, path: NormalisedURLPath, method, http_function):
+        retry_config = Querier.__retry_config
+        max_attempts = len(self.__hosts) + retry_config.max_retries
+        no_of_attempts = 0
+        retry_round = 0
+        tried_hosts: Set[str] = set()
+        while True:
+            check_deadline()
+            host = Querier.__host_selector.select_host(self.__hosts, tried_hosts)
+            if host is None and no_of_attempts > 0:
+                retry_round += 1
+                sleep(get_backoff_seconds(retry_config, retry_round))
+                tried_hosts = set()
+                host = Querier.__host_selector.select_host(self.__hosts, tried_hosts)
+            if host is None:
+                raise_general_exception('No SuperTokens core available to query')
+            current_host = get_host_key(host)
+            tried_hosts.add(current_host)
+            no_of_attempts += 1
+
+            admission_controller = Querier.__admission_controller
+            admitted_gates = None
+            try:
+                if admission_controller is not None:
+                    admitted_gates = admission_controller.sync_acquire(path.get_as_string_dangerous())
+                timeout = Querier.__get_attempt_timeout()
+                ProcessState.get_instance().add_state(
+                    AllowedProcessStates.CALLING_SERVICE_IN_REQUEST_HELPER)
+                start_time = perf_counter()
+                try:
+                    response = http_function(current_host + path.get_as_string_dangerous(), timeout)
+                except Exception as e:
+                    self.__on_attempt_error(e, host, method, path, no_of_attempts, max_attempts, tried_hosts)
+                    continue
+            finally:
+                if admitted_gates is not None:
+                    admission_controller.release(admitted_gates)
+                # also when the request is cancelled (e.g. a hedged request
+                # that lost), which `except Exception` does not catch
+                Querier.__host_selector.release_probe(host)
+            return Querier.__on_attempt_response(host, current_host, start_time, response, method, path)
 
-            ProcessState.get_instance().add_state(
-                AllowedProcessStates.CALLING_SERVICE_IN_REQUEST_HELPER)
-            response = await http_function(url)
+    @staticmethod
+    def __get_attempt_timeout() -> Timeout:
+        from httpx import Timeout
+        retry_config = Querier.__retry_config
+        attempt_timeout = get_attempt_timeout(retry_config)
+        return Timeout(attempt_timeout, connect=min(retry_config.connect_timeout_seconds, attempt_timeout))
+
+    def __on_attempt_error(self, e: Exception, host: Host, method, path: NormalisedURLPath, no_of_attempts: int,
+                           max_attempts: int, tried_hosts: Set[str]):
+        # raises unless the request should be sent again
+        Querier.__host_selector.on_request_failure(host)
+        if not is_retryable_error(e, method, path.get_as_string_dangerous()):
+            raise_general_exception(e)
+        if no_of_attempts >= max_attempts:
+            if is_connection_failure(e):
+                raise_general_exception('No SuperTokens core available to query')
+            raise_general_exception(e)
+        # failing over to a host we could not even connect to is cheap,
+        # anything else sends the same work to the core again and so has to
+        # fit in the retry budget
+        is_failover = is_connection_failure(e) and len(tried_hosts) < len(self.__hosts)
+        if not is_failover and not Querier.__retry_budget.try_acquire():
+            raise_general_exception(e)
+
+    @staticmethod
+    def __on_attempt_response(host: Host, current_host: str, start_time: float, response: Response, method,
+                              path: NormalisedURLPath):
+        if is_5xx_error(response.status_code):
+            Querier.__host_selector.on_request_failure(host)
+        else:
+            Querier.__host_selector.on_request_success(host, (perf_counter() - start_time) * 1000)
+            Querier.__retry_budget.on_success()
+
+        try:
             if ('SUPERTOKENS_ENV' in environ) and (
                     environ['SUPERTOKENS_ENV'] == 'testing'):
                 Querier.__hosts_alive_for_testing.add(current_host)
@@ -210,12 +601,8 @@ class Querier:
                                         response.text)
 
             try:
-                return response.json()
+                return get_json_codec().loads(response.content)
             except JSONDecodeError:
                 return response.text
-
-        except (ConnectionError, NetworkError, ConnectTimeout):
-            return await self.__send_request_helper(
-                path, method, http_function, no_of_tries - 1)
         except Exception as e:
             raise_general_exception(e)
@@ -133,6 +133,7 @@ class RecipeImplementation(RecipeInterface):
         }
         response = await self.querier.send_post_request(NormalisedURLPath('/recipe/signup'), data)
         if 'status' in response and response['status'] == 'OK':
+            self.querier.invalidate_cached_user_counts()
             return SignUpOkResult(
                 User(response['user']['id'], response['user']['email'], response['user']['timeJoined']))
         return SignUpEmailAlreadyExistsErrorResult()
@@ -164,6 +165,9 @@ class RecipeImplementation(RecipeInterface):
             }
         response = await self.querier.send_put_request(NormalisedURLPath('/recipe/user'), data)
         if 'status' in response and response['status'] == 'OK':
+            if email is not None:
+                # cached users can be keyed by their old email as well
+                self.querier.invalidate_cached_responses(NormalisedURLPath('/recipe/user'))
             return UpdateEmailOrPasswordOkResult()
         if 'status' in response and response['status'] == 'EMAIL_ALREADY_EXISTS_ERROR':
             return UpdateEmailOrPasswordEmailAlreadyExistsErrorResult()
@@ -29,7 +29,6 @@ from .constants import (
     RESET_PASSWORD
 )
 from supertokens_python.utils import get_filtered_list
-from httpx import AsyncClient
 from supertokens_python.recipe.emailverification.utils import (
     InputEmailVerificationConfig,
     ParentRecipeEmailVerificationConfig,
@@ -107,6 +106,7 @@ def default_create_and_send_custom_email(
                 'appName': app_info.app_name,
                 'passwordResetURL': password_reset_url_with_token
             }
+            from httpx import AsyncClient
             async with AsyncClient() as client:
                 await client.post('https://api.supertokens.io/0/st/auth/password/reset', json=data,
                                   headers={'api-version': '0'})
@@ -52,6 +52,9 @@ class RecipeImplementation(RecipeInterface):
         }
         response = await self.querier.send_post_request(NormalisedURLPath('/recipe/user/email/verify'), data)
         if 'status' in response and response['status'] == 'OK':
+            self.querier.invalidate_cached_responses(NormalisedURLPath('/recipe/user/email/verify'), {
+                'userId': response['userId']
+            })
             return VerifyEmailUsingTokenOkResult(
                 User(response['userId'], response['email']))
         return VerifyEmailUsingTokenInvalidTokenErrorResult()
@@ -78,4 +81,7 @@ class RecipeImplementation(RecipeInterface):
             'email': email
         }
         await self.querier.send_post_request(NormalisedURLPath('/recipe/user/email/verify/remove'), data)
+        self.querier.invalidate_cached_responses(NormalisedURLPath('/recipe/user/email/verify'), {
+            'userId': user_id
+        })
         return UnverifyEmailOkResult()
@@ -12,7 +12,6 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 from __future__ import annotations
-from httpx import AsyncClient
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from supertokens_python.supertokens import AppInfo
@@ -35,6 +34,7 @@ def default_create_and_send_custom_email(app_info: AppInfo):
                 environ['SUPERTOKENS_ENV'] != 'testing'):
             return
         try:
+            from httpx import AsyncClient
             await AsyncClient().post('https://api.supertokens.io/0/st/auth/email/verify', json={'email': user.email, 'appName': app_info.app_name, 'emailVerifyURL': email_verification_url}, headers={'api-version': '0'})
         except Exception:
             pass
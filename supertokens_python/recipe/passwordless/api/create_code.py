@@ -17,8 +17,6 @@ from supertokens_python.exceptions import raise_bad_input_exception
 from supertokens_python.recipe.passwordless.interfaces import APIInterface, APIOptions, CreateCodePostGeneralErrorResponse
 from supertokens_python.recipe.passwordless.utils import ContactPhoneOnlyConfig, ContactEmailOnlyConfig, \
     ContactEmailOrPhoneConfig
-from phonenumbers import parse, format_number
-import phonenumbers
 
 
 async def create_code(api_implementation: APIInterface, api_options: APIOptions):
@@ -64,9 +62,10 @@ async def create_code(api_implementation: APIInterface, api_options: APIOptions)
         if validation_error is not None:
             api_options.response.set_json_content(CreateCodePostGeneralErrorResponse(validation_error).to_json())
             return api_options.response
+        from phonenumbers import parse, format_number, PhoneNumberFormat
         try:
             validated_phone_number = parse(phone_number, None)
-            phone_number = format_number(validated_phone_number, phonenumbers.PhoneNumberFormat.E164)
+            phone_number = format_number(validated_phone_number, PhoneNumberFormat.E164)
         except Exception:
             phone_number = phone_number.strip()
     result = await api_implementation.create_code_post(
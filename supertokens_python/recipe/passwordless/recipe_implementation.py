@@ -108,6 +108,8 @@ class RecipeImplementation(RecipeInterface):
             }
         result = await self.querier.send_post_request(NormalisedURLPath('/recipe/signinup/code/consume'), data)
         if result['status'] == 'OK':
+            if result['createdNewUser']:
+                self.querier.invalidate_cached_user_counts()
             email = None
             phone_number = None
             if 'email' in result['user']:
@@ -202,6 +204,8 @@ class RecipeImplementation(RecipeInterface):
             }
         result = await self.querier.send_put_request(NormalisedURLPath('/recipe/user'), data)
         if result['status'] == 'OK':
+            # cached users can be keyed by their old email or phone number as well
+            self.querier.invalidate_cached_responses(NormalisedURLPath('/recipe/user'))
             return UpdateUserOkResult()
         elif result['status'] == 'UNKNOWN_USER_ID_ERROR':
             return UpdateUserUnknownUserIdErrorResult()
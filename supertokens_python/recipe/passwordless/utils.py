@@ -23,11 +23,11 @@ except ImportError:
 if TYPE_CHECKING:
     from .interfaces import RecipeInterface, APIInterface
     from supertokens_python import AppInfo
-from phonenumbers import parse, is_valid_number
 from re import fullmatch
 
 
 async def default_validate_phone_number(value: str):
+    from phonenumbers import parse, is_valid_number
     try:
         parsed_phone_number = parse(value, None)
         if not is_valid_number(parsed_phone_number):
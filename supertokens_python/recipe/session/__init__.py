@@ -20,7 +20,9 @@ except ImportError:
 from .session_class import Session
 from .recipe import SessionRecipe
 from . import exceptions
-from .utils import InputErrorHandlers, InputOverrideConfig, JWTConfig
+from .jwt import JWTVerifier, JWTVerifierBackend, benchmark_verifier_backends
+from .utils import InputErrorHandlers, InputOverrideConfig, JWTConfig, AccessTokenVerificationConfig, \
+    RevocationCacheConfig
 from supertokens_python.recipe.openid import InputOverrideConfig as OpenIdInputOverrideConfig, JWTOverrideConfig
 
 
@@ -31,7 +33,8 @@ def init(cookie_domain: Union[str, None] = None,
          anti_csrf: Union[Literal["VIA_TOKEN", "VIA_CUSTOM_HEADER", "NONE"], None] = None,
          error_handlers: Union[InputErrorHandlers, None] = None,
          override: Union[InputOverrideConfig, None] = None,
-         jwt: Union[JWTConfig, None] = None):
+         jwt: Union[JWTConfig, None] = None,
+         access_token_verification: Union[AccessTokenVerificationConfig, None] = None):
     return SessionRecipe.init(cookie_domain,
                               cookie_secure,
                               cookie_same_site,
@@ -39,4 +42,5 @@ def init(cookie_domain: Union[str, None] = None,
                               anti_csrf,
                               error_handlers,
                               override,
-                              jwt)
+                              jwt,
+                              access_token_verification)
@@ -12,10 +12,97 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 from __future__ import annotations
-from .jwt import get_payload
+from json import JSONDecoder, loads
+from json.decoder import WHITESPACE, scanstring
+from .jwt import DecodedJWT, decode_jwt, verify_jwt, JWTVerifier
 from supertokens_python.utils import get_timestamp_ms
 from .exceptions import raise_try_refresh_token_exception
-from typing import Union
+from typing import Any, Dict, Union
+
+_scan_once = JSONDecoder().scan_once
+
+
+class AccessTokenPayloadView:
+    """
+    The userData of a verified access token, kept as JSON text until it is
+    read. Views are shared by every request that uses the same token (through
+    the verified access token cache), so they are immutable and every reader
+    gets its own parsed copy.
+    """
+    __slots__ = ('__user_data_json',)
+
+    def __init__(self, user_data_json: str):
+        object.__setattr__(self, '_AccessTokenPayloadView__user_data_json', user_data_json)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError('AccessTokenPayloadView is immutable')
+
+    def __reduce__(self):
+        return AccessTokenPayloadView, (self.__user_data_json,)
+
+    def materialise(self) -> Any:
+        return loads(self.__user_data_json)
+
+
+def materialise_access_token_payload(access_token_payload: Any) -> Any:
+    if isinstance(access_token_payload, AccessTokenPayloadView):
+        return access_token_payload.materialise()
+    return access_token_payload
+
+
+def _skip_whitespace(text: str, idx: int) -> int:
+    return WHITESPACE.match(text, idx).end()
+
+
+def _scan_value(text: str, idx: int):
+    try:
+        return _scan_once(text, idx)
+    except StopIteration:
+        raise ValueError('Invalid JSON value at ' + str(idx))
+
+
+def parse_access_token_payload(payload: Union[bytes, str]) -> Dict[str, Any]:
+    """
+    Parses the top level fields of a decoded access token payload, like
+    json.loads. The userData is returned as an AccessTokenPayloadView of its
+    JSON text, so that it is only turned into objects when it is read.
+    """
+    text = payload.decode('utf-8') if isinstance(payload, bytes) else payload
+    try:
+        return _parse_access_token_payload(text)
+    except IndexError:
+        raise ValueError('The access token payload ended unexpectedly')
+
+
+def _parse_access_token_payload(text: str) -> Dict[str, Any]:
+    fields = {}
+    idx = _skip_whitespace(text, 0)
+    if text[idx] != '{':
+        raise ValueError('The access token payload is not a JSON object')
+    idx = _skip_whitespace(text, idx + 1)
+    if text[idx] == '}':
+        return fields
+    while True:
+        if text[idx] != '"':
+            raise ValueError('Invalid JSON key at ' + str(idx))
+        key, idx = scanstring(text, idx + 1)
+        idx = _skip_whitespace(text, idx)
+        if text[idx] != ':':
+            raise ValueError('Invalid JSON object at ' + str(idx))
+        idx = _skip_whitespace(text, idx + 1)
+        if key == 'userData':
+            value, end = _scan_value(text, idx)
+            fields[key] = None if value is None else AccessTokenPayloadView(text[idx:end])
+        else:
+            fields[key], end = _scan_value(text, idx)
+        idx = _skip_whitespace(text, end)
+        if text[idx] == '}':
+            if _skip_whitespace(text, idx + 1) != len(text):
+                raise ValueError('Extra data after the access token payload')
+            return fields
+        if text[idx] != ',':
+            raise ValueError('Invalid JSON object at ' + str(idx))
+        idx = _skip_whitespace(text, idx + 1)
 
 
 def sanitize_string(s: any) -> Union[str, None]:
@@ -36,10 +123,36 @@ def sanitize_number(n: any) -> Union[Union[int, float], None]:
     return None
 
 
+class DecodedAccessToken:
+    """
+    An access token that was decoded (but not verified) once, so that it can
+    be verified against several signing keys.
+    """
+    __slots__ = ('jwt', 'payload')
+
+    def __init__(self, jwt: DecodedJWT, payload: Dict[str, Any]):
+        self.jwt = jwt
+        self.payload = payload
+
+
+def decode_access_token(token: str) -> DecodedAccessToken:
+    try:
+        decoded_jwt = decode_jwt(token)
+        return DecodedAccessToken(decoded_jwt, parse_access_token_payload(decoded_jwt.payload))
+    except Exception as e:
+        raise_try_refresh_token_exception(e)
+
+
 def get_info_from_access_token(
-        token: str, jwt_signing_public_key: str, do_anti_csrf_check: bool):
+        token: str, jwt_signing_public_key: Union[str, JWTVerifier], do_anti_csrf_check: bool):
+    return get_info_from_decoded_access_token(decode_access_token(token), jwt_signing_public_key, do_anti_csrf_check)
+
+
+def get_info_from_decoded_access_token(
+        token: DecodedAccessToken, jwt_signing_public_key: Union[str, JWTVerifier], do_anti_csrf_check: bool):
     try:
-        payload = get_payload(token, jwt_signing_public_key)
+        verify_jwt(token.jwt, jwt_signing_public_key)
+        payload = token.payload
         session_handle = sanitize_string(payload.get('sessionHandle'))
         user_id = sanitize_string(payload.get('userId'))
         refresh_token_hash_1 = sanitize_string(
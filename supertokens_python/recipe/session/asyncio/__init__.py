@@ -15,6 +15,7 @@ from typing import Union, List
 
 from supertokens_python.recipe.openid.interfaces import CreateJwtResult, GetJWKSResult, \
     GetOpenIdDiscoveryConfigurationResult
+from supertokens_python.recipe.session.interfaces import VerifyAccessTokenResult
 from supertokens_python.recipe.session.session_class import Session
 from supertokens_python.recipe.session.recipe import SessionRecipe
 from supertokens_python.utils import FRAMEWORKS
@@ -45,6 +46,10 @@ async def refresh_session(request) -> Session:
     return await SessionRecipe.get_instance().recipe_implementation.refresh_session(request)
 
 
+async def verify_access_tokens(access_tokens: List[str]) -> List[VerifyAccessTokenResult]:
+    return await SessionRecipe.get_instance().recipe_implementation.verify_access_tokens(access_tokens)
+
+
 async def revoke_session(session_handle: str) -> bool:
     return await SessionRecipe.get_instance().recipe_implementation.revoke_session(session_handle)
 
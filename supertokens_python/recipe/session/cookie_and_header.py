@@ -39,12 +39,8 @@ if TYPE_CHECKING:
     from .recipe import SessionRecipe
 from supertokens_python.utils import get_header
 from supertokens_python.exceptions import raise_general_exception
-from supertokens_python.utils import (
-    utf_base64encode
-)
-from json import (
-    dumps
-)
+from base64 import b64encode
+from json import dumps
 
 
 def set_front_token_in_headers(recipe: SessionRecipe, response: BaseResponse, user_id: str, expires_at: int,
@@ -60,13 +56,8 @@ def set_front_token_in_headers(recipe: SessionRecipe, response: BaseResponse, us
         recipe,
         response,
         FRONT_TOKEN_HEADER_SET_KEY,
-        utf_base64encode(
-            dumps(
-                token_info,
-                separators=(
-                    ',',
-                    ':'),
-                sort_keys=True)),
+        # ascii only, so that frontends can decode it with JSON.parse(atob(...))
+        b64encode(dumps(token_info, separators=(',', ':'), sort_keys=True).encode('utf-8')).decode('utf-8'),
         False)
     set_header(
         recipe,
@@ -32,11 +32,7 @@ def verify_session(
             try:
                 request = DjangoRequest(request)
                 recipe = SessionRecipe.get_instance()
-                session = sync(
-                    recipe.verify_session(
-                        request,
-                        anti_csrf_check,
-                        session_required))
+                session = recipe.sync_verify_session(request, anti_csrf_check, session_required)
                 request.set_session(session)
                 return f(request.request, *args, **kwargs)
             except SuperTokensError as e:
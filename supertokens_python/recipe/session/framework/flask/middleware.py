@@ -15,7 +15,6 @@ from functools import wraps
 from typing import Union
 
 
-from supertokens_python.async_to_sync_wrapper import sync
 from supertokens_python.framework.flask.flask_request import FlaskRequest
 from supertokens_python.recipe.session import SessionRecipe
 
@@ -27,11 +26,7 @@ def verify_session(anti_csrf_check: Union[bool, None] = None, session_required:
             from flask import request, make_response
             request = FlaskRequest(request)
             recipe = SessionRecipe.get_instance()
-            session = sync(
-                recipe.verify_session(
-                    request,
-                    anti_csrf_check,
-                    session_required))
+            session = recipe.sync_verify_session(request, anti_csrf_check, session_required)
             request.set_session(session)
             response = make_response(f(*args, **kwargs))
             return response
@@ -14,6 +14,10 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import Union, List, TYPE_CHECKING
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
 if TYPE_CHECKING:
     from supertokens_python.framework import BaseRequest, BaseResponse
     from supertokens_python.recipe.jwt.interfaces import RecipeInterface as JWTRecipeInterface
@@ -21,6 +25,35 @@ if TYPE_CHECKING:
     from .session_class import Session
 
 
+class VerifyAccessTokenResult(ABC):
+    def __init__(self, status: Literal['OK', 'TRY_REFRESH_TOKEN_ERROR', 'UNAUTHORISED'],
+                 session_handle: Union[str, None] = None, user_id: Union[str, None] = None,
+                 access_token_payload: Union[dict, None] = None, new_access_token: Union[dict, None] = None,
+                 message: Union[str, None] = None):
+        self.status = status
+        self.session_handle = session_handle
+        self.user_id = user_id
+        self.access_token_payload = access_token_payload
+        self.new_access_token = new_access_token
+        self.message = message
+
+
+class VerifyAccessTokenResultOk(VerifyAccessTokenResult):
+    def __init__(self, session_handle: str, user_id: str, access_token_payload: dict,
+                 new_access_token: Union[dict, None] = None):
+        super().__init__('OK', session_handle, user_id, access_token_payload, new_access_token)
+
+
+class VerifyAccessTokenResultTryRefreshToken(VerifyAccessTokenResult):
+    def __init__(self, message: str):
+        super().__init__('TRY_REFRESH_TOKEN_ERROR', message=message)
+
+
+class VerifyAccessTokenResultUnauthorised(VerifyAccessTokenResult):
+    def __init__(self, message: str):
+        super().__init__('UNAUTHORISED', message=message)
+
+
 class RecipeInterface(ABC):
     def __init__(self):
         pass
@@ -35,6 +68,27 @@ class RecipeInterface(ABC):
                           session_required: bool = True) -> Union[Session, None]:
         pass
 
+    async def verify_access_tokens(self, access_tokens: List[str]) -> List[VerifyAccessTokenResult]:
+        # verifies the tokens one by one, for implementations that were
+        # written before this function was added
+        from .access_token import materialise_access_token_payload
+        from .exceptions import TryRefreshTokenError, UnauthorisedError
+        from .session_functions import get_session
+        results = []
+        for access_token in access_tokens:
+            try:
+                response = await get_session(self, access_token, None, False, False)
+            except UnauthorisedError as e:
+                results.append(VerifyAccessTokenResultUnauthorised(str(e)))
+                continue
+            except TryRefreshTokenError as e:
+                results.append(VerifyAccessTokenResultTryRefreshToken(str(e)))
+                continue
+            results.append(VerifyAccessTokenResultOk(
+                response['session']['handle'], response['session']['userId'],
+                materialise_access_token_payload(response['session']['userDataInJWT']), response.get('accessToken')))
+        return results
+
     @abstractmethod
     async def refresh_session(self, request: any) -> Session:
         pass
@@ -12,19 +12,21 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-from supertokens_python.utils import (
-    utf_base64decode,
-    utf_base64encode
-)
+from supertokens_python.utils import utf_base64encode
 from json import (
     loads,
     dumps
 )
-from Crypto.PublicKey import RSA
-from Crypto.Signature.pkcs1_15 import PKCS115_SigScheme
-from Crypto.Hash import SHA256
+from abc import ABC, abstractmethod
 from base64 import b64decode
 from textwrap import wrap
+from time import perf_counter
+from typing import Dict, List, Union
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
+from supertokens_python.exceptions import raise_general_exception
 
 _key_start = '-----BEGIN PUBLIC KEY-----\n'
 _key_end = '\n-----END PUBLIC KEY-----'
@@ -42,31 +44,205 @@ _allowed_headers = [utf_base64encode(dumps({
     'version': '2'
 }, separators=(',', ':'), sort_keys=True))]
 
+# a fixed RS256 signature, used to benchmark the verifier backends
+_benchmark_public_key = \
+    'MIIBIjANBgkqhkiG9w0BAQEFAAOCAQ8AMIIBCgKCAQEApEacAcTtueUpd9dIoZoIqW5lMjLKVJcUTjfrOumpdx+iDVoe71k3yX89jQFGJc7ht40bZWwnWOfTvsaqFFubRef6mB57SW9+Wa6tVQcF4bTeKvVdCXrB6A4asalsT+klEmxPWUMZj39TDvh/Kaf2H0Tf9036hVsuMwZm9razkJKEOU61vezRpZ+fniGSxTY9dkOZQZTI1gkqJ6ZRqwA+DKeAeFKHP4rjnpMgT7jJFh1G+bSuXql1Fw725kH4Pqbg23nZMkfwvBJHxD0U0pJLLzYnPHZc2R4TZAGTehA3oYvKdb35RkUG3EmN2KFhD61yhsyotlzrwNfYqe8iVE+g+wIDAQAB'
+_benchmark_message = b'supertokens jwt verifier benchmark'
+_benchmark_signature = \
+    'c7dBjCU83Qx2qnF/yHH9iZKf9na68Axl7DRV26M0IkB6+a0fZgeERJOcp6n7IAE9yCFWWYkg1BSoEWs0i9TSMUD/BIp0+uMf1p/ABY1xWZlFkGi7G76RRYECi5Dp0kidL7feyAnuK/nnQugznBzuOloj0ejmbzsHjACQtGwVUXbI+61z8Nl5XCN6V6HTQA1MyjQ9vCo+i/ALwxQsGFLI1QpbNZ8nKjS8sFrG9UaMgOhJtQcevRQRlcmmdsZCLf25kIqfLMjlaLNQ2gbLrpeTq9BcuFJyi1pqy7SeqpQJ72tbGSX36K5Hr5SPRbqSRzHZxa6FUAeHL8s6yHkenI+dYg=='
+
+
+class JWTVerifier(ABC):
+    @abstractmethod
+    def verify(self, message: bytes, signature: bytes) -> bool:
+        pass
+
+
+class JWTVerifierBackend(ABC):
+    """
+    Parses the JWT signing public keys of the core (base64 encoded DER) into
+    verifiers for RS256 signatures.
+    """
+    name = ''
+
+    @abstractmethod
+    def create_verifier(self, signing_public_key: str) -> JWTVerifier:
+        pass
+
+
+class PyCryptodomeJWTVerifier(JWTVerifier):
+    def __init__(self, signing_public_key: str):
+        from Crypto.PublicKey import RSA
+        from Crypto.Signature.pkcs1_15 import PKCS115_SigScheme
+        from Crypto.Hash import SHA256
+        public_key = RSA.import_key(
+            _key_start +
+            "\n".join(
+                wrap(
+                    signing_public_key,
+                    width=64)) +
+            _key_end)
+        self.__verifier = PKCS115_SigScheme(public_key)
+        self.__sha256 = SHA256
+
+    def verify(self, message: bytes, signature: bytes) -> bool:
+        try:
+            self.__verifier.verify(self.__sha256.new(message), signature)
+            return True
+        except ValueError:
+            return False
+
+
+class PyCryptodomeJWTVerifierBackend(JWTVerifierBackend):
+    name = 'pycryptodome'
+
+    def create_verifier(self, signing_public_key: str) -> JWTVerifier:
+        return PyCryptodomeJWTVerifier(signing_public_key)
+
+
+class CryptographyJWTVerifier(JWTVerifier):
+    def __init__(self, signing_public_key: str):
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import padding
+        from cryptography.hazmat.primitives.serialization import load_der_public_key
+        self.__public_key = load_der_public_key(b64decode(signing_public_key))
+        self.__padding = padding.PKCS1v15()
+        self.__hash = hashes.SHA256()
+        self.__invalid_signature = InvalidSignature
+
+    def verify(self, message: bytes, signature: bytes) -> bool:
+        try:
+            self.__public_key.verify(signature, message, self.__padding, self.__hash)
+            return True
+        except self.__invalid_signature:
+            return False
+
+
+class CryptographyJWTVerifierBackend(JWTVerifierBackend):
+    name = 'cryptography'
+
+    def create_verifier(self, signing_public_key: str) -> JWTVerifier:
+        return CryptographyJWTVerifier(signing_public_key)
+
+
+def get_verifier_backends() -> List[JWTVerifierBackend]:
+    return [PyCryptodomeJWTVerifierBackend(), CryptographyJWTVerifierBackend()]
+
 
-def get_payload(jwt, signing_public_key):
+def benchmark_verifier_backends(backends: Union[List[JWTVerifierBackend], None] = None,
+                                iterations: int = 200) -> Dict[str, float]:
+    """
+    Returns the number of RS256 verifications per second of each backend.
+    """
+    if backends is None:
+        backends = get_verifier_backends()
+    signature = b64decode(_benchmark_signature)
+    results = {}
+    for backend in backends:
+        verifier = backend.create_verifier(_benchmark_public_key)
+        if not verifier.verify(_benchmark_message, signature):
+            raise_general_exception('The ' + backend.name + ' JWT verifier backend could not verify a valid signature')
+        start = perf_counter()
+        for _ in range(iterations):
+            verifier.verify(_benchmark_message, signature)
+        results[backend.name] = iterations / (perf_counter() - start)
+    return results
+
+
+_backend: Union[JWTVerifierBackend, None] = None
+
+
+def create_verifier_backend(backend: Union[JWTVerifierBackend, Literal['pycryptodome', 'cryptography', 'auto'], None]) -> JWTVerifierBackend:
+    if backend is None or backend == 'auto':
+        backends = get_verifier_backends()
+        results = benchmark_verifier_backends(backends, 20)
+        return max(backends, key=lambda b: results[b.name])
+    if backend == 'pycryptodome':
+        return PyCryptodomeJWTVerifierBackend()
+    if backend == 'cryptography':
+        return CryptographyJWTVerifierBackend()
+    if isinstance(backend, JWTVerifierBackend):
+        return backend
+    raise_general_exception('verifier_backend must be one of "pycryptodome", "cryptography", "auto" or a '
+                            'JWTVerifierBackend instance')
+
+
+def set_verifier_backend(backend: Union[JWTVerifierBackend, Literal['pycryptodome', 'cryptography', 'auto'], None]):
+    global _backend
+    if backend is None or backend == 'auto':
+        # the fastest backend is only looked for once a key is parsed
+        _backend = None
+    else:
+        _backend = create_verifier_backend(backend)
+
+
+def get_verifier_backend() -> JWTVerifierBackend:
+    global _backend
+    if _backend is None:
+        _backend = create_verifier_backend('auto')
+    return _backend
+
+
+def create_verifier(signing_public_key: str) -> JWTVerifier:
+    return get_verifier_backend().create_verifier(signing_public_key)
+
+
+class DecodedJWT:
+    """
+    A JWT whose header was checked and whose signature and payload were base64
+    decoded, so that it can be verified against several keys without being
+    decoded again.
+    """
+    __slots__ = ('message', 'signature', 'payload')
+
+    def __init__(self, message: bytes, signature: bytes, payload: bytes):
+        self.message = message
+        self.signature = signature
+        self.payload = payload
+
+
+def decode_jwt(jwt: str) -> DecodedJWT:
     splitted_input = jwt.split(".")
     if len(splitted_input) != 3:
         raise Exception("invalid jwt")
 
-    header, payload, signature = splitted_input
+    header = splitted_input[0]
     if header not in _allowed_headers:
         raise Exception("jwt header mismatch")
 
-    public_key = RSA.import_key(
-        _key_start +
-        "\n".join(
-            wrap(
-                signing_public_key,
-                width=64)) +
-        _key_end)
-    verifier = PKCS115_SigScheme(public_key)
-    to_verify = SHA256.new((header + "." + payload).encode('utf-8'))
+    jwt_bytes = jwt.encode('utf-8')
+    message_end = jwt_bytes.rfind(b'.')
+    jwt_view = memoryview(jwt_bytes)
+    return DecodedJWT(jwt_bytes[:message_end], b64decode(jwt_view[message_end + 1:]),
+                      b64decode(jwt_view[len(header) + 1:message_end]))
+
+
+def verify_jwt(decoded_jwt: DecodedJWT, signing_public_key: Union[str, JWTVerifier]):
+    if isinstance(signing_public_key, str):
+        verifier = create_verifier(signing_public_key)
+    else:
+        verifier = signing_public_key
     try:
-        verifier.verify(to_verify, b64decode(signature.encode('utf-8')))
+        verified = verifier.verify(decoded_jwt.message, decoded_jwt.signature)
     except BaseException:
+        verified = False
+    if not verified:
         raise Exception("jwt verification failed")
 
-    return loads(utf_base64decode(payload))
+
+def get_payload_bytes(jwt: str, signing_public_key: Union[str, JWTVerifier]) -> bytes:
+    """
+    Verifies the JWT and returns its decoded (JSON) payload, without decoding
+    it to a string first.
+    """
+    decoded_jwt = decode_jwt(jwt)
+    verify_jwt(decoded_jwt, signing_public_key)
+    return decoded_jwt.payload
+
+
+def get_payload(jwt, signing_public_key: Union[str, JWTVerifier]):
+    return loads(get_payload_bytes(jwt, signing_public_key))
 
 
 def get_payload_without_verifying(jwt: str) -> dict:
@@ -75,4 +251,4 @@ def get_payload_without_verifying(jwt: str) -> dict:
         raise Exception("invalid jwt")
 
     payload = splitted_input[1]
-    return loads(utf_base64decode(payload))
+    return loads(b64decode(payload))
@@ -36,9 +36,13 @@ from supertokens_python.framework.response import BaseResponse
 if TYPE_CHECKING:
     from supertokens_python.framework import BaseRequest
     from supertokens_python.supertokens import AppInfo
-from .utils import validate_and_normalise_user_input, InputErrorHandlers, InputOverrideConfig, JWTConfig
+from .utils import validate_and_normalise_user_input, InputErrorHandlers, InputOverrideConfig, JWTConfig, \
+    AccessTokenVerificationConfig
 from .constants import SESSION_REFRESH, SIGNOUT
+from .jwt import set_verifier_backend
+from supertokens_python.async_to_sync_wrapper import sync
 from supertokens_python.normalised_url_path import NormalisedURLPath
+from supertokens_python.utils import normalise_http_method
 from supertokens_python.recipe_module import RecipeModule, APIHandled
 from supertokens_python.exceptions import raise_general_exception, SuperTokensError
 from .recipe_implementation import RecipeImplementation
@@ -61,7 +65,8 @@ class SessionRecipe(RecipeModule):
                  anti_csrf: Union[Literal["VIA_TOKEN", "VIA_CUSTOM_HEADER", "NONE"], None] = None,
                  error_handlers: Union[InputErrorHandlers, None] = None,
                  override: Union[InputOverrideConfig, None] = None,
-                 jwt: Union[JWTConfig, None] = None):
+                 jwt: Union[JWTConfig, None] = None,
+                 access_token_verification: Union[AccessTokenVerificationConfig, None] = None):
         super().__init__(recipe_id, app_info)
         self.openid_recipe: Union[None, OpenIdRecipe] = None
         self.config = validate_and_normalise_user_input(self, app_info, cookie_domain,
@@ -71,7 +76,9 @@ class SessionRecipe(RecipeModule):
                                                         anti_csrf,
                                                         error_handlers,
                                                         override,
-                                                        jwt)
+                                                        jwt,
+                                                        access_token_verification)
+        set_verifier_backend(self.config.access_token_verification.verifier_backend)
         if self.config.jwt.enable:
             openid_feature_override = None
             if override is not None:
@@ -157,7 +164,8 @@ class SessionRecipe(RecipeModule):
              anti_csrf: Union[Literal["VIA_TOKEN", "VIA_CUSTOM_HEADER", "NONE"], None] = None,
              error_handlers: Union[InputErrorHandlers, None] = None,
              override: Union[InputOverrideConfig, None] = None,
-             jwt: Union[JWTConfig, None] = None):
+             jwt: Union[JWTConfig, None] = None,
+             access_token_verification: Union[AccessTokenVerificationConfig, None] = None):
         def func(app_info: AppInfo):
             if SessionRecipe.__instance is None:
                 SessionRecipe.__instance = SessionRecipe(
@@ -168,7 +176,8 @@ class SessionRecipe(RecipeModule):
                     anti_csrf,
                     error_handlers,
                     override,
-                    jwt
+                    jwt,
+                    access_token_verification
                 )
                 return SessionRecipe.__instance
             else:
@@ -191,6 +200,9 @@ class SessionRecipe(RecipeModule):
                 environ['SUPERTOKENS_ENV'] != 'testing'):
             raise_general_exception(
                 None, 'calling testing function in non testing env')
+        if SessionRecipe.__instance is not None and \
+                isinstance(SessionRecipe.__instance.recipe_implementation, RecipeImplementation):
+            SessionRecipe.__instance.recipe_implementation.shutdown()
         SessionRecipe.__instance = None
 
     async def verify_session(self, request: BaseRequest, anti_csrf_check: Union[bool, None] = None,
@@ -205,3 +217,22 @@ class SessionRecipe(RecipeModule):
                 self.openid_recipe.jwt_recipe.recipe_implementation if self.openid_recipe is not None else None
             ), anti_csrf_check,
             session_required)
+
+    def sync_verify_session(self, request: BaseRequest, anti_csrf_check: Union[bool, None] = None,
+                            session_required: bool = True):
+        api_implementation = self.api_implementation
+        if not self.can_get_session_without_event_loop() or type(api_implementation) is not APIImplementation or \
+                'verify_session' in vars(api_implementation):
+            return sync(self.verify_session(request, anti_csrf_check, session_required))
+        method = normalise_http_method(request.method())
+        if method == 'options' or method == 'trace':
+            return None
+        incoming_path = NormalisedURLPath(request.get_path())
+        if incoming_path.equals(self.config.refresh_token_path) and method == 'post':
+            return sync(self.recipe_implementation.refresh_session(request))
+        return self.recipe_implementation.sync_get_session(request, anti_csrf_check, session_required)
+
+    def can_get_session_without_event_loop(self) -> bool:
+        # overridden functions can only be called asynchronously
+        return self.config.mode == 'wsgi' and type(self.recipe_implementation) is RecipeImplementation and \
+            'get_session' not in vars(self.recipe_implementation)
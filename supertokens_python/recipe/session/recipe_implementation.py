@@ -12,8 +12,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 from __future__ import annotations
+from threading import Lock, Timer
 from .session_class import Session
 from supertokens_python.process_state import ProcessState, AllowedProcessStates
+from supertokens_python.request_coalescer import RequestCoalescer
 from supertokens_python.normalised_url_path import NormalisedURLPath
 from typing import TYPE_CHECKING
 from .interfaces import RecipeInterface
@@ -21,6 +23,10 @@ from .exceptions import raise_unauthorised_exception, raise_try_refresh_token_ex
 from .cookie_and_header import get_id_refresh_token_from_cookie, get_access_token_from_cookie, get_anti_csrf_header, \
     get_rid_header, get_refresh_token_from_cookie
 from . import session_functions
+from .signing_key_ring import SigningKeyRing
+from .verified_token_cache import VerifiedAccessTokenCache
+from .verification_executor import VerificationExecutor
+from .revocation_cache import RevocationCache
 from supertokens_python.utils import execute_in_background, FRAMEWORKS, frontend_has_interceptor, \
     normalise_http_method, get_timestamp_ms
 
@@ -28,6 +34,7 @@ if TYPE_CHECKING:
     from typing import Union, List
     from .utils import SessionConfig
     from supertokens_python.querier import Querier
+    from .interfaces import VerifyAccessTokenResult
 
 
 class HandshakeInfo:
@@ -35,24 +42,50 @@ class HandshakeInfo:
     def __init__(self, info):
         self.access_token_blacklisting_enabled = info['accessTokenBlacklistingEnabled']
         self.raw_jwt_signing_public_key_list = None
+        self.signing_key_ring: Union[SigningKeyRing, None] = None
         self.anti_csrf = info['antiCsrf']
         self.access_token_validity = info['accessTokenValidity']
         self.refresh_token_validity = info['refreshTokenValidity']
 
     def set_jwt_signing_public_key_list(self, updated_list: List):
+        if self.signing_key_ring is None or updated_list != self.raw_jwt_signing_public_key_list:
+            # the keys are only parsed again when they have changed
+            self.signing_key_ring = SigningKeyRing(updated_list, self.signing_key_ring)
         self.raw_jwt_signing_public_key_list = updated_list
 
     def get_jwt_signing_public_key_list(self) -> List:
-        time_now = get_timestamp_ms()
-        return [key for key in self.raw_jwt_signing_public_key_list if key['expiryTime'] > time_now]
+        return self.signing_key_ring.get_valid_key_list()
 
 
 class RecipeImplementation(RecipeInterface):
+    # how long to wait before trying again when a proactive handshake refresh fails
+    __REFRESH_RETRY_SECONDS = 10
+
     def __init__(self, querier: Querier, config: SessionConfig):
         super().__init__()
         self.querier = querier
         self.config = config
         self.handshake_info: Union[HandshakeInfo, None] = None
+        self.__handshake_coalescer = RequestCoalescer()
+        self.__handshake_lock = Lock()
+        self.__handshake_refresh_timer = None
+        self.__handshake_refresh_stopped = False
+        self.verified_token_cache: Union[VerifiedAccessTokenCache, None] = None
+        if config.access_token_verification.cache_verified_tokens:
+            self.verified_token_cache = VerifiedAccessTokenCache(config.access_token_verification.cache_max_size)
+        self.verification_executor: Union[VerificationExecutor, None] = None
+        if config.access_token_verification.executor is not None and config.mode == 'asgi':
+            self.verification_executor = VerificationExecutor(config.access_token_verification)
+        self.revocation_cache: Union[RevocationCache, None] = None
+        if config.access_token_verification.revocation_cache is not None:
+            self.revocation_cache = RevocationCache(config.access_token_verification.revocation_cache)
+
+        if config.mode == 'wsgi':
+            try:
+                self.sync_get_handshake_info()
+            except Exception:
+                pass
+            return
 
         async def call_get_handshake_info():
             try:
@@ -68,20 +101,97 @@ class RecipeImplementation(RecipeInterface):
     async def get_handshake_info(self, force_refetch=False) -> HandshakeInfo:
         if self.handshake_info is None or len(
                 self.handshake_info.get_jwt_signing_public_key_list()) == 0 or force_refetch:
-            ProcessState.get_instance().add_state(
-                AllowedProcessStates.CALLING_SERVICE_IN_GET_HANDSHAKE_INFO)
-            response = await self.querier.send_post_request(NormalisedURLPath('/recipe/handshake'), {})
-            self.handshake_info = HandshakeInfo({
-                **response,
-                'antiCsrf': self.config.anti_csrf
-            })
-
-            self.update_jwt_signing_public_key_info(response['jwtSigningPublicKeyList'],
-                                                    response['jwtSigningPublicKey'],
-                                                    response['jwtSigningPublicKeyExpiryTime'])
+            # concurrent callers share one /recipe/handshake call
+            await self.__handshake_coalescer.run('handshake', self.__fetch_handshake_info)
+
+        return self.handshake_info
+
+    async def __fetch_handshake_info(self):
+        ProcessState.get_instance().add_state(
+            AllowedProcessStates.CALLING_SERVICE_IN_GET_HANDSHAKE_INFO)
+        response = await self.querier.send_post_request(NormalisedURLPath('/recipe/handshake'), {})
+        self.__set_handshake_info(response)
+        self.__schedule_handshake_refresh()
+
+    def sync_get_handshake_info(self, force_refetch=False) -> HandshakeInfo:
+        handshake_info = self.handshake_info
+        if handshake_info is None or len(
+                handshake_info.get_jwt_signing_public_key_list()) == 0 or force_refetch:
+            with self.__handshake_lock:
+                # another thread may have fetched it while this one was waiting
+                if self.handshake_info is handshake_info:
+                    ProcessState.get_instance().add_state(
+                        AllowedProcessStates.CALLING_SERVICE_IN_GET_HANDSHAKE_INFO)
+                    response = self.querier.sync_send_post_request(NormalisedURLPath('/recipe/handshake'), {})
+                    self.__set_handshake_info(response)
+                    self.__schedule_handshake_refresh()
 
         return self.handshake_info
 
+    def __schedule_handshake_refresh(self, delay: Union[float, None] = None):
+        # refetches the handshake info before the first signing key expires, so
+        # that requests never have to wait for it. The current keys are used
+        # until the new ones arrive. The refresh runs on a timer thread with
+        # the sync querier, since the event loop that fetched the handshake
+        # info (e.g. the one of a sync() call) may not be running later.
+        refresh_ahead_seconds = self.config.access_token_verification.refresh_signing_keys_ahead_seconds
+        if refresh_ahead_seconds is None or self.handshake_info is None or self.__handshake_refresh_stopped:
+            return
+        if delay is None:
+            keys = self.handshake_info.signing_key_ring.get_valid_keys()
+            if len(keys) == 0:
+                return
+            seconds_to_expiry = (min(key.expiry_time for key in keys) - get_timestamp_ms()) / 1000
+            delay = seconds_to_expiry - refresh_ahead_seconds
+            if delay <= 0:
+                # the core only rotates the keys once they expire
+                delay = seconds_to_expiry
+        self.__cancel_handshake_refresh()
+        timer = Timer(delay, self.__refresh_handshake_info)
+        timer.daemon = True
+        timer.start()
+        self.__handshake_refresh_timer = timer
+
+    def __refresh_handshake_info(self):
+        try:
+            self.sync_get_handshake_info(True)
+        except Exception:
+            self.__schedule_handshake_refresh(RecipeImplementation.__REFRESH_RETRY_SECONDS)
+
+    def stop_handshake_refresh(self):
+        # a refresh that is already running does not schedule the next one
+        self.__handshake_refresh_stopped = True
+        self.__cancel_handshake_refresh()
+
+    def shutdown(self):
+        # stops the background work of this implementation, for when the
+        # recipe is reset
+        self.stop_handshake_refresh()
+        if self.verification_executor is not None:
+            self.verification_executor.shutdown()
+
+    def __cancel_handshake_refresh(self):
+        if self.__handshake_refresh_timer is not None:
+            self.__handshake_refresh_timer.cancel()
+            self.__handshake_refresh_timer = None
+
+    def __set_handshake_info(self, response: dict):
+        handshake_info = HandshakeInfo({
+            **response,
+            'antiCsrf': self.config.anti_csrf
+        })
+        if self.handshake_info is not None:
+            # lets the new handshake info reuse the already parsed keys
+            handshake_info.raw_jwt_signing_public_key_list = self.handshake_info.raw_jwt_signing_public_key_list
+            handshake_info.signing_key_ring = self.handshake_info.signing_key_ring
+        self.handshake_info = handshake_info
+        if self.revocation_cache is not None:
+            self.revocation_cache.set_access_token_validity(handshake_info.access_token_validity)
+
+        self.update_jwt_signing_public_key_info(response['jwtSigningPublicKeyList'],
+                                                response['jwtSigningPublicKey'],
+                                                response['jwtSigningPublicKeyExpiryTime'])
+
     def update_jwt_signing_public_key_info(self, key_list: Union[List, None], public_key: str, expiry_time: int):
         if key_list is None:
             key_list = [{
@@ -116,6 +226,35 @@ class RecipeImplementation(RecipeInterface):
         if not hasattr(request, 'wrapper_used') or not request.wrapper_used:
             request = FRAMEWORKS[self.config.framework].wrap_request(request)
 
+        tokens = self.__get_session_tokens(request, anti_csrf_check, session_required)
+        if tokens is None:
+            return None
+        access_token, anti_csrf_token, anti_csrf_check = tokens
+        new_session = await session_functions.get_session(self, access_token, anti_csrf_token, anti_csrf_check,
+                                                          get_rid_header(request) is not None)
+        return self.__set_request_session(request, access_token, new_session)
+
+    def sync_get_session(self, request: any, anti_csrf_check: Union[bool, None] = None,
+                         session_required: bool = True) -> Union[Session, None]:
+        if not hasattr(request, 'wrapper_used') or not request.wrapper_used:
+            request = FRAMEWORKS[self.config.framework].wrap_request(request)
+
+        tokens = self.__get_session_tokens(request, anti_csrf_check, session_required)
+        if tokens is None:
+            return None
+        access_token, anti_csrf_token, anti_csrf_check = tokens
+        new_session = session_functions.sync_get_session(self, access_token, anti_csrf_token, anti_csrf_check,
+                                                         get_rid_header(request) is not None)
+        return self.__set_request_session(request, access_token, new_session)
+
+    async def verify_access_tokens(self, access_tokens: List[str]) -> List[VerifyAccessTokenResult]:
+        return await session_functions.verify_access_tokens(self, access_tokens)
+
+    def sync_verify_access_tokens(self, access_tokens: List[str]) -> List[VerifyAccessTokenResult]:
+        return session_functions.sync_verify_access_tokens(self, access_tokens)
+
+    @staticmethod
+    def __get_session_tokens(request: any, anti_csrf_check: Union[bool, None], session_required: bool):
         id_refresh_token = get_id_refresh_token_from_cookie(request)
         if id_refresh_token is None:
             if not session_required:
@@ -132,8 +271,9 @@ class RecipeImplementation(RecipeInterface):
         anti_csrf_token = get_anti_csrf_header(request)
         if anti_csrf_check is None:
             anti_csrf_check = normalise_http_method(request.method()) != 'get'
-        new_session = await session_functions.get_session(self, access_token, anti_csrf_token, anti_csrf_check,
-                                                          get_rid_header(request) is not None)
+        return access_token, anti_csrf_token, anti_csrf_check
+
+    def __set_request_session(self, request: any, access_token: str, new_session: dict) -> Session:
         if 'accessToken' in new_session:
             access_token = new_session['accessToken']['token']
 
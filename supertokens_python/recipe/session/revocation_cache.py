@@ -0,0 +1,166 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from collections import OrderedDict
+from hashlib import blake2b
+from threading import Lock
+from typing import TYPE_CHECKING, List, Union
+
+from supertokens_python.utils import get_timestamp_ms
+
+if TYPE_CHECKING:
+    from .utils import RevocationCacheConfig
+
+# the default access token validity of the core, used until the handshake is done
+_DEFAULT_ACCESS_TOKEN_VALIDITY_MS = 60 * 60 * 1000
+
+
+class _BloomFilter:
+    def __init__(self, size_bits: int, hash_count: int):
+        self.size_bits = size_bits
+        self.hash_count = hash_count
+        self.__bits = bytearray((size_bits + 7) // 8)
+
+    def __positions(self, value: str) -> List[int]:
+        digest = blake2b(value.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size_bits for i in range(self.hash_count)]
+
+    def add(self, value: str):
+        for position in self.__positions(value):
+            self.__bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        for position in self.__positions(value):
+            if not self.__bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class RevocationCache:
+    """
+    Local view of the revoked sessions, which lets sessions be verified
+    without calling the core even though access token blacklisting is
+    enabled.
+
+    Sessions revoked through this SDK are added to a bloom filter and to a
+    bounded set of exact session handles. A handle in the exact set is
+    rejected locally, while a handle that is only in the bloom filter is
+    verified by the core. Every other session is confirmed by the core at
+    most once per staleness window, which bounds how long a revocation made
+    elsewhere (by another instance or the dashboard) goes unnoticed.
+
+    Revoked handles are kept for one access token validity, since all access
+    tokens of a revoked session have expired by then.
+    """
+
+    def __init__(self, config: RevocationCacheConfig):
+        self.config = config
+        self.__lock = Lock()
+        self.__access_token_validity_ms = _DEFAULT_ACCESS_TOKEN_VALIDITY_MS
+        # session handle -> time it was revoked / confirmed by the core
+        self.__revoked: OrderedDict[str, int] = OrderedDict()
+        self.__confirmed: OrderedDict[str, int] = OrderedDict()
+        # the current filter and the previous one; a handle stays in one of
+        # them for at least one access token validity
+        self.__filters = [self.__create_filter(), self.__create_filter()]
+        self.__filter_created_at = get_timestamp_ms()
+        self.local_verifications = 0
+        self.core_verifications = 0
+        self.possible_hits = 0
+        self.revoked_rejections = 0
+
+    def __create_filter(self) -> _BloomFilter:
+        return _BloomFilter(self.config.bloom_filter_size_bits, self.config.bloom_filter_hash_count)
+
+    def __get_revoked_ttl_ms(self) -> Union[int, float]:
+        if self.config.revoked_session_ttl_seconds is not None:
+            return self.config.revoked_session_ttl_seconds * 1000
+        return self.__access_token_validity_ms
+
+    def __prune(self, time_now: int):
+        ttl_ms = self.__get_revoked_ttl_ms()
+        if time_now - self.__filter_created_at >= ttl_ms:
+            self.__filters = [self.__create_filter(), self.__filters[0]]
+            self.__filter_created_at = time_now
+        while len(self.__revoked) > 0:
+            session_handle, revoked_at = next(iter(self.__revoked.items()))
+            if len(self.__revoked) <= self.config.max_revoked_sessions and time_now - revoked_at < ttl_ms:
+                break
+            # evicted handles are still in the bloom filter, so they are verified by the core
+            self.__revoked.popitem(last=False)
+
+    def set_access_token_validity(self, access_token_validity_ms: int):
+        self.__access_token_validity_ms = access_token_validity_ms
+
+    def add_revoked_sessions(self, session_handles: List[str]):
+        with self.__lock:
+            time_now = get_timestamp_ms()
+            self.__prune(time_now)
+            for session_handle in session_handles:
+                self.__filters[0].add(session_handle)
+                self.__revoked[session_handle] = time_now
+                self.__revoked.move_to_end(session_handle)
+                self.__confirmed.pop(session_handle, None)
+            self.__prune(time_now)
+
+    def on_session_verified(self, session_handle: str):
+        # called once the core has verified a session
+        with self.__lock:
+            self.__confirmed[session_handle] = get_timestamp_ms()
+            self.__confirmed.move_to_end(session_handle)
+            while len(self.__confirmed) > self.config.max_confirmed_sessions:
+                self.__confirmed.popitem(last=False)
+
+    def check(self, session_handle: str) -> Union[bool, None]:
+        """
+        Returns False if the session was revoked, True if it can be trusted
+        without calling the core and None if the core has to verify it.
+        """
+        with self.__lock:
+            time_now = get_timestamp_ms()
+            self.__prune(time_now)
+            if any(session_handle in bloom_filter for bloom_filter in self.__filters):
+                if session_handle in self.__revoked:
+                    self.revoked_rejections += 1
+                    return False
+                self.possible_hits += 1
+                return None
+            confirmed_at = self.__confirmed.get(session_handle)
+            if confirmed_at is None or time_now - confirmed_at > self.config.staleness_seconds * 1000:
+                self.core_verifications += 1
+                return None
+            self.__confirmed.move_to_end(session_handle)
+            self.local_verifications += 1
+            return True
+
+    def clear(self):
+        with self.__lock:
+            self.__revoked.clear()
+            self.__confirmed.clear()
+            self.__filters = [self.__create_filter(), self.__create_filter()]
+            self.__filter_created_at = get_timestamp_ms()
+
+    def get_stats(self) -> dict:
+        with self.__lock:
+            return {
+                'revokedSessions': len(self.__revoked),
+                'confirmedSessions': len(self.__confirmed),
+                'localVerifications': self.local_verifications,
+                'coreVerifications': self.core_verifications,
+                'possibleHits': self.possible_hits,
+                'revokedRejections': self.revoked_rejections
+            }
@@ -20,6 +20,7 @@ if TYPE_CHECKING:
     from .recipe_implementation import RecipeImplementation
 
 from . import session_functions
+from .access_token import materialise_access_token_payload
 from .exceptions import raise_unauthorised_exception
 
 
@@ -69,6 +70,7 @@ class Session:
             'accessToken': self.__access_token,
             'userDataInJWT': new_access_token_payload
         })
+        session_functions.invalidate_cached_session_information(self.__recipe_implementation, [self.__session_handle])
         if result['status'] == 'UNAUTHORISED':
             raise_unauthorised_exception('Session has probably been revoked while updating access token payload')
         self.access_token_payload = result['session']['userDataInJWT']
@@ -76,6 +78,16 @@ class Session:
             self.__access_token = result['accessToken']['token']
             self.new_access_token_info = result['accessToken']
 
+    @property
+    def access_token_payload(self) -> dict:
+        # the payload of a locally verified access token is only parsed when it is read
+        self.__access_token_payload = materialise_access_token_payload(self.__access_token_payload)
+        return self.__access_token_payload
+
+    @access_token_payload.setter
+    def access_token_payload(self, access_token_payload):
+        self.__access_token_payload = access_token_payload
+
     def get_user_id(self) -> str:
         return self.user_id
 
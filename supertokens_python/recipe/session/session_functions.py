@@ -14,21 +14,35 @@
 from __future__ import annotations
 
 import time
-from typing import Union, TYPE_CHECKING, List
-from .access_token import get_info_from_access_token
-from .jwt import get_payload_without_verifying
+from asyncio import Semaphore, gather
+from typing import Union, TYPE_CHECKING, Dict, List, Tuple
+from .access_token import decode_access_token, get_info_from_decoded_access_token, materialise_access_token_payload
 
 if TYPE_CHECKING:
-    from .recipe_implementation import RecipeImplementation
+    from .recipe_implementation import HandshakeInfo, RecipeImplementation
+    from .signing_key_ring import SigningKey, SigningKeyRing
+    from .verified_token_cache import VerifiedAccessTokenCache
+    from .revocation_cache import RevocationCache
 from supertokens_python.normalised_url_path import NormalisedURLPath
 from .exceptions import (
     raise_try_refresh_token_exception,
     raise_unauthorised_exception,
     raise_token_theft_exception,
-    TryRefreshTokenError
+    TryRefreshTokenError,
+    UnauthorisedError
+)
+from .interfaces import (
+    VerifyAccessTokenResult,
+    VerifyAccessTokenResultOk,
+    VerifyAccessTokenResultTryRefreshToken,
+    VerifyAccessTokenResultUnauthorised
 )
 from supertokens_python.process_state import AllowedProcessStates, ProcessState
 
+# the tokens of a batch that the core has to verify are sent at most this
+# many at a time
+MAX_CONCURRENT_CORE_VERIFICATIONS = 10
+
 
 async def create_new_session(recipe_implementation: RecipeImplementation, user_id: str,
                              access_token_payload: Union[dict, None] = None,
@@ -60,42 +74,158 @@ async def get_session(recipe_implementation: RecipeImplementation, access_token:
                       anti_csrf_token: Union[str, None],
                       do_anti_csrf_check: bool, contains_custom_header: bool):
     handshake_info = await recipe_implementation.get_handshake_info()
-    access_token_info = None
-    found_a_sign_key_that_is_older_than_the_access_token = False
+    if recipe_implementation.verification_executor is None:
+        result = get_session_without_calling_core(handshake_info, access_token, anti_csrf_token, do_anti_csrf_check,
+                                                  contains_custom_header, recipe_implementation.verified_token_cache,
+                                                  recipe_implementation.revocation_cache)
+    else:
+        result = await get_session_without_calling_core_in_executor(recipe_implementation, handshake_info,
+                                                                    access_token, anti_csrf_token,
+                                                                    do_anti_csrf_check, contains_custom_header)
+    if result is not None:
+        return result
 
-    for key in handshake_info.get_jwt_signing_public_key_list():
+    ProcessState.get_instance().add_state(
+        AllowedProcessStates.CALLING_SERVICE_IN_VERIFY)
+    response = await recipe_implementation.querier.send_post_request(
+        NormalisedURLPath('/recipe/session/verify'),
+        get_session_verify_request_data(handshake_info, access_token, anti_csrf_token, do_anti_csrf_check))
+    if session_verify_response_needs_handshake_refetch(response):
+        await recipe_implementation.get_handshake_info(True)
+    return process_session_verify_response(recipe_implementation, response)
+
+
+def sync_get_session(recipe_implementation: RecipeImplementation, access_token: str,
+                     anti_csrf_token: Union[str, None],
+                     do_anti_csrf_check: bool, contains_custom_header: bool):
+    handshake_info = recipe_implementation.sync_get_handshake_info()
+    result = get_session_without_calling_core(handshake_info, access_token, anti_csrf_token, do_anti_csrf_check,
+                                              contains_custom_header, recipe_implementation.verified_token_cache,
+                                              recipe_implementation.revocation_cache)
+    if result is not None:
+        return result
+
+    ProcessState.get_instance().add_state(
+        AllowedProcessStates.CALLING_SERVICE_IN_VERIFY)
+    response = recipe_implementation.querier.sync_send_post_request(
+        NormalisedURLPath('/recipe/session/verify'),
+        get_session_verify_request_data(handshake_info, access_token, anti_csrf_token, do_anti_csrf_check))
+    if session_verify_response_needs_handshake_refetch(response):
+        recipe_implementation.sync_get_handshake_info(True)
+    return process_session_verify_response(recipe_implementation, response)
+
+
+def get_access_token_time_created(access_token: str) -> Union[int, None]:
+    try:
+        time_created = decode_access_token(access_token).payload.get('timeCreated')
+    except TryRefreshTokenError:
+        return None
+    return time_created if isinstance(time_created, int) else None
+
+
+def verify_access_token_with_signing_keys(signing_key_ring: SigningKeyRing, access_token: str,
+                                          do_anti_csrf_check_via_token: bool) -> Tuple[bool, Union[dict, None], Union[SigningKey, None]]:
+    # returns whether a signing key older than the token was found, the verified
+    # token info (if any) and the key that verified it
+
+    # the token is only decoded once, and the key that most likely signed it
+    # is tried first
+    try:
+        decoded_access_token = decode_access_token(access_token)
+    except TryRefreshTokenError as e:
+        if len(signing_key_ring.get_keys_for_token(None)) > 0:
+            raise e
+        return False, None, None
+    time_created = decoded_access_token.payload.get('timeCreated')
+    expiry_time = decoded_access_token.payload.get('expiryTime')
+
+    for key in signing_key_ring.get_keys_for_token(time_created if isinstance(time_created, int) else None):
         try:
-            access_token_info = get_info_from_access_token(access_token,
-                                                           key['publicKey'],
-                                                           handshake_info.anti_csrf == 'VIA_TOKEN'
-                                                           and do_anti_csrf_check)
+            access_token_info = get_info_from_decoded_access_token(decoded_access_token,
+                                                                   key.get_verifier(),
+                                                                   do_anti_csrf_check_via_token)
 
-            found_a_sign_key_that_is_older_than_the_access_token = True
+            return True, access_token_info, key
 
         except Exception as e:
-            payload = None
-
             if e.__class__ != TryRefreshTokenError:
                 raise e
 
-            try:
-                payload = get_payload_without_verifying(access_token)
-            except BaseException:
+            if not isinstance(time_created, int) or not isinstance(expiry_time, int):
                 raise e
 
-            if payload is None:
+            if expiry_time < time.time():
                 raise e
 
-            if not isinstance(payload['timeCreated'], int) or not isinstance(payload['expiryTime'], int):
-                raise e
-
-            if payload['expiryTime'] < time.time():
-                raise e
-
-            if payload['timeCreated'] >= key['createdAt']:
-                found_a_sign_key_that_is_older_than_the_access_token = True
-                break
-
+            if time_created >= key.created_at:
+                return True, None, None
+
+    return False, None, None
+
+
+def get_access_token_info_from_cache(handshake_info: HandshakeInfo, access_token: str, do_anti_csrf_check: bool,
+                                     verified_token_cache: Union[VerifiedAccessTokenCache, None]) -> Union[dict, None]:
+    if verified_token_cache is None:
+        return None
+    access_token_info = verified_token_cache.get(access_token, handshake_info.signing_key_ring)
+    if access_token_info is not None and handshake_info.anti_csrf == 'VIA_TOKEN' and do_anti_csrf_check and \
+            access_token_info['antiCsrfToken'] is None:
+        # it is verified again, so that the usual error is raised
+        return None
+    return access_token_info
+
+
+def get_session_without_calling_core(handshake_info: HandshakeInfo, access_token: str,
+                                     anti_csrf_token: Union[str, None],
+                                     do_anti_csrf_check: bool, contains_custom_header: bool,
+                                     verified_token_cache: Union[VerifiedAccessTokenCache, None] = None,
+                                     revocation_cache: Union[RevocationCache, None] = None) -> Union[dict, None]:
+    # returns None if the session has to be verified by the core
+    access_token_info = get_access_token_info_from_cache(handshake_info, access_token, do_anti_csrf_check,
+                                                         verified_token_cache)
+    if access_token_info is not None:
+        return get_session_from_access_token_info(handshake_info, True, access_token_info, anti_csrf_token,
+                                                  do_anti_csrf_check, contains_custom_header, revocation_cache)
+
+    found_a_sign_key_that_is_older_than_the_access_token, access_token_info, key = \
+        verify_access_token_with_signing_keys(handshake_info.signing_key_ring, access_token,
+                                              handshake_info.anti_csrf == 'VIA_TOKEN' and do_anti_csrf_check)
+    if access_token_info is not None and verified_token_cache is not None:
+        verified_token_cache.put(access_token, access_token_info, key, handshake_info.signing_key_ring)
+    return get_session_from_access_token_info(handshake_info, found_a_sign_key_that_is_older_than_the_access_token,
+                                              access_token_info, anti_csrf_token, do_anti_csrf_check,
+                                              contains_custom_header, revocation_cache)
+
+
+async def get_session_without_calling_core_in_executor(recipe_implementation: RecipeImplementation,
+                                                       handshake_info: HandshakeInfo, access_token: str,
+                                                       anti_csrf_token: Union[str, None], do_anti_csrf_check: bool,
+                                                       contains_custom_header: bool) -> Union[dict, None]:
+    # same as get_session_without_calling_core, but the signature is verified by the verification executor
+    verified_token_cache = recipe_implementation.verified_token_cache
+    revocation_cache = recipe_implementation.revocation_cache
+    access_token_info = get_access_token_info_from_cache(handshake_info, access_token, do_anti_csrf_check,
+                                                         verified_token_cache)
+    if access_token_info is not None:
+        return get_session_from_access_token_info(handshake_info, True, access_token_info, anti_csrf_token,
+                                                  do_anti_csrf_check, contains_custom_header, revocation_cache)
+
+    signing_key_ring = handshake_info.signing_key_ring
+    found_a_sign_key_that_is_older_than_the_access_token, access_token_info, key = \
+        await recipe_implementation.verification_executor.verify(
+            signing_key_ring, access_token, handshake_info.anti_csrf == 'VIA_TOKEN' and do_anti_csrf_check)
+    if access_token_info is not None and key is not None and verified_token_cache is not None:
+        verified_token_cache.put(access_token, access_token_info, key, signing_key_ring)
+    return get_session_from_access_token_info(handshake_info, found_a_sign_key_that_is_older_than_the_access_token,
+                                              access_token_info, anti_csrf_token, do_anti_csrf_check,
+                                              contains_custom_header, revocation_cache)
+
+
+def get_session_from_access_token_info(handshake_info: HandshakeInfo,
+                                       found_a_sign_key_that_is_older_than_the_access_token: bool,
+                                       access_token_info: Union[dict, None], anti_csrf_token: Union[str, None],
+                                       do_anti_csrf_check: bool, contains_custom_header: bool,
+                                       revocation_cache: Union[RevocationCache, None] = None) -> Union[dict, None]:
     if not found_a_sign_key_that_is_older_than_the_access_token:
         raise_try_refresh_token_exception(
             'anti-csrf check failed')
@@ -118,8 +248,10 @@ async def get_session(recipe_implementation: RecipeImplementation, access_token:
                                          'header in the request, or set doAntiCsrfCheck to false '
                                          'for this API')
 
-    if access_token_info is not None and not handshake_info.access_token_blacklisting_enabled and \
-            access_token_info['parentRefreshTokenHash1'] is None:
+    # a token with a parent refresh token is always sent to the core, which revokes the parent token
+    if access_token_info is not None and access_token_info['parentRefreshTokenHash1'] is None and \
+            (not handshake_info.access_token_blacklisting_enabled or
+             is_session_valid_without_calling_core(revocation_cache, access_token_info['sessionHandle'])):
         return {
             'session': {
                 'handle': access_token_info['sessionHandle'],
@@ -127,10 +259,181 @@ async def get_session(recipe_implementation: RecipeImplementation, access_token:
                 'userDataInJWT': access_token_info['userData']
             }
         }
-
-    ProcessState.get_instance().add_state(
-        AllowedProcessStates.CALLING_SERVICE_IN_VERIFY)
-
+    return None
+
+
+def is_session_valid_without_calling_core(revocation_cache: Union[RevocationCache, None], session_handle: str) -> bool:
+    if revocation_cache is None:
+        return False
+    valid = revocation_cache.check(session_handle)
+    if valid is False:
+        raise_unauthorised_exception('Session has been revoked')
+    return valid is True
+
+
+def group_access_tokens_by_signing_key(signing_key_ring: SigningKeyRing, access_tokens: List[str],
+                                       max_group_size: int = 100) -> List[List[str]]:
+    groups: Dict[Union[str, None], List[List[str]]] = {}
+    for access_token in access_tokens:
+        keys = signing_key_ring.get_keys_for_token(get_access_token_time_created(access_token))
+        chunks = groups.setdefault(keys[0].public_key if len(keys) > 0 else None, [[]])
+        if len(chunks[-1]) >= max_group_size:
+            chunks.append([])
+        chunks[-1].append(access_token)
+    return [chunk for chunks in groups.values() for chunk in chunks]
+
+
+def verify_access_tokens_with_signing_keys(signing_key_ring: SigningKeyRing, access_tokens: List[str]) -> List[
+        Union[Tuple[bool, Union[dict, None], Union[SigningKey, None]], TryRefreshTokenError]]:
+    verifications = []
+    for access_token in access_tokens:
+        try:
+            verifications.append(verify_access_token_with_signing_keys(signing_key_ring, access_token, False))
+        except TryRefreshTokenError as e:
+            verifications.append(e)
+    return verifications
+
+
+def get_verify_access_token_result(handshake_info: HandshakeInfo, verification: Union[
+        Tuple[bool, Union[dict, None], Union[SigningKey, None]], TryRefreshTokenError],
+        revocation_cache: Union[RevocationCache, None] = None) -> Union[VerifyAccessTokenResult, None]:
+    # returns None if the token has to be verified by the core
+    if isinstance(verification, TryRefreshTokenError):
+        return VerifyAccessTokenResultTryRefreshToken(str(verification))
+    found_a_sign_key_that_is_older_than_the_access_token, access_token_info, _ = verification
+    try:
+        result = get_session_from_access_token_info(handshake_info, found_a_sign_key_that_is_older_than_the_access_token,
+                                                    access_token_info, None, False, False, revocation_cache)
+    except UnauthorisedError as e:
+        return VerifyAccessTokenResultUnauthorised(str(e))
+    except TryRefreshTokenError as e:
+        return VerifyAccessTokenResultTryRefreshToken(str(e))
+    if result is None:
+        return None
+    return VerifyAccessTokenResultOk(result['session']['handle'], result['session']['userId'],
+                                     materialise_access_token_payload(result['session']['userDataInJWT']))
+
+
+def get_verify_access_token_result_from_core_response(recipe_implementation: RecipeImplementation,
+                                                      response: dict) -> VerifyAccessTokenResult:
+    try:
+        response = process_session_verify_response(recipe_implementation, response)
+    except UnauthorisedError as e:
+        return VerifyAccessTokenResultUnauthorised(str(e))
+    except TryRefreshTokenError as e:
+        return VerifyAccessTokenResultTryRefreshToken(str(e))
+    return VerifyAccessTokenResultOk(response['session']['handle'], response['session']['userId'],
+                                     response['session']['userDataInJWT'], response.get('accessToken'))
+
+
+def prepare_access_token_verification(handshake_info: HandshakeInfo, access_tokens: List[str],
+                                      verified_token_cache: Union[VerifiedAccessTokenCache, None],
+                                      revocation_cache: Union[RevocationCache, None] = None) -> Tuple[
+        Dict[str, VerifyAccessTokenResult], List[List[str]]]:
+    # returns the results of the tokens found in the cache and the remaining
+    # (unique) tokens, grouped by the key that most likely signed them
+    results = {}
+    to_verify = []
+    for access_token in set(access_tokens):
+        access_token_info = get_access_token_info_from_cache(handshake_info, access_token, False, verified_token_cache)
+        result = None
+        if access_token_info is not None:
+            result = get_verify_access_token_result(handshake_info, (True, access_token_info, None), revocation_cache)
+        if result is None:
+            to_verify.append(access_token)
+        else:
+            results[access_token] = result
+    return results, group_access_tokens_by_signing_key(handshake_info.signing_key_ring, to_verify)
+
+
+def process_access_token_verifications(handshake_info: HandshakeInfo, signing_key_ring: SigningKeyRing,
+                                       verified_token_cache: Union[VerifiedAccessTokenCache, None],
+                                       groups: List[List[str]], group_verifications: List[List],
+                                       results: Dict[str, VerifyAccessTokenResult],
+                                       revocation_cache: Union[RevocationCache, None] = None) -> List[str]:
+    # adds the results of the verified tokens and returns the tokens that have to be verified by the core
+    needs_core = []
+    for access_tokens, verifications in zip(groups, group_verifications):
+        for access_token, verification in zip(access_tokens, verifications):
+            if not isinstance(verification, TryRefreshTokenError) and verification[1] is not None and \
+                    verification[2] is not None and verified_token_cache is not None:
+                verified_token_cache.put(access_token, verification[1], verification[2], signing_key_ring)
+            result = get_verify_access_token_result(handshake_info, verification, revocation_cache)
+            if result is None:
+                needs_core.append(access_token)
+            else:
+                results[access_token] = result
+    return needs_core
+
+
+async def send_session_verify_requests(recipe_implementation: RecipeImplementation, handshake_info: HandshakeInfo,
+                                       access_tokens: List[str]) -> List[dict]:
+    # a large batch must not open a request to the core per token at once
+    semaphore = Semaphore(MAX_CONCURRENT_CORE_VERIFICATIONS)
+
+    async def send_session_verify_request(access_token: str) -> dict:
+        async with semaphore:
+            return await recipe_implementation.querier.send_post_request(
+                NormalisedURLPath('/recipe/session/verify'),
+                get_session_verify_request_data(handshake_info, access_token, None, False))
+
+    return await gather(*[send_session_verify_request(access_token) for access_token in access_tokens])
+
+
+async def verify_access_tokens(recipe_implementation: RecipeImplementation,
+                               access_tokens: List[str]) -> List[VerifyAccessTokenResult]:
+    handshake_info = await recipe_implementation.get_handshake_info()
+    signing_key_ring = handshake_info.signing_key_ring
+    verified_token_cache = recipe_implementation.verified_token_cache
+    revocation_cache = recipe_implementation.revocation_cache
+    results, groups = prepare_access_token_verification(handshake_info, access_tokens, verified_token_cache,
+                                                        revocation_cache)
+    if recipe_implementation.verification_executor is None:
+        group_verifications = [verify_access_tokens_with_signing_keys(signing_key_ring, group) for group in groups]
+    else:
+        group_verifications = await gather(*[
+            recipe_implementation.verification_executor.verify_many(signing_key_ring, group) for group in groups])
+    needs_core = process_access_token_verifications(handshake_info, signing_key_ring, verified_token_cache, groups,
+                                                    group_verifications, results, revocation_cache)
+
+    if len(needs_core) > 0:
+        ProcessState.get_instance().add_state(
+            AllowedProcessStates.CALLING_SERVICE_IN_VERIFY)
+        responses = await send_session_verify_requests(recipe_implementation, handshake_info, needs_core)
+        if any(session_verify_response_needs_handshake_refetch(response) for response in responses):
+            await recipe_implementation.get_handshake_info(True)
+        for access_token, response in zip(needs_core, responses):
+            results[access_token] = get_verify_access_token_result_from_core_response(recipe_implementation, response)
+    return [results[access_token] for access_token in access_tokens]
+
+
+def sync_verify_access_tokens(recipe_implementation: RecipeImplementation,
+                              access_tokens: List[str]) -> List[VerifyAccessTokenResult]:
+    handshake_info = recipe_implementation.sync_get_handshake_info()
+    signing_key_ring = handshake_info.signing_key_ring
+    verified_token_cache = recipe_implementation.verified_token_cache
+    revocation_cache = recipe_implementation.revocation_cache
+    results, groups = prepare_access_token_verification(handshake_info, access_tokens, verified_token_cache,
+                                                        revocation_cache)
+    group_verifications = [verify_access_tokens_with_signing_keys(signing_key_ring, group) for group in groups]
+    needs_core = process_access_token_verifications(handshake_info, signing_key_ring, verified_token_cache, groups,
+                                                    group_verifications, results, revocation_cache)
+
+    if len(needs_core) > 0:
+        ProcessState.get_instance().add_state(
+            AllowedProcessStates.CALLING_SERVICE_IN_VERIFY)
+        responses = [recipe_implementation.querier.sync_send_post_request(
+            NormalisedURLPath('/recipe/session/verify'),
+            get_session_verify_request_data(handshake_info, access_token, None, False)) for access_token in needs_core]
+        if any(session_verify_response_needs_handshake_refetch(response) for response in responses):
+            recipe_implementation.sync_get_handshake_info(True)
+        for access_token, response in zip(needs_core, responses):
+            results[access_token] = get_verify_access_token_result_from_core_response(recipe_implementation, response)
+    return [results[access_token] for access_token in access_tokens]
+
+
+def get_session_verify_request_data(handshake_info: HandshakeInfo, access_token: str,
+                                    anti_csrf_token: Union[str, None], do_anti_csrf_check: bool) -> dict:
     data = {
         'accessToken': access_token,
         'doAntiCsrfCheck': do_anti_csrf_check,
@@ -138,8 +441,16 @@ async def get_session(recipe_implementation: RecipeImplementation, access_token:
     }
     if anti_csrf_token is not None:
         data['antiCsrfToken'] = anti_csrf_token
+    return data
+
 
-    response = await recipe_implementation.querier.send_post_request(NormalisedURLPath('/recipe/session/verify'), data)
+def session_verify_response_needs_handshake_refetch(response: dict) -> bool:
+    return response['status'] != 'OK' and response['status'] != 'UNAUTHORISED' and \
+        response['jwtSigningPublicKeyList'] is None and response['jwtSigningPublicKey'] is None and \
+        response['jwtSigningPublicKeyExpiryTime'] is None
+
+
+def process_session_verify_response(recipe_implementation: RecipeImplementation, response: dict) -> dict:
     if response['status'] == 'OK':
         recipe_implementation.update_jwt_signing_public_key_info(response['jwtSigningPublicKeyList'], response['jwtSigningPublicKey'],
                                                                  response['jwtSigningPublicKeyExpiryTime'])
@@ -147,15 +458,15 @@ async def get_session(recipe_implementation: RecipeImplementation, access_token:
         response.pop('jwtSigningPublicKey', None)
         response.pop('jwtSigningPublicKeyExpiryTime', None)
         response.pop('jwtSigningPublicKeyList', None)
+        if recipe_implementation.revocation_cache is not None:
+            recipe_implementation.revocation_cache.on_session_verified(response['session']['handle'])
         return response
     elif response['status'] == 'UNAUTHORISED':
         raise_unauthorised_exception(response['message'])
     else:
 
-        if response['jwtSigningPublicKeyList'] is not None or response['jwtSigningPublicKey'] is not None or response['jwtSigningPublicKeyExpiryTime'] is not None:
+        if not session_verify_response_needs_handshake_refetch(response):
             recipe_implementation.update_jwt_signing_public_key_info(response['jwtSigningPublicKeyList'], response['jwtSigningPublicKey'], response['jwtSigningPublicKeyExpiryTime'])
-        else:
-            await recipe_implementation.get_handshake_info(True)
         raise_try_refresh_token_exception(response['message'])
 
 
@@ -177,6 +488,9 @@ async def refresh_session(recipe_implementation: RecipeImplementation, refresh_t
     response = await recipe_implementation.querier.send_post_request(NormalisedURLPath('/recipe/session/refresh'), data)
     if response['status'] == 'OK':
         response.pop('status', None)
+        recipe_implementation.querier.invalidate_cached_responses(NormalisedURLPath('/recipe/session'), {
+            'sessionHandle': response['session']['handle']
+        })
         return response
     elif response['status'] == 'UNAUTHORISED':
         raise_unauthorised_exception(response['message'])
@@ -191,6 +505,8 @@ async def revoke_all_sessions_for_user(recipe_implementation: RecipeImplementati
     response = await recipe_implementation.querier.send_post_request(NormalisedURLPath('/recipe/session/remove'), {
         'userId': user_id
     })
+    invalidate_cached_session_information(recipe_implementation, response['sessionHandlesRevoked'])
+    add_revoked_sessions_to_revocation_cache(recipe_implementation, response['sessionHandlesRevoked'])
     return response['sessionHandlesRevoked']
 
 
@@ -205,6 +521,8 @@ async def revoke_session(recipe_implementation: RecipeImplementation, session_ha
     response = await recipe_implementation.querier.send_post_request(NormalisedURLPath('/recipe/session/remove'), {
         'sessionHandles': [session_handle]
     })
+    invalidate_cached_session_information(recipe_implementation, [session_handle])
+    add_revoked_sessions_to_revocation_cache(recipe_implementation, [session_handle])
     return len(response['sessionHandlesRevoked']) == 1
 
 
@@ -213,6 +531,8 @@ async def revoke_multiple_sessions(recipe_implementation: RecipeImplementation,
     response = await recipe_implementation.querier.send_post_request(NormalisedURLPath('/recipe/session/remove'), {
         'sessionHandles': session_handles
     })
+    invalidate_cached_session_information(recipe_implementation, session_handles)
+    add_revoked_sessions_to_revocation_cache(recipe_implementation, response['sessionHandlesRevoked'])
     return response['sessionHandlesRevoked']
 
 
@@ -221,6 +541,7 @@ async def update_session_data(recipe_implementation: RecipeImplementation, sessi
         'sessionHandle': session_handle,
         'userDataInDatabase': new_session_data
     })
+    invalidate_cached_session_information(recipe_implementation, [session_handle])
     if response['status'] == 'UNAUTHORISED':
         raise_unauthorised_exception(response['message'])
 
@@ -230,10 +551,23 @@ async def update_access_token_payload(recipe_implementation: RecipeImplementatio
         'sessionHandle': session_handle,
         'userDataInJWT': new_access_token_payload
     })
+    invalidate_cached_session_information(recipe_implementation, [session_handle])
     if response['status'] == 'UNAUTHORISED':
         raise_unauthorised_exception(response['message'])
 
 
+def invalidate_cached_session_information(recipe_implementation: RecipeImplementation, session_handles: List[str]):
+    for session_handle in session_handles:
+        recipe_implementation.querier.invalidate_cached_responses(NormalisedURLPath('/recipe/session'), {
+            'sessionHandle': session_handle
+        })
+
+
+def add_revoked_sessions_to_revocation_cache(recipe_implementation: RecipeImplementation, session_handles: List[str]):
+    if recipe_implementation.revocation_cache is not None:
+        recipe_implementation.revocation_cache.add_revoked_sessions(session_handles)
+
+
 async def get_session_information(recipe_implementation: RecipeImplementation, session_handle: str) -> dict:
     response = await recipe_implementation.querier.send_get_request(NormalisedURLPath('/recipe/session'), {
         'sessionHandle': session_handle
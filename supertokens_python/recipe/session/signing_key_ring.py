@@ -0,0 +1,111 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Dict, List, Union
+
+from supertokens_python.utils import get_timestamp_ms
+from .jwt import JWTVerifier, create_verifier
+
+
+class SigningKey:
+    def __init__(self, key: dict, verifier: Union[JWTVerifier, None] = None):
+        self.raw = key
+        self.public_key: str = key['publicKey']
+        self.expiry_time: int = key['expiryTime']
+        self.created_at: int = key['createdAt']
+        if verifier is None:
+            try:
+                verifier = create_verifier(self.public_key)
+            except Exception:
+                # verifying with the raw key raises the usual error later on
+                verifier = None
+        self.verifier = verifier
+
+    def get_verifier(self) -> Union[JWTVerifier, str]:
+        if self.verifier is None:
+            return self.public_key
+        return self.verifier
+
+
+class _KeyValidity:
+    def __init__(self, next_expiry_time: Union[int, float], valid_keys: List[SigningKey]):
+        # the valid keys do not change until next_expiry_time
+        self.next_expiry_time = next_expiry_time
+        self.valid_keys = valid_keys
+        self.valid_key_list = [key.raw for key in valid_keys]
+        self.keys_by_likely_key: Dict[int, List[SigningKey]] = {}
+
+
+class SigningKeyRing:
+    """
+    The JWT signing keys of the core, each parsed once into a ready to use
+    verifier and ordered from the newest to the oldest key.
+
+    The valid keys are only recomputed once the first of them expires. The
+    lists returned by this class are shared and must not be modified.
+    """
+
+    def __init__(self, key_list: List[dict], previous_ring: Union[SigningKeyRing, None] = None):
+        previous_verifiers = {}
+        if previous_ring is not None:
+            previous_verifiers = {key.public_key: key.verifier for key in previous_ring.keys}
+        keys = [SigningKey(key, previous_verifiers.get(key['publicKey'])) for key in key_list]
+        self.key_list = key_list
+        self.keys: List[SigningKey] = sorted(keys, key=lambda k: k.created_at, reverse=True)
+        self.__expiry_times = sorted(key.expiry_time for key in keys)
+        self.__validity = _KeyValidity(float('-inf'), [])
+
+    def __get_validity(self) -> _KeyValidity:
+        validity = self.__validity
+        time_now = get_timestamp_ms()
+        if time_now < validity.next_expiry_time:
+            return validity
+        next_expiry_index = bisect_right(self.__expiry_times, time_now)
+        if next_expiry_index < len(self.__expiry_times):
+            next_expiry_time = self.__expiry_times[next_expiry_index]
+        else:
+            next_expiry_time = float('inf')
+        validity = _KeyValidity(next_expiry_time, [key for key in self.keys if key.expiry_time > time_now])
+        # replaced as a whole, so that concurrent readers never see a partial update
+        self.__validity = validity
+        return validity
+
+    def get_valid_keys(self) -> List[SigningKey]:
+        return self.__get_validity().valid_keys
+
+    def get_valid_key_list(self) -> List[dict]:
+        return self.__get_validity().valid_key_list
+
+    def get_keys_for_token(self, time_created: Union[int, None]) -> List[SigningKey]:
+        """
+        Returns the keys to verify a token created at `time_created` with.
+        The newest key that is older than the token is the one that signed
+        it, so it is returned first.
+        """
+        validity = self.__get_validity()
+        keys = validity.valid_keys
+        if time_created is None:
+            return keys
+        for i in range(len(keys)):
+            if keys[i].created_at <= time_created:
+                if i == 0:
+                    return keys
+                keys_for_token = validity.keys_by_likely_key.get(i)
+                if keys_for_token is None:
+                    keys_for_token = [keys[i]] + keys[:i] + keys[i + 1:]
+                    validity.keys_by_likely_key[i] = keys_for_token
+                return keys_for_token
+        return keys
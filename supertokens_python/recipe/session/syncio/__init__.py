@@ -18,6 +18,7 @@ from supertokens_python.async_to_sync_wrapper import sync
 from supertokens_python.recipe.openid.interfaces import CreateJwtResult, GetOpenIdDiscoveryConfigurationResult, \
     GetJWKSResult
 from supertokens_python.recipe.session.asyncio import Session
+from supertokens_python.recipe.session.interfaces import VerifyAccessTokenResult
 
 
 def create_new_session(request, user_id: str, access_token_payload: Union[dict, None] = None,
@@ -29,6 +30,10 @@ def create_new_session(request, user_id: str, access_token_payload: Union[dict,
 
 def get_session(request, anti_csrf_check: Union[bool, None] = None, session_required: bool = True) -> Union[Session,
                                                                                                             None]:
+    from supertokens_python.recipe.session.recipe import SessionRecipe
+    recipe = SessionRecipe.get_instance()
+    if recipe.can_get_session_without_event_loop():
+        return recipe.recipe_implementation.sync_get_session(request, anti_csrf_check, session_required)
     from supertokens_python.recipe.session.asyncio import get_session as async_get_session
     return sync(async_get_session(request, anti_csrf_check, session_required))
 
@@ -38,6 +43,16 @@ def refresh_session(request) -> Session:
     return sync(async_refresh_session(request))
 
 
+def verify_access_tokens(access_tokens: List[str]) -> List[VerifyAccessTokenResult]:
+    from supertokens_python.recipe.session.recipe import SessionRecipe
+    recipe_implementation = SessionRecipe.get_instance().recipe_implementation
+    if 'verify_access_tokens' not in vars(recipe_implementation):
+        return recipe_implementation.sync_verify_access_tokens(access_tokens)
+    # overridden functions can only be called asynchronously
+    from supertokens_python.recipe.session.asyncio import verify_access_tokens as async_verify_access_tokens
+    return sync(async_verify_access_tokens(access_tokens))
+
+
 def revoke_session(session_handle: str) -> bool:
     from supertokens_python.recipe.session.asyncio import revoke_session as async_revoke_session
     return sync(async_revoke_session(session_handle))
@@ -20,7 +20,6 @@ except ImportError:
     from typing_extensions import Literal
 from urllib.parse import urlparse
 
-from tldextract import extract
 
 from supertokens_python.exceptions import raise_general_exception
 from supertokens_python.framework import BaseResponse
@@ -35,6 +34,7 @@ if TYPE_CHECKING:
     from .interfaces import RecipeInterface, APIInterface
     from supertokens_python.framework import BaseRequest
     from .recipe import SessionRecipe
+    from .jwt import JWTVerifierBackend
     from supertokens_python.supertokens import AppInfo
 
 
@@ -91,6 +91,7 @@ def get_top_level_domain_for_same_site_resolution(url: str) -> str:
 
     if hostname.startswith('localhost') or is_an_ip_address(hostname):
         return 'localhost'
+    from tldextract import extract
     parsed_url = extract(hostname)
     if parsed_url == '':
         raise Exception(
@@ -190,6 +191,41 @@ class JWTConfig:
         self.issuer = issuer
 
 
+class RevocationCacheConfig:
+    def __init__(self, staleness_seconds: float = 5.0,
+                 max_revoked_sessions: int = 100000,
+                 max_confirmed_sessions: int = 100000,
+                 bloom_filter_size_bits: int = 2 ** 20,
+                 bloom_filter_hash_count: int = 4,
+                 revoked_session_ttl_seconds: Union[float, None] = None):
+        self.staleness_seconds = staleness_seconds
+        self.max_revoked_sessions = max_revoked_sessions
+        self.max_confirmed_sessions = max_confirmed_sessions
+        self.bloom_filter_size_bits = bloom_filter_size_bits
+        self.bloom_filter_hash_count = bloom_filter_hash_count
+        self.revoked_session_ttl_seconds = revoked_session_ttl_seconds
+
+
+class AccessTokenVerificationConfig:
+    def __init__(self, cache_verified_tokens: bool = False, cache_max_size: int = 10000,
+                 verifier_backend: Union[JWTVerifierBackend, Literal['pycryptodome', 'cryptography', 'auto']] = 'auto',
+                 executor: Union[Literal['thread', 'process'], None] = None,
+                 executor_max_workers: Union[int, None] = None,
+                 offload_threshold_us: float = 100.0,
+                 max_pending_verifications: int = 1000,
+                 refresh_signing_keys_ahead_seconds: Union[float, None] = None,
+                 revocation_cache: Union[RevocationCacheConfig, None] = None):
+        self.cache_verified_tokens = cache_verified_tokens
+        self.cache_max_size = cache_max_size
+        self.verifier_backend = verifier_backend
+        self.executor = executor
+        self.executor_max_workers = executor_max_workers
+        self.offload_threshold_us = offload_threshold_us
+        self.max_pending_verifications = max_pending_verifications
+        self.refresh_signing_keys_ahead_seconds = refresh_signing_keys_ahead_seconds
+        self.revocation_cache = revocation_cache
+
+
 class SessionConfig:
     def __init__(self,
                  refresh_token_path: NormalisedURLPath,
@@ -202,7 +238,8 @@ class SessionConfig:
                  override: OverrideConfig,
                  framework: str,
                  mode: str,
-                 jwt: JWTConfig
+                 jwt: JWTConfig,
+                 access_token_verification: AccessTokenVerificationConfig
                  ):
         self.refresh_token_path = refresh_token_path
         self.cookie_domain = cookie_domain
@@ -215,6 +252,7 @@ class SessionConfig:
         self.framework = framework
         self.mode = mode
         self.jwt = jwt
+        self.access_token_verification = access_token_verification
 
 
 def validate_and_normalise_user_input(
@@ -226,7 +264,8 @@ def validate_and_normalise_user_input(
     anti_csrf: Union[Literal["VIA_TOKEN", "VIA_CUSTOM_HEADER", "NONE"], None] = None,
     error_handlers: Union[InputErrorHandlers, None] = None,
     override: Union[InputOverrideConfig, None] = None,
-    jwt: Union[JWTConfig, None] = None
+    jwt: Union[JWTConfig, None] = None,
+    access_token_verification: Union[AccessTokenVerificationConfig, None] = None
 ):
     cookie_domain = normalise_session_scope(recipe, cookie_domain) if cookie_domain is not None else None
     top_level_api_domain = get_top_level_domain_for_same_site_resolution(
@@ -279,6 +318,15 @@ def validate_and_normalise_user_input(
     if jwt is None:
         jwt = JWTConfig(False)
 
+    if access_token_verification is None:
+        access_token_verification = AccessTokenVerificationConfig()
+    if access_token_verification.executor not in (None, 'thread', 'process'):
+        raise_general_exception('access_token_verification executor must be one of None, "thread" or "process"')
+    revocation_cache = access_token_verification.revocation_cache
+    if revocation_cache is not None and (revocation_cache.bloom_filter_size_bits <= 0 or
+                                         revocation_cache.bloom_filter_hash_count <= 0):
+        raise_general_exception('revocation_cache bloom_filter_size_bits and bloom_filter_hash_count must be positive')
+
     return SessionConfig(
         app_info.api_base_path.append(NormalisedURLPath(SESSION_REFRESH)),
         cookie_domain,
@@ -290,5 +338,6 @@ def validate_and_normalise_user_input(
         OverrideConfig(override.functions, override.apis),
         app_info.framework,
         app_info.mode,
-        jwt
+        jwt,
+        access_token_verification
     )
@@ -0,0 +1,229 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from threading import Lock
+from time import perf_counter
+from typing import TYPE_CHECKING, List, Tuple, Union
+
+from .jwt import set_verifier_backend
+from .session_functions import verify_access_token_with_signing_keys, verify_access_tokens_with_signing_keys
+from .signing_key_ring import SigningKey, SigningKeyRing
+
+if TYPE_CHECKING:
+    from .utils import AccessTokenVerificationConfig
+
+# the key ring of a worker process, rebuilt when the signing keys change
+_process_key_list: Union[List[dict], None] = None
+_process_key_ring: Union[SigningKeyRing, None] = None
+
+
+def _get_process_key_ring(key_list: List[dict]) -> SigningKeyRing:
+    global _process_key_list, _process_key_ring
+    if _process_key_ring is None or key_list != _process_key_list:
+        _process_key_ring = SigningKeyRing(key_list, _process_key_ring)
+        _process_key_list = key_list
+    return _process_key_ring
+
+
+def _verify_in_process(key_list: List[dict], access_token: str,
+                       do_anti_csrf_check_via_token: bool) -> Tuple[bool, Union[dict, None], Union[str, None], float]:
+    start = perf_counter()
+    found, access_token_info, key = verify_access_token_with_signing_keys(_get_process_key_ring(key_list), access_token,
+                                                                          do_anti_csrf_check_via_token)
+    # verifiers can not be sent across processes, so the key is identified by its public key
+    return found, access_token_info, None if key is None else key.public_key, perf_counter() - start
+
+
+def _verify_in_thread(signing_key_ring: SigningKeyRing, access_token: str,
+                      do_anti_csrf_check_via_token: bool) -> Tuple[bool, Union[dict, None], Union[SigningKey, None], float]:
+    start = perf_counter()
+    found, access_token_info, key = verify_access_token_with_signing_keys(signing_key_ring, access_token,
+                                                                          do_anti_csrf_check_via_token)
+    return found, access_token_info, key, perf_counter() - start
+
+
+def _verify_many_in_process(key_list: List[dict], access_tokens: List[str]) -> Tuple[List, float]:
+    start = perf_counter()
+    verifications = verify_access_tokens_with_signing_keys(_get_process_key_ring(key_list), access_tokens)
+    verifications = [v if isinstance(v, Exception) else (v[0], v[1], None if v[2] is None else v[2].public_key)
+                     for v in verifications]
+    return verifications, perf_counter() - start
+
+
+def _verify_many_in_thread(signing_key_ring: SigningKeyRing, access_tokens: List[str]) -> Tuple[List, float]:
+    start = perf_counter()
+    verifications = verify_access_tokens_with_signing_keys(signing_key_ring, access_tokens)
+    return verifications, perf_counter() - start
+
+
+def _wake_up(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class VerificationExecutor:
+    """
+    Verifies access token signatures in a thread or process pool, so that the
+    event loop keeps serving I/O while many tokens are verified.
+
+    Handing a token over to the pool has a cost of its own, so signatures are
+    only verified in the pool while a verification takes at least
+    `offload_threshold_us` on average. Once `max_pending_verifications` are
+    waiting for the pool, further tokens wait until the pool catches up
+    instead of being verified on the event loop.
+    """
+    # weight of the latest verification time in the average
+    __EWMA_ALPHA = 0.1
+
+    def __init__(self, config: AccessTokenVerificationConfig):
+        self.config = config
+        self.__executor: Union[Executor, None] = None
+        self.__lock = Lock()
+        self.__avg_verification_seconds: Union[float, None] = None
+        self.pending = 0
+        self.__waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self.inline_verifications = 0
+        self.offloaded_verifications = 0
+        self.queue_full_verifications = 0
+
+    def __get_executor(self) -> Executor:
+        with self.__lock:
+            if self.__executor is None:
+                if self.config.executor == 'process':
+                    # imports multiprocessing, which most apps never need
+                    from concurrent.futures import ProcessPoolExecutor
+                    backend = self.config.verifier_backend
+                    self.__executor = ProcessPoolExecutor(self.config.executor_max_workers,
+                                                          initializer=set_verifier_backend, initargs=(backend,))
+                else:
+                    self.__executor = ThreadPoolExecutor(self.config.executor_max_workers,
+                                                         thread_name_prefix='supertokens-verify')
+            return self.__executor
+
+    def __record_verification_time(self, seconds: float):
+        if self.__avg_verification_seconds is None:
+            self.__avg_verification_seconds = seconds
+        else:
+            self.__avg_verification_seconds += VerificationExecutor.__EWMA_ALPHA * (
+                seconds - self.__avg_verification_seconds)
+
+    def __should_offload(self, count: int = 1) -> bool:
+        if self.__avg_verification_seconds is None:
+            # the first token is verified inline to measure how long it takes
+            return False
+        return self.__avg_verification_seconds * count * 1000000 >= self.config.offload_threshold_us
+
+    async def __acquire(self, count: int):
+        # the executor is shared by the event loops of all threads, so the
+        # waiters are woken up on their own loop
+        waited = False
+        while True:
+            with self.__lock:
+                # a batch that is larger than the queue runs once it is empty
+                if self.pending == 0 or self.pending + count <= self.config.max_pending_verifications:
+                    self.pending += count
+                    return
+                if not waited:
+                    self.queue_full_verifications += count
+                    waited = True
+                loop = asyncio.get_event_loop()
+                future = loop.create_future()
+                self.__waiters.append((loop, future))
+            await future
+
+    def __release(self, count: int):
+        with self.__lock:
+            self.pending -= count
+            waiters = self.__waiters
+            self.__waiters = []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake_up, future)
+            except RuntimeError:
+                # the loop of the waiter was closed
+                pass
+
+    async def verify(self, signing_key_ring: SigningKeyRing, access_token: str,
+                     do_anti_csrf_check_via_token: bool) -> Tuple[bool, Union[dict, None], Union[SigningKey, None]]:
+        if not self.__should_offload():
+            self.inline_verifications += 1
+            found, access_token_info, key, seconds = _verify_in_thread(signing_key_ring, access_token,
+                                                                       do_anti_csrf_check_via_token)
+            self.__record_verification_time(seconds)
+            return found, access_token_info, key
+
+        await self.__acquire(1)
+        self.offloaded_verifications += 1
+        loop = asyncio.get_event_loop()
+        try:
+            if self.config.executor == 'process':
+                found, access_token_info, public_key, seconds = await loop.run_in_executor(
+                    self.__get_executor(), _verify_in_process, signing_key_ring.key_list, access_token,
+                    do_anti_csrf_check_via_token)
+                key = None
+                if public_key is not None:
+                    key = next((k for k in signing_key_ring.keys if k.public_key == public_key), None)
+            else:
+                found, access_token_info, key, seconds = await loop.run_in_executor(
+                    self.__get_executor(), _verify_in_thread, signing_key_ring, access_token,
+                    do_anti_csrf_check_via_token)
+        finally:
+            self.__release(1)
+        self.__record_verification_time(seconds)
+        return found, access_token_info, key
+
+    async def verify_many(self, signing_key_ring: SigningKeyRing, access_tokens: List[str]) -> List:
+        # verifies the tokens in one executor task, see verify_access_tokens_with_signing_keys
+        if not self.__should_offload(len(access_tokens)):
+            self.inline_verifications += len(access_tokens)
+            verifications, seconds = _verify_many_in_thread(signing_key_ring, access_tokens)
+            self.__record_verification_time(seconds / max(1, len(access_tokens)))
+            return verifications
+
+        await self.__acquire(len(access_tokens))
+        self.offloaded_verifications += len(access_tokens)
+        loop = asyncio.get_event_loop()
+        try:
+            if self.config.executor == 'process':
+                verifications, seconds = await loop.run_in_executor(
+                    self.__get_executor(), _verify_many_in_process, signing_key_ring.key_list, access_tokens)
+                keys = {key.public_key: key for key in signing_key_ring.keys}
+                verifications = [v if isinstance(v, Exception) else (v[0], v[1], keys.get(v[2]))
+                                 for v in verifications]
+            else:
+                verifications, seconds = await loop.run_in_executor(
+                    self.__get_executor(), _verify_many_in_thread, signing_key_ring, access_tokens)
+        finally:
+            self.__release(len(access_tokens))
+        self.__record_verification_time(seconds / max(1, len(access_tokens)))
+        return verifications
+
+    def shutdown(self):
+        with self.__lock:
+            if self.__executor is not None:
+                self.__executor.shutdown(wait=False)
+                self.__executor = None
+
+    def get_stats(self) -> dict:
+        return {
+            'executor': self.config.executor,
+            'pending': self.pending,
+            'inlineVerifications': self.inline_verifications,
+            'offloadedVerifications': self.offloaded_verifications,
+            'queueFullVerifications': self.queue_full_verifications,
+            'avgVerificationUs': None if self.__avg_verification_seconds is None else self.__avg_verification_seconds * 1000000
+        }
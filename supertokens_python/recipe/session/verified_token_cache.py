@@ -0,0 +1,107 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from collections import OrderedDict
+from hashlib import sha256
+from threading import Lock
+from typing import TYPE_CHECKING, Union
+
+from supertokens_python.utils import get_timestamp_ms
+
+if TYPE_CHECKING:
+    from .signing_key_ring import SigningKey, SigningKeyRing
+
+
+class _CacheEntry:
+    def __init__(self, access_token_info: dict, key: SigningKey):
+        self.access_token_info = access_token_info
+        self.key = key
+
+
+class VerifiedAccessTokenCache:
+    """
+    Bounded LRU cache of access tokens whose signature has already been
+    verified, so that a token that is sent with every request is only
+    verified once. Tokens are stored by their SHA-256 hash.
+
+    Entries are evicted when the token or the key that signed it expires and
+    all entries are dropped when a signing key is removed from the ring.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self.__entries: OrderedDict[bytes, _CacheEntry] = OrderedDict()
+        self.__public_keys = None
+        self.__ring = None
+        self.__lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __check_ring(self, ring: SigningKeyRing):
+        if ring is self.__ring:
+            return
+        public_keys = {key.public_key for key in ring.keys}
+        if self.__public_keys is not None and not self.__public_keys.issubset(public_keys):
+            # a signing key was rotated out, so its tokens must be verified again
+            self.__entries.clear()
+        self.__ring = ring
+        self.__public_keys = public_keys
+
+    def get(self, access_token: str, ring: SigningKeyRing) -> Union[dict, None]:
+        token_hash = sha256(access_token.encode('utf-8')).digest()
+        with self.__lock:
+            self.__check_ring(ring)
+            entry = self.__entries.get(token_hash)
+            if entry is None:
+                self.misses += 1
+                return None
+            time_now = get_timestamp_ms()
+            if entry.access_token_info['expiryTime'] < time_now or entry.key.expiry_time <= time_now:
+                del self.__entries[token_hash]
+                self.misses += 1
+                return None
+            self.__entries.move_to_end(token_hash)
+            self.hits += 1
+            # the info and its AccessTokenPayloadView are immutable, so they
+            # are shared by all requests that send this token
+            return entry.access_token_info
+
+    def put(self, access_token: str, access_token_info: dict, key: SigningKey, ring: SigningKeyRing):
+        if self.max_size <= 0:
+            return
+        token_hash = sha256(access_token.encode('utf-8')).digest()
+        with self.__lock:
+            self.__check_ring(ring)
+            self.__entries[token_hash] = _CacheEntry(access_token_info, key)
+            self.__entries.move_to_end(token_hash)
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    def get_stats(self) -> dict:
+        with self.__lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self.__entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRate': self.hits / total if total > 0 else 0.0,
+                'evictions': self.evictions
+            }
@@ -15,7 +15,6 @@ from __future__ import annotations
 
 from typing import Union, TYPE_CHECKING
 
-from jwt import decode
 
 from supertokens_python.querier import Querier
 from supertokens_python.utils import get_timestamp_ms
@@ -95,6 +94,7 @@ class RecipeImplementationWithJWT(RecipeImplementation):
         assert existing_jwt_property_name in access_token_payload
         existing_jwt = access_token_payload[existing_jwt_property_name]
 
+        from jwt import decode
         current_time_in_seconds = ceil(get_timestamp_ms() / 1000)
         decoded_payload = decode(jwt=existing_jwt, options={'verify_signature': False, 'verify_exp': False})
 
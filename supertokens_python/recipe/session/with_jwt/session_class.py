@@ -17,7 +17,6 @@ from __future__ import annotations
 from math import ceil
 from typing import TYPE_CHECKING
 
-from jwt import decode
 
 from supertokens_python.recipe.session.with_jwt.constants import ACCESS_TOKEN_PAYLOAD_JWT_PROPERTY_NAME_KEY
 from supertokens_python.recipe.session.with_jwt.utills import add_jwt_to_access_token_payload
@@ -45,6 +44,7 @@ def get_session_with_jwt(original_session: Session, openid_recipe_implementation
         assert jwt_property_name in access_token_payload
         existing_jwt = access_token_payload[jwt_property_name]
 
+        from jwt import decode
         current_time_in_seconds = ceil(get_timestamp_ms() / 1000)
         decoded_payload = decode(jwt=existing_jwt, options={'verify_signature': False, 'verify_exp': False})
 
@@ -11,22 +11,35 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
-from typing import Union
+from typing import Union, TYPE_CHECKING
 
 from .utils import SignInAndUpFeature, InputOverrideConfig
 
 from .recipe import ThirdPartyRecipe
 from . import exceptions
-from .providers import (
-    Google,
-    Github,
-    Apple,
-    Facebook,
-    Discord,
-    GoogleWorkspaces
-)
+from . import providers
 from ..emailverification.utils import InputEmailVerificationConfig
 
+if TYPE_CHECKING:
+    from .providers import (
+        Google,
+        Github,
+        Apple,
+        Facebook,
+        Discord,
+        GoogleWorkspaces
+    )
+
+__all__ = ['init', 'exceptions', 'providers', 'SignInAndUpFeature', 'InputOverrideConfig', 'ThirdPartyRecipe',
+           'InputEmailVerificationConfig'] + providers.__all__
+
+
+def __getattr__(name: str):
+    # only the providers are imported on first use
+    if name not in providers.__all__:
+        raise AttributeError('module ' + __name__ + ' has no attribute ' + name)
+    return getattr(providers, name)
+
 
 def init(sign_in_and_up_feature: SignInAndUpFeature,
          email_verification_feature: Union[InputEmailVerificationConfig, None] = None,
@@ -16,7 +16,6 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Union
 from urllib.parse import urlencode
 
-from httpx import AsyncClient
 from supertokens_python.exceptions import raise_general_exception
 from supertokens_python.recipe.session.asyncio import create_new_session
 from supertokens_python.recipe.thirdparty.interfaces import APIInterface, SignInUpPostOkResponse, \
@@ -102,6 +101,7 @@ class APIImplementation(APIInterface):
                     'Accept': 'application/json',
                     'Content-Type': 'application/x-www-form-urlencoded'
                 }
+                from httpx import AsyncClient
                 async with AsyncClient() as client:
                     access_token_response = await client.post(access_token_api_info.url,
                                                               data=access_token_api_info.params,
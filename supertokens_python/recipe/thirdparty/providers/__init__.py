@@ -11,9 +11,33 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
-from .facebook import Facebook
-from .github import Github
-from .apple import Apple
-from .google import Google
-from .google_workspaces import GoogleWorkspaces
-from .discord import Discord
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .facebook import Facebook
+    from .github import Github
+    from .apple import Apple
+    from .google import Google
+    from .google_workspaces import GoogleWorkspaces
+    from .discord import Discord
+
+# providers (and the HTTP / JWT libraries they use) are imported on first use
+_PROVIDER_MODULES = {
+    'Facebook': '.facebook',
+    'Github': '.github',
+    'Apple': '.apple',
+    'Google': '.google',
+    'GoogleWorkspaces': '.google_workspaces',
+    'Discord': '.discord'
+}
+
+__all__ = list(_PROVIDER_MODULES.keys())
+
+
+def __getattr__(name: str):
+    if name not in _PROVIDER_MODULES:
+        raise AttributeError('module ' + __name__ + ' has no attribute ' + name)
+    provider = getattr(import_module(_PROVIDER_MODULES[name], __name__), name)
+    globals()[name] = provider
+    return provider
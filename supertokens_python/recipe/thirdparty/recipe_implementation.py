@@ -101,6 +101,17 @@ class RecipeImplementation(RecipeInterface):
             }
         }
         response = await self.querier.send_post_request(NormalisedURLPath('/recipe/signinup'), data)
+        if response['createdNewUser']:
+            self.querier.invalidate_cached_user_counts()
+        else:
+            # signing in can update the email of an existing user
+            self.querier.invalidate_cached_responses(NormalisedURLPath('/recipe/user'), {
+                'userId': response['user']['id']
+            })
+            self.querier.invalidate_cached_responses(NormalisedURLPath('/recipe/user'), {
+                'thirdPartyId': third_party_id,
+                'thirdPartyUserId': third_party_user_id
+            })
         return SignInUpOkResult(
             User(
                 response['user']['id'],
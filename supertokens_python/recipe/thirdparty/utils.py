@@ -25,7 +25,6 @@ from supertokens_python.recipe.emailverification.utils import (
     InputEmailVerificationConfig, ParentRecipeEmailVerificationConfig,
     OverrideConfig as EmailVerificationOverrideConfig
 )
-from jwt import PyJWKClient, decode
 
 
 class SignInAndUpFeature:
@@ -176,6 +175,7 @@ def find_right_provider(
 
 
 def verify_id_token_from_jwks_endpoint(id_token: str, jwks_uri: str, audience: str, issuers: List[str]):
+    from jwt import PyJWKClient, decode
     jwks_client = PyJWKClient(jwks_uri)
     signing_key = jwks_client.get_signing_key_from_jwt(id_token)
 
@@ -11,7 +11,7 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
-from typing import Union, List
+from typing import Union, List, TYPE_CHECKING
 
 from .utils import InputOverrideConfig
 
@@ -19,23 +19,30 @@ from supertokens_python.recipe.thirdparty.provider import Provider
 
 from .recipe import ThirdPartyEmailPasswordRecipe
 from . import exceptions
-from supertokens_python.recipe.thirdparty import (
-    Google,
-    Github,
-    Apple,
-    Facebook,
-    Discord,
-    GoogleWorkspaces
-)
+from supertokens_python.recipe.thirdparty import providers as thirdparty_providers
 from ..emailpassword import InputResetPasswordUsingTokenFeature, InputSignUpFeature
 from ..emailverification.utils import InputEmailVerificationConfig
 
-Google = Google
-Github = Github
-Apple = Apple
-Facebook = Facebook
-Discord = Discord
-GoogleWorkspaces = GoogleWorkspaces
+if TYPE_CHECKING:
+    from supertokens_python.recipe.thirdparty import (
+        Google,
+        Github,
+        Apple,
+        Facebook,
+        Discord,
+        GoogleWorkspaces
+    )
+
+__all__ = ['init', 'exceptions', 'Provider', 'InputOverrideConfig', 'ThirdPartyEmailPasswordRecipe',
+           'InputResetPasswordUsingTokenFeature', 'InputSignUpFeature',
+           'InputEmailVerificationConfig'] + thirdparty_providers.__all__
+
+
+def __getattr__(name: str):
+    # only the providers are imported on first use
+    if name not in thirdparty_providers.__all__:
+        raise AttributeError('module ' + __name__ + ' has no attribute ' + name)
+    return getattr(thirdparty_providers, name)
 
 
 def init(sign_up_feature: Union[InputSignUpFeature, None] = None,
@@ -0,0 +1,87 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import asyncio
+from copy import deepcopy
+from typing import Any, Awaitable, Callable, Dict, Hashable
+from weakref import WeakKeyDictionary
+
+
+class RequestCoalescer:
+    """
+    Lets concurrent callers asking for the same key share a single in-flight
+    call. The first caller (the leader) runs the call, everyone else that
+    arrives before it finishes waits for its result. Callers always get their
+    own copy of the result, so mutating it is safe.
+    """
+
+    def __init__(self):
+        self.__in_flight: WeakKeyDictionary = WeakKeyDictionary()
+        self.total_requests = 0
+        self.coalesced_requests = 0
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_event_loop()
+        in_flight: Dict[Hashable, list] = self.__in_flight.get(loop)
+        if in_flight is None:
+            in_flight = {}
+            self.__in_flight[loop] = in_flight
+        self.total_requests += 1
+
+        entry = in_flight.get(key)
+        if entry is not None:
+            future, followers = entry
+            entry[1] = followers + 1
+            self.coalesced_requests += 1
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # the leader got cancelled, so this caller has to do the work itself
+                return await func()
+            return deepcopy(result)
+
+        future = loop.create_future()
+        entry = [future, 0]
+        in_flight[key] = entry
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # marks the exception as retrieved in case nobody was waiting for it
+            future.exception()
+            raise
+        finally:
+            if in_flight.get(key) is entry:
+                del in_flight[key]
+
+        future.set_result(result)
+        if entry[1] > 0:
+            return deepcopy(result)
+        return result
+
+    def get_stats(self) -> dict:
+        dedupe_ratio = 0.0
+        if self.total_requests > 0:
+            dedupe_ratio = self.coalesced_requests / self.total_requests
+        return {
+            'totalRequests': self.total_requests,
+            'coalescedRequests': self.coalesced_requests,
+            'dedupeRatio': dedupe_ratio
+        }
@@ -0,0 +1,166 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from collections import OrderedDict
+from copy import deepcopy
+from threading import Lock
+from time import monotonic
+from typing import Any, Dict, Hashable, Set, Tuple, Union
+
+DEFAULT_TTL_SECONDS = {
+    '/recipe/user': 30.0,
+    '/recipe/user/email/verify': 30.0,
+    '/recipe/session': 5.0,
+    '/users/count': 60.0,
+    '/recipe/users/count': 60.0
+}
+
+
+class ResponseCacheConfig:
+    def __init__(self,
+                 ttl_seconds: Union[Dict[str, float], None] = None,
+                 max_entries: int = 10000,
+                 max_size_bytes: Union[int, None] = 10 * 1024 * 1024):
+        if ttl_seconds is None:
+            ttl_seconds = DEFAULT_TTL_SECONDS
+        # a copy, so that changing one config does not change the defaults
+        self.ttl_seconds = dict(ttl_seconds)
+        self.max_entries = max_entries
+        self.max_size_bytes = max_size_bytes
+
+
+class _CacheEntry:
+    def __init__(self, path: str, params: Tuple, value: Any, size: int, expires_at: float):
+        self.path = path
+        self.params = params
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache for responses to idempotent core reads.
+
+    Only paths that have a TTL in the config are cached. Entries are evicted
+    once they expire, when the cache goes over `max_entries` or
+    `max_size_bytes`, or when a write path invalidates them.
+    """
+
+    def __init__(self, config: Union[ResponseCacheConfig, None] = None):
+        if config is None:
+            config = ResponseCacheConfig()
+        self.config = config
+        self.__entries: OrderedDict[Hashable, _CacheEntry] = OrderedDict()
+        self.__keys_by_path: Dict[str, Set[Hashable]] = {}
+        self.__generations: Dict[str, int] = {}
+        self.__lock = Lock()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def is_cacheable(self, path: str) -> bool:
+        return path in self.config.ttl_seconds
+
+    def get(self, key: Hashable) -> Union[Any, None]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= monotonic():
+                self.__remove(key)
+                self.misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            value = entry.value
+        return deepcopy(value)
+
+    def get_generation(self, path: str) -> int:
+        return self.__generations.get(path, 0)
+
+    def put(self, key: Hashable, path: str, params: Tuple, value: Any, size: int, generation: int):
+        ttl = self.config.ttl_seconds.get(path)
+        if ttl is None or ttl <= 0:
+            return
+        if self.config.max_size_bytes is not None and size > self.config.max_size_bytes:
+            return
+        with self.__lock:
+            if self.__generations.get(path, 0) != generation:
+                # the path was invalidated while this response was being
+                # fetched, so it may already be stale
+                return
+            if key in self.__entries:
+                self.__remove(key)
+            self.__entries[key] = _CacheEntry(path, params, deepcopy(value), size, monotonic() + ttl)
+            self.__keys_by_path.setdefault(path, set()).add(key)
+            self.size_bytes += size
+            while len(self.__entries) > self.config.max_entries or (
+                    self.config.max_size_bytes is not None and self.size_bytes > self.config.max_size_bytes):
+                oldest_key = next(iter(self.__entries))
+                self.__remove(oldest_key)
+                self.evictions += 1
+
+    def invalidate(self, path: str, params: Union[Dict[str, Any], None] = None):
+        """
+        Removes the cached responses for `path`. If `params` is given, only
+        entries whose query params contain all of them are removed.
+        """
+        with self.__lock:
+            self.__generations[path] = self.__generations.get(path, 0) + 1
+            keys = self.__keys_by_path.get(path)
+            if not keys:
+                return
+            for key in list(keys):
+                entry = self.__entries[key]
+                if params is not None:
+                    entry_params = dict(entry.params)
+                    if any(entry_params.get(k) != v for k, v in params.items()):
+                        continue
+                self.__remove(key)
+                self.invalidations += 1
+
+    def clear(self):
+        with self.__lock:
+            for path in self.__keys_by_path:
+                self.__generations[path] = self.__generations.get(path, 0) + 1
+            self.__entries.clear()
+            self.__keys_by_path.clear()
+            self.size_bytes = 0
+
+    def __remove(self, key: Hashable):
+        entry = self.__entries.pop(key)
+        self.size_bytes -= entry.size
+        keys = self.__keys_by_path.get(entry.path)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.__keys_by_path[entry.path]
+
+    def get_stats(self) -> dict:
+        with self.__lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self.__entries),
+                'sizeBytes': self.size_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRate': self.hits / total if total > 0 else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
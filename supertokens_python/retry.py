@@ -0,0 +1,139 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from random import uniform
+from threading import Lock
+from time import monotonic
+from typing import Union
+
+from .exceptions import raise_general_exception
+
+# core APIs that are sent as POST requests but do not modify any state
+IDEMPOTENT_POST_PATHS = {'/recipe/session/verify', '/recipe/handshake'}
+
+_deadline: ContextVar[Union[float, None]] = ContextVar('supertokens_core_call_deadline', default=None)
+
+
+class RetryConfig:
+    def __init__(self,
+                 timeout_seconds: float = 5.0,
+                 connect_timeout_seconds: float = 5.0,
+                 max_retries: int = 0,
+                 backoff_base_seconds: float = 0.1,
+                 backoff_max_seconds: float = 2.0,
+                 retry_budget_max_tokens: float = 10,
+                 retry_budget_token_ratio: float = 0.1):
+        self.timeout_seconds = timeout_seconds
+        self.connect_timeout_seconds = connect_timeout_seconds
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.retry_budget_max_tokens = retry_budget_max_tokens
+        self.retry_budget_token_ratio = retry_budget_token_ratio
+
+
+class RetryBudget:
+    """
+    Process wide token bucket limiting how many retries are sent to the core.
+
+    Every successful request adds `token_ratio` tokens and every retry takes
+    one away. Retries are only allowed while the bucket is more than half
+    full, so a core brownout can not be turned into a retry storm.
+    """
+
+    def __init__(self, max_tokens: float, token_ratio: float):
+        self.max_tokens = max_tokens
+        self.token_ratio = token_ratio
+        self.tokens = max_tokens
+        self.__lock = Lock()
+
+    def on_success(self):
+        with self.__lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.token_ratio)
+
+    def try_acquire(self) -> bool:
+        with self.__lock:
+            if self.tokens <= self.max_tokens / 2:
+                return False
+            self.tokens -= 1
+            return True
+
+
+@contextmanager
+def deadline(seconds: float):
+    """
+    Limits the total time that calls to the SuperTokens core made inside the
+    block (including retries and backoff) may take. Nested deadlines can only
+    shorten the outer one.
+    """
+    new_deadline = monotonic() + seconds
+    current_deadline = _deadline.get()
+    if current_deadline is not None:
+        new_deadline = min(current_deadline, new_deadline)
+    token = _deadline.set(new_deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def get_remaining_seconds() -> Union[float, None]:
+    current_deadline = _deadline.get()
+    if current_deadline is None:
+        return None
+    return current_deadline - monotonic()
+
+
+def check_deadline() -> Union[float, None]:
+    # raises once the deadline has passed, and returns the seconds that are left
+    remaining = get_remaining_seconds()
+    if remaining is not None and remaining <= 0:
+        raise_general_exception('Deadline exceeded while querying the SuperTokens core')
+    return remaining
+
+
+def get_attempt_timeout(config: RetryConfig) -> float:
+    remaining = check_deadline()
+    if remaining is None:
+        return config.timeout_seconds
+    return min(config.timeout_seconds, remaining)
+
+
+def get_backoff_seconds(config: RetryConfig, retry_round: int) -> float:
+    backoff = min(config.backoff_max_seconds, config.backoff_base_seconds * (2 ** (retry_round - 1)))
+    backoff = uniform(0, backoff)
+    remaining = get_remaining_seconds()
+    if remaining is not None:
+        backoff = min(backoff, max(0.0, remaining))
+    return backoff
+
+
+def is_connection_failure(error: Exception) -> bool:
+    from httpx import ConnectError, ConnectTimeout, PoolTimeout
+    # the request never reached the core, so it is always safe to send it again
+    return isinstance(error, (ConnectionError, ConnectError, ConnectTimeout, PoolTimeout))
+
+
+def is_retryable_error(error: Exception, method: str, path: str) -> bool:
+    from httpx import NetworkError, RemoteProtocolError, TimeoutException
+    if is_connection_failure(error):
+        return True
+    if isinstance(error, (TimeoutException, NetworkError, RemoteProtocolError)):
+        # the core may have already processed the request, so we only send
+        # it again if doing that twice has no additional effect
+        return method != 'POST' or path in IDEMPOTENT_POST_PATHS
+    return False
@@ -14,7 +14,7 @@
 
 from __future__ import annotations
 
-from typing import Union, List, TYPE_CHECKING, Callable
+from typing import Union, List, Dict, Set, Tuple, TYPE_CHECKING, Callable
 
 try:
     from typing import Literal
@@ -28,6 +28,14 @@ from .constants import (
     TELEMETRY_SUPERTOKENS_API_URL,
     TELEMETRY_SUPERTOKENS_API_VERSION, USER_COUNT, USERS, USER_DELETE
 )
+from .connection_pool import ConnectionPoolConfig
+from .host_selector import HostSelector
+from .response_cache import ResponseCacheConfig
+from .retry import RetryConfig
+from .admission_control import AdmissionControlConfig
+from .json_codec import JSONCodec, set_json_codec
+from .hedging import HedgingConfig
+from .api_version_cache import ApiVersionCacheConfig
 from .normalised_url_domain import NormalisedURLDomain
 from .normalised_url_path import NormalisedURLPath
 from .querier import Querier
@@ -49,7 +57,6 @@ if TYPE_CHECKING:
     from supertokens_python.framework.response import BaseResponse
     from supertokens_python.recipe.session import Session
 from os import environ
-from httpx import AsyncClient
 from .exceptions import raise_general_exception
 from .exceptions import (
     SuperTokensError,
@@ -61,9 +68,27 @@ import asyncio
 
 
 class SupertokensConfig:
-    def __init__(self, connection_uri: str, api_key: Union[str, None] = None):
+    def __init__(self, connection_uri: str, api_key: Union[str, None] = None,
+                 connection_pool: Union[ConnectionPoolConfig, None] = None,
+                 host_selector: Union[HostSelector, None] = None,
+                 coalesce_get_requests: bool = False,
+                 response_cache: Union[ResponseCacheConfig, None] = None,
+                 retry: Union[RetryConfig, None] = None,
+                 admission_control: Union[AdmissionControlConfig, None] = None,
+                 json_codec: Union[JSONCodec, Literal['stdlib', 'orjson', 'auto'], None] = None,
+                 hedging: Union[HedgingConfig, None] = None,
+                 api_version_cache: Union[ApiVersionCacheConfig, None] = None):
         self.connection_uri = connection_uri
         self.api_key = api_key
+        self.connection_pool = connection_pool
+        self.host_selector = host_selector
+        self.coalesce_get_requests = coalesce_get_requests
+        self.response_cache = response_cache
+        self.retry = retry
+        self.admission_control = admission_control
+        self.json_codec = json_codec
+        self.hedging = hedging
+        self.api_version_cache = api_version_cache
 
 
 class Host:
@@ -151,6 +176,34 @@ def manage_cookies_post_response(session: Session, response: BaseResponse):
             attach_anti_csrf_header(recipe, response, anti_csrf_token)
 
 
+class RouteTable:
+    """
+    The APIs of all recipes, compiled into dicts keyed by HTTP method and
+    normalised path, so that routing a request is a dict lookup. As with
+    return_api_id_if_can_handle_request, the first recipe (in recipe_list
+    order) that handles a path wins and disabled APIs are left out.
+    """
+
+    def __init__(self, recipe_modules: List[RecipeModule], app_info: AppInfo):
+        self.routes: Dict[Tuple[str, str], Tuple[RecipeModule, str]] = {}
+        self.routes_by_rid: Dict[str, Tuple[RecipeModule, Dict[Tuple[str, str], str]]] = {}
+        self.methods: Set[str] = set()
+        for recipe in recipe_modules:
+            recipe_routes = None
+            if recipe.get_recipe_id() not in self.routes_by_rid:
+                recipe_routes = {}
+                self.routes_by_rid[recipe.get_recipe_id()] = (recipe, recipe_routes)
+            for api in recipe.get_apis_handled():
+                if api.disabled:
+                    continue
+                route_key = (api.method,
+                             app_info.api_base_path.append(api.path_without_api_base_path).get_as_string_dangerous())
+                self.methods.add(api.method)
+                self.routes.setdefault(route_key, (recipe, api.request_id))
+                if recipe_routes is not None:
+                    recipe_routes.setdefault(route_key, api.request_id)
+
+
 class Supertokens:
     __instance = None
 
@@ -172,15 +225,24 @@ class Supertokens:
             app_info.website_base_path,
             mode
         )
+        # the API base path relative to the gateway path, which is what a request path is matched against
+        self.__api_path_prefix = self.app_info.api_base_path.get_as_string_dangerous()[
+            len(self.app_info.api_gateway_path.get_as_string_dangerous()):]
+        set_json_codec(supertokens_config.json_codec)
         hosts = list(map(lambda h: Host(NormalisedURLDomain(h.strip()), NormalisedURLPath(h.strip())),
                          filter(lambda x: x != '', supertokens_config.connection_uri.split(';'))))
-        Querier.init(hosts, supertokens_config.api_key)
+        Querier.init(hosts, supertokens_config.api_key, supertokens_config.connection_pool,
+                     supertokens_config.host_selector, supertokens_config.coalesce_get_requests,
+                     supertokens_config.response_cache, supertokens_config.retry,
+                     supertokens_config.admission_control, supertokens_config.hedging,
+                     supertokens_config.api_version_cache)
 
         if len(recipe_list) == 0:
             raise_general_exception(
                 None, 'Please provide at least one recipe to the supertokens.init function call')
 
         self.recipe_modules: List[RecipeModule] = list(map(lambda func: func(self.app_info), recipe_list))
+        self.__route_table: Union[RouteTable, None] = None
 
         if telemetry is None:
             telemetry = ('SUPERTOKENS_ENV' not in environ) or (environ['SUPERTOKENS_ENV'] != 'testing')
@@ -209,6 +271,7 @@ class Supertokens:
                     **data,
                     'telemetryId': telemetry_id
                 }
+            from httpx import AsyncClient
             async with AsyncClient() as client:
                 await client.post(url=TELEMETRY_SUPERTOKENS_API_URL, json=data,
                                   headers={'api-version': TELEMETRY_SUPERTOKENS_API_VERSION})
@@ -232,6 +295,7 @@ class Supertokens:
             raise_general_exception(
                 None, 'calling testing function in non testing env')
         Querier.reset()
+        Querier.close_connection_pool()
         Supertokens.__instance = None
 
     @staticmethod
@@ -274,6 +338,9 @@ class Supertokens:
             await querier.send_post_request(NormalisedURLPath(USER_DELETE), {
                 "userId": user_id
             })
+            querier.invalidate_cached_responses(NormalisedURLPath('/recipe/user'), {'userId': user_id})
+            querier.invalidate_cached_responses(NormalisedURLPath('/recipe/user/email/verify'), {'userId': user_id})
+            querier.invalidate_cached_user_counts()
 
             return None
         else:
@@ -326,37 +393,59 @@ class Supertokens:
 
         return UsersResponse(users, next_pagination_token)
 
+    def is_api_path(self, path: str) -> bool:
+        """
+        Cheap check of a raw request path, which is False only for paths that
+        the middleware would not handle. It is meant to skip the middleware
+        for all other requests without normalising their path.
+        """
+        prefix = self.__api_path_prefix
+        return path.startswith(prefix) or path[:len(prefix)].lower() == prefix
+
+    def is_api_request(self, path: str, method: str) -> bool:
+        # the same check as is_api_path, which also rules out methods that no recipe API uses
+        if not self.is_api_path(path):
+            return False
+        return normalise_http_method(method) in self.get_route_table().methods
+
+    def get_route_table(self) -> RouteTable:
+        route_table = self.__route_table
+        if route_table is None:
+            route_table = RouteTable(self.recipe_modules, self.app_info)
+            self.__route_table = route_table
+        return route_table
+
+    def invalidate_route_table(self):
+        # the table is compiled again on the next request, e.g. after the APIs of a recipe changed
+        self.__route_table = None
+
     async def middleware(self, request: BaseRequest, response: BaseResponse) -> Union[BaseResponse, None]:
-        path = Supertokens.get_instance().app_info.api_gateway_path.append(
+        path = self.app_info.api_gateway_path.append(
             NormalisedURLPath(
                 request.get_path()))
         method = normalise_http_method(request.method())
 
-        if not path.startswith(
-                Supertokens.get_instance().app_info.api_base_path):
+        if not path.startswith(self.app_info.api_base_path):
             return None
         else:
             request_rid = get_rid_from_request(request)
             if request_rid is not None and request_rid == 'anti-csrf':
                 # see https://github.com/supertokens/supertokens-python/issues/54
                 request_rid = None
+            route_table = self.get_route_table()
+            route_key = (method, path.get_as_string_dangerous())
             request_id = None
             matched_recipe = None
             if request_rid is not None:
-                for recipe in Supertokens.get_instance().recipe_modules:
-                    if recipe.get_recipe_id() == request_rid:
-                        matched_recipe = recipe
-                        break
-                if matched_recipe is not None:
-                    request_id = matched_recipe.return_api_id_if_can_handle_request(
-                        path, method)
+                # only the first recipe with the rid is looked at
+                rid_routes = route_table.routes_by_rid.get(request_rid)
+                if rid_routes is not None:
+                    matched_recipe = rid_routes[0]
+                    request_id = rid_routes[1].get(route_key)
             else:
-                for recipe in Supertokens.get_instance().recipe_modules:
-                    request_id = recipe.return_api_id_if_can_handle_request(
-                        path, method)
-                    if request_id is not None:
-                        matched_recipe = recipe
-                        break
+                route = route_table.routes.get(route_key)
+                if route is not None:
+                    matched_recipe, request_id = route
             if request_id is not None and matched_recipe is not None:
                 response = await matched_recipe.handle_api_request(request_id, request, path, method, response)
             else:
@@ -14,34 +14,56 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+from importlib import import_module
 from re import fullmatch
-from typing import Union, List, Callable, TYPE_CHECKING
-
-from jsonschema import validate
-from jsonschema.exceptions import ValidationError
+from typing import Union, List, Callable, Dict, TYPE_CHECKING
 
 from supertokens_python.framework.request import BaseRequest
 from supertokens_python.framework.response import BaseResponse
 
 if TYPE_CHECKING:
-    pass
+    from supertokens_python.framework.types import Framework
 from .constants import RID_KEY_HEADER
 from .exceptions import raise_general_exception, raise_bad_input_exception
 from .constants import ERROR_MESSAGE_KEY
 from time import time
 from base64 import b64encode, b64decode
 
-from supertokens_python.framework.django.framework import DjangoFramework
-from supertokens_python.framework.fastapi.framework import FastapiFramework
-from supertokens_python.framework.flask.framework import FlaskFramework
 from supertokens_python.async_to_sync_wrapper import check_event_loop
 import asyncio
 
-FRAMEWORKS = {
-    'fastapi': FastapiFramework(),
-    'flask': FlaskFramework(),
-    'django': DjangoFramework(),
-}
+
+class LazyFrameworks(Mapping):
+    """
+    Maps a framework name to its Framework, importing the adapter (and so the
+    web framework itself) the first time it is looked up.
+    """
+
+    def __init__(self, framework_classes: Dict[str, str]):
+        self.__framework_classes = framework_classes
+        self.__frameworks: Dict[str, Framework] = {}
+
+    def __getitem__(self, name: str) -> Framework:
+        framework = self.__frameworks.get(name)
+        if framework is None:
+            module_name, class_name = self.__framework_classes[name].rsplit('.', 1)
+            framework = getattr(import_module(module_name), class_name)()
+            self.__frameworks[name] = framework
+        return framework
+
+    def __iter__(self):
+        return iter(self.__framework_classes)
+
+    def __len__(self) -> int:
+        return len(self.__framework_classes)
+
+
+FRAMEWORKS = LazyFrameworks({
+    'fastapi': 'supertokens_python.framework.fastapi.framework.FastapiFramework',
+    'flask': 'supertokens_python.framework.flask.framework.FlaskFramework',
+    'django': 'supertokens_python.framework.django.framework.DjangoFramework',
+})
 
 
 def validate_framework(config):
@@ -53,6 +75,8 @@ def validate_framework(config):
 
 def validate_the_structure_of_user_input(
         config, input_schema, config_root, recipe):
+    from jsonschema import validate
+    from jsonschema.exceptions import ValidationError
     try:
         validate(config, input_schema)
     except ValidationError as e:
@@ -0,0 +1,87 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import json
+from threading import get_ident
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.test import RequestFactory
+
+from supertokens_python import init, SupertokensConfig, InputAppInfo, Supertokens
+from supertokens_python.framework.django import middleware
+from supertokens_python.recipe import session
+from supertokens_python.recipe.session import Session
+from tests.utils import reset
+
+
+def setup_function(f):
+    reset()
+    init(
+        supertokens_config=SupertokensConfig('http://localhost:3567'),
+        app_info=InputAppInfo(
+            app_name='SuperTokens Demo',
+            api_domain='api.supertokens.io',
+            website_domain='supertokens.io'
+        ),
+        framework='django',
+        mode='wsgi',
+        recipe_list=[session.init()]
+    )
+
+
+def teardown_function(f):
+    reset()
+
+
+def test_non_api_requests_get_the_view_response(monkeypatch):
+    async def st_middleware(*args):
+        raise Exception('the middleware should not be called')
+
+    monkeypatch.setattr(Supertokens.get_instance(), 'middleware', st_middleware)
+    view_response = JsonResponse({'status': 'OK'})
+    assert middleware(lambda request: view_response)(RequestFactory().get('/hello')) is view_response
+
+
+def test_session_cookies_are_added_to_the_view_response():
+    def view(request):
+        request.supertokens = Session(None, 'accessToken', 'handle', 'userId', {})
+        request.supertokens.remove_cookies = True
+        return JsonResponse({'status': 'OK'})
+
+    response = middleware(view)(RequestFactory().get('/hello'))
+    assert json.loads(response.content) == {'status': 'OK'}
+    assert response.cookies['sAccessToken'].value == ''
+    assert response['id-refresh-token'] == 'remove'
+
+
+def test_api_requests_are_handled():
+    def view(request):
+        raise Exception('the view should not be called')
+
+    response = middleware(view)(RequestFactory().post('/auth/session/refresh'))
+    assert response.status_code == 401
+    assert json.loads(response.content) == {'message': 'unauthorised'}
+
+
+def test_thread_sensitive_calls_of_api_overrides_run_on_the_request_thread(monkeypatch):
+    threads = []
+
+    async def st_middleware(request, response):
+        await sync_to_async(lambda: threads.append(get_ident()), thread_sensitive=True)()
+        return None
+
+    monkeypatch.setattr(Supertokens.get_instance(), 'middleware', st_middleware)
+    view_response = JsonResponse({'status': 'OK'})
+    assert middleware(lambda request: view_response)(RequestFactory().post('/auth/signin')) is view_response
+    assert threads == [get_ident()]
@@ -0,0 +1,121 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from pytest import fixture
+
+from supertokens_python import init, SupertokensConfig, InputAppInfo, Supertokens
+from supertokens_python.framework.fastapi import Middleware
+from supertokens_python.recipe import session
+from supertokens_python.recipe.session import Session
+from supertokens_python.recipe.session.exceptions import raise_unauthorised_exception
+from tests.utils import reset
+
+
+def setup_function(f):
+    reset()
+
+
+def teardown_function(f):
+    reset()
+
+
+@fixture(scope='function')
+def client():
+    init(
+        supertokens_config=SupertokensConfig('http://localhost:3567'),
+        app_info=InputAppInfo(
+            app_name='SuperTokens Demo',
+            api_domain='api.supertokens.io',
+            website_domain='supertokens.io'
+        ),
+        framework='fastapi',
+        recipe_list=[session.init()]
+    )
+    app = FastAPI()
+    app.add_middleware(Middleware)
+
+    @app.get('/stream')
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield ('chunk' + str(i)).encode('utf-8')
+        return StreamingResponse(chunks(), headers={'x-custom': 'yes'})
+
+    @app.get('/revoked')
+    async def revoked(request: Request):
+        s = Session(None, 'accessToken', 'handle', 'userId', {})
+        s.remove_cookies = True
+        request.state.supertokens = s
+        return JSONResponse({'status': 'OK'})
+
+    @app.get('/unauthorised')
+    async def unauthorised():
+        raise_unauthorised_exception('Session does not exist')
+
+    return TestClient(app)
+
+
+def test_api_paths_are_matched_without_normalising_the_path(client: TestClient):
+    st = Supertokens.get_instance()
+    assert st.is_api_path('/auth/signout')
+    assert st.is_api_path('/AUTH/session/refresh')
+    assert not st.is_api_path('/stream')
+    assert not st.is_api_path('/au')
+
+
+def test_non_api_responses_are_streamed_untouched(client: TestClient):
+    response = client.get('/stream')
+    assert response.status_code == 200
+    assert response.text == 'chunk0chunk1chunk2'
+    assert response.headers['x-custom'] == 'yes'
+    assert 'set-cookie' not in response.headers
+
+
+def test_session_cookies_are_added_to_the_app_response(client: TestClient):
+    response = client.get('/revoked')
+    assert response.json() == {'status': 'OK'}
+    cookies = response.headers.get_list('set-cookie')
+    assert any(cookie.startswith('sAccessToken="";') for cookie in cookies)
+    assert any(cookie.startswith('sRefreshToken="";') for cookie in cookies)
+    assert response.headers['id-refresh-token'] == 'remove'
+
+
+def test_supertokens_errors_are_handled(client: TestClient):
+    assert client.get('/unauthorised').status_code == 401
+    assert client.post('/auth/session/refresh').status_code == 401
+
+
+def test_api_paths_are_matched_under_the_root_path():
+    init(
+        supertokens_config=SupertokensConfig('http://localhost:3567'),
+        app_info=InputAppInfo(
+            app_name='SuperTokens Demo',
+            api_domain='api.supertokens.io',
+            website_domain='supertokens.io',
+            api_base_path='/api/auth'
+        ),
+        framework='fastapi',
+        recipe_list=[session.init()]
+    )
+    app = FastAPI()
+    app.add_middleware(Middleware)
+
+    # the test client sends the path without the root_path, like servers
+    # behind a proxy that strips it
+    client = TestClient(app, root_path='/api')
+    assert client.post('/auth/session/refresh').status_code == 401
+    assert client.post('/api/auth/session/refresh').status_code == 401
+    assert client.post('/session/refresh').status_code == 404
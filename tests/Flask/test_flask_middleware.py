@@ -0,0 +1,106 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import asyncio
+import threading
+from contextvars import ContextVar
+
+from flask import Flask, jsonify
+from pytest import fixture
+
+from supertokens_python import init, SupertokensConfig, InputAppInfo, Supertokens
+from supertokens_python.async_to_sync_wrapper import sync
+from supertokens_python.framework.flask import Middleware
+from supertokens_python.recipe import session
+from tests.utils import reset
+
+
+def setup_function(f):
+    reset()
+
+
+def teardown_function(f):
+    reset()
+
+
+@fixture(scope='function')
+def client():
+    init(
+        supertokens_config=SupertokensConfig('http://localhost:3567'),
+        app_info=InputAppInfo(
+            app_name='SuperTokens Demo',
+            api_domain='api.supertokens.io',
+            website_domain='supertokens.io'
+        ),
+        framework='flask',
+        recipe_list=[session.init()]
+    )
+    app = Flask(__name__)
+    Middleware(app)
+
+    @app.route('/hello')
+    def hello():
+        return jsonify({'status': 'OK'})
+
+    return app.test_client()
+
+
+def test_non_api_requests_skip_the_middleware(client, monkeypatch):
+    async def middleware(*args):
+        raise Exception('the middleware should not be called')
+
+    monkeypatch.setattr(Supertokens.get_instance(), 'middleware', middleware)
+    assert client.get('/hello').get_json() == {'status': 'OK'}
+    # no recipe API uses PATCH
+    assert client.patch('/auth/session/refresh').status_code == 404
+
+
+def test_api_requests_are_handled(client):
+    st = Supertokens.get_instance()
+    assert st.is_api_request('/auth/session/refresh', 'POST')
+    assert not st.is_api_request('/auth/session/refresh', 'PATCH')
+    assert not st.is_api_request('/hello', 'GET')
+
+    response = client.post('/auth/session/refresh')
+    assert response.status_code == 401
+    assert response.get_json() == {'message': 'unauthorised'}
+
+
+def test_sync_reuses_one_event_loop_per_thread():
+    request_id = ContextVar('request_id')
+
+    async def get_request_id_and_loop():
+        return request_id.get(), asyncio.get_running_loop()
+
+    request_id.set('first')
+    first, loop = sync(get_request_id_and_loop())
+    request_id.set('second')
+    second, same_loop = sync(get_request_id_and_loop())
+    assert (first, second) == ('first', 'second')
+    assert loop is same_loop
+
+    async def get_loop():
+        return asyncio.get_running_loop()
+
+    other_thread_loops = []
+    thread = threading.Thread(target=lambda: other_thread_loops.append(sync(get_loop())))
+    request_id.set('third')
+    thread.start()
+    thread.join()
+    assert other_thread_loops[0] is not loop
+
+    async def nested():
+        return sync(get_request_id_and_loop())
+
+    third, nested_loop = sync(nested())
+    assert third == 'third' and nested_loop is not loop
@@ -0,0 +1,81 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from json import dumps
+
+from pytest import raises
+
+from supertokens_python.recipe.session.access_token import AccessTokenPayloadView, parse_access_token_payload
+from supertokens_python.recipe.session.session_class import Session
+from supertokens_python.recipe.session.session_functions import get_session_without_calling_core
+from supertokens_python.recipe.session.verified_token_cache import VerifiedAccessTokenCache
+from supertokens_python.utils import get_timestamp_ms
+from tests.utils import create_key, create_access_token, create_handshake_info
+
+
+def test_access_token_payload_is_parsed_when_it_is_read():
+    now = get_timestamp_ms()
+    private_key, key = create_key(now - 10000)
+    handshake_info = create_handshake_info()
+    handshake_info.set_jwt_signing_public_key_list([key])
+    cache = VerifiedAccessTokenCache()
+    access_token = create_access_token(private_key, now)
+    first = get_session_without_calling_core(handshake_info, access_token, None, False, False, cache)
+
+    result = get_session_without_calling_core(handshake_info, access_token, None, False, False, cache)
+    view = result['session']['userDataInJWT']
+    assert isinstance(view, AccessTokenPayloadView)
+    assert view is first['session']['userDataInJWT']
+
+    session = Session(None, access_token, 'handle', 'userId', view)
+    assert session.get_access_token_payload() == {}
+    assert session.get_access_token_payload() is session.access_token_payload
+    session.access_token_payload = {'role': 'admin'}
+    assert session.get_access_token_payload() == {'role': 'admin'}
+    assert view.materialise() == {}
+
+
+def test_access_token_payload_is_parsed_like_json_loads():
+    payloads = [
+        {'sessionHandle': 'h', 'userId': 'u', 'refreshTokenHash1': 'r', 'parentRefreshTokenHash1': None,
+         'userData': {'roles': ['a', 'b'], 'nested': {'"}': [1, {'x': '\\"'}]}}, 'antiCsrfToken': None,
+         'expiryTime': 2, 'timeCreated': 1},
+        {'userData': ['}', '{'], 'sessionHandle': 'h', 'userId': 'u', 'refreshTokenHash1': 'r', 'expiryTime': 2,
+         'timeCreated': 1},
+        {'sessionHandle': 'h', 'userId': 'u', 'userData': {'a': 1}, 'refreshTokenHash1': 'r', 'other': {'b': [2]},
+         'expiryTime': 2, 'timeCreated': 1},
+        {'sessionHandle': 'h', 'userId': 'u', 'refreshTokenHash1': 'r', 'expiryTime': 2, 'timeCreated': 1,
+         'userData': 'scalar'},
+    ]
+    for payload in payloads:
+        for text in [dumps(payload), dumps(payload, indent=2), dumps(payload, separators=(',', ':'))]:
+            fields = parse_access_token_payload(text.encode('utf-8'))
+            user_data = fields.pop('userData')
+            assert isinstance(user_data, AccessTokenPayloadView)
+            assert user_data.materialise() == payload['userData']
+            if isinstance(payload['userData'], (dict, list)):
+                assert user_data.materialise() is not user_data.materialise()
+            for key in ['sessionHandle', 'userId', 'refreshTokenHash1', 'expiryTime', 'timeCreated']:
+                assert fields[key] == payload[key]
+
+    # fields with nested values after the userData must not hide the ones
+    # before them
+    text = ('{"sessionHandle":"h","userId":"u","refreshTokenHash1":"r","expiryTime":2,"timeCreated":1,'
+            '"userData":[51211,true,null],"parentRefreshTokenHash1":"p","antiCsrfToken":"c","x":{"a":0.37}}')
+    fields = parse_access_token_payload(text)
+    assert fields['parentRefreshTokenHash1'] == 'p' and fields['antiCsrfToken'] == 'c'
+    assert fields['x'] == {'a': 0.37} and fields['userData'].materialise() == [51211, True, None]
+
+    for invalid in [b'[]', b'{"a": 1', b'{"a": 1}x', b'{"a" 1}']:
+        with raises(ValueError):
+            parse_access_token_payload(invalid)
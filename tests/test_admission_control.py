@@ -0,0 +1,82 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import asyncio
+from threading import Thread
+
+from pytest import mark, raises
+
+from supertokens_python.admission_control import AdmissionControlConfig, AdmissionController
+from supertokens_python.exceptions import GeneralError
+
+
+@mark.asyncio
+async def test_concurrency_is_limited_and_full_queue_fails_fast():
+    controller = AdmissionController(AdmissionControlConfig(max_concurrent_requests=2, max_queue_size=3))
+    in_flight = [0]
+    max_in_flight = [0]
+
+    async def request():
+        gates = await controller.acquire('/recipe/session')
+        in_flight[0] += 1
+        max_in_flight[0] = max(max_in_flight[0], in_flight[0])
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        controller.release(gates)
+
+    results = await asyncio.gather(*[request() for _ in range(6)], return_exceptions=True)
+
+    assert max_in_flight[0] == 2
+    assert len([r for r in results if isinstance(r, GeneralError)]) == 1
+    stats = controller.get_stats()['global']
+    assert stats['admitted'] == 5
+    assert stats['rejected'] == 1
+    assert stats['maxQueueDepth'] == 3
+    assert stats['inFlight'] == 0 and stats['queueDepth'] == 0
+
+
+@mark.asyncio
+async def test_per_path_limit_and_queue_timeout():
+    controller = AdmissionController(AdmissionControlConfig(
+        max_concurrent_requests=None,
+        max_concurrent_requests_per_path={'/recipe/user': 1},
+        max_queue_wait_seconds=0.01))
+
+    gates = await controller.acquire('/recipe/user')
+    assert await controller.acquire('/recipe/session') == []
+    with raises(GeneralError):
+        await controller.acquire('/recipe/user')
+    controller.release(gates)
+    controller.release(await controller.acquire('/recipe/user'))
+
+    assert controller.get_stats()['paths'][0]['timedOut'] == 1
+    assert controller.get_stats()['paths'][0]['inFlight'] == 0
+
+
+def test_sync_waiters_are_woken_up():
+    controller = AdmissionController(AdmissionControlConfig(max_concurrent_requests=1))
+    gates = controller.sync_acquire('/recipe/user')
+    admitted = []
+
+    def request():
+        admitted.append(controller.sync_acquire('/recipe/user'))
+
+    thread = Thread(target=request)
+    thread.start()
+    thread.join(0.05)
+    assert admitted == []
+    controller.release(gates)
+    thread.join(1)
+    assert len(admitted) == 1
+    controller.release(admitted[0])
+    assert controller.get_stats()['global']['inFlight'] == 0
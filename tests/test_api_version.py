@@ -0,0 +1,86 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import asyncio
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+from pytest import fixture, mark
+
+from supertokens_python.api_version_cache import ApiVersionCacheConfig, ApiVersionFileCache
+from supertokens_python.normalised_url_domain import NormalisedURLDomain
+from supertokens_python.normalised_url_path import NormalisedURLPath
+from supertokens_python.querier import Querier
+from supertokens_python.supertokens import Host
+
+api_version_calls = []
+
+
+class CoreHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        api_version_calls.append(self.path)
+        content = json.dumps({'versions': ['2.8', '2.9']}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('content-type', 'application/json')
+        self.send_header('content-length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+@fixture(scope='function')
+def core_uri():
+    api_version_calls.clear()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), CoreHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield 'http://127.0.0.1:' + str(server.server_port)
+    Querier.close_connection_pool()
+    Querier.reset()
+    server.shutdown()
+    server.server_close()
+
+
+def init_querier(uri, cache_file):
+    Querier.reset()
+    Querier.init([Host(NormalisedURLDomain(uri), NormalisedURLPath(''))],
+                 api_version_cache_config=ApiVersionCacheConfig(file_path=cache_file))
+
+
+@mark.asyncio
+async def test_api_version_is_negotiated_once_and_persisted(core_uri, tmp_path):
+    cache_file = str(tmp_path / 'api_version.json')
+    init_querier(core_uri, cache_file)
+
+    versions = await asyncio.gather(*[Querier.get_instance().get_api_version() for _ in range(20)])
+    assert versions == ['2.9'] * 20
+    assert api_version_calls == ['/apiversion']
+
+    # a new process with the same connection uri reads the persisted version
+    init_querier(core_uri, cache_file)
+    assert Querier.get_instance().sync_get_api_version() == '2.9'
+    assert api_version_calls == ['/apiversion']
+
+
+def test_file_cache_ignores_other_uris_and_stale_entries(tmp_path):
+    cache = ApiVersionFileCache(ApiVersionCacheConfig(file_path=str(tmp_path / 'cache.json')))
+    assert cache.get('http://localhost:3567') is None
+
+    cache.put('http://localhost:3567', '2.9')
+    assert cache.get('http://localhost:3567') == '2.9'
+    assert cache.get('http://localhost:3568') is None
+
+    assert ApiVersionFileCache(ApiVersionCacheConfig(
+        file_path=str(tmp_path / 'cache.json'), ttl_seconds=-1)).get('http://localhost:3567') is None
@@ -11,15 +11,18 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import copy
+import pickle
+
 from supertokens_python import init, SupertokensConfig, InputAppInfo
 from supertokens_python.normalised_url_domain import NormalisedURLDomain
-from supertokens_python.normalised_url_path import NormalisedURLPath
+from supertokens_python.normalised_url_path import NormalisedURLPath, normalise_url_path_or_throw_error
 from supertokens_python.recipe import session
 from supertokens_python.recipe.session import SessionRecipe
 from tests.utils import (
     reset, setup_st, clean_st, start_st
 )
-from pytest import mark
+from pytest import mark, raises
 
 
 def setup_function(f):
@@ -92,6 +95,20 @@ def testing_URL_path_normalisation():
     assert normalise_url_path_or_throw_error("/app.example.com") == "/app.example.com"
 
 
+def testing_normalised_URL_path_is_a_value_type():
+    for path in ["/one/two", "/One/Two/", "  /one/two//", "/one;two", "/one\ttwo", "/one//two", "/%2F?a=b"]:
+        assert normalise_url_path_or_throw_error(path) == normalise_url_path_or_throw_error(
+            "http://example.com" + path.strip())
+
+    path = NormalisedURLPath("/Auth/")
+    assert path == NormalisedURLPath("auth") and path != NormalisedURLPath("/auth/signin")
+    assert {path: 'auth'}[NormalisedURLPath("/auth")] == 'auth'
+    assert pickle.loads(pickle.dumps(path)) == path
+    assert copy.deepcopy(path) is path
+    with raises(AttributeError):
+        path.value = "/signin"
+
+
 def testing_URL_domain_normalisation():
 
     def normalise_url_domain_or_throw_error(input: str):
@@ -0,0 +1,87 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import asyncio
+from threading import Thread
+
+from supertokens_python.async_to_sync_wrapper import get_thread_event_loop, sync
+from supertokens_python.connection_pool import ConnectionPool
+from tests.utils import start_core
+
+
+def test_clients_of_closed_loops_are_closed_when_a_new_client_is_created():
+    server = start_core(0.05, keep_alive=True)
+    url = 'http://127.0.0.1:' + str(server.server_port) + '/apiversion'
+    pool = ConnectionPool()
+
+    async def send_requests():
+        client = pool.get_async_client()
+        await asyncio.gather(*[client.get(url) for _ in range(3)])
+        return client
+
+    async def get_client():
+        client = pool.get_async_client()
+        # lets the clients of closed loops be closed
+        for _ in range(5):
+            await asyncio.sleep(0)
+        return client
+
+    try:
+        old_loop = asyncio.new_event_loop()
+        old_client = old_loop.run_until_complete(send_requests())
+        old_loop.close()
+        assert len(old_client._transport._pool.connections) == 3
+
+        new_loop = asyncio.new_event_loop()
+        new_client = new_loop.run_until_complete(get_client())
+        assert new_client is not old_client
+        assert old_client.is_closed
+        assert old_client._transport._pool.connections == []
+        assert new_loop.run_until_complete(get_client()) is new_client
+        new_loop.close()
+    finally:
+        pool.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_the_loops_and_clients_of_sync_threads_are_closed_when_the_threads_exit():
+    server = start_core(0, keep_alive=True)
+    url = 'http://127.0.0.1:' + str(server.server_port) + '/apiversion'
+    pool = ConnectionPool()
+    loops = []
+    clients = []
+
+    async def send_request():
+        client = pool.get_async_client()
+        await client.get(url)
+        clients.append(client)
+
+    def run():
+        loops.append(get_thread_event_loop())
+        sync(send_request())
+
+    try:
+        threads = [Thread(target=run) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+        assert len(loops) == 20 and all(loop.is_closed() for loop in loops)
+        assert len(clients) == 20 and all(client.is_closed for client in clients)
+        assert all(client._transport._pool.connections == [] for client in clients)
+        assert pool._ConnectionPool__clients == {}
+    finally:
+        pool.close()
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,102 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import asyncio
+import time
+from asyncio import gather, sleep
+
+from pytest import mark
+
+from supertokens_python.recipe.session.recipe_implementation import RecipeImplementation
+from supertokens_python.recipe.session.utils import AccessTokenVerificationConfig, SessionConfig
+from supertokens_python.utils import get_timestamp_ms
+from tests.utils import create_key
+
+
+class FakeHandshakeQuerier:
+    def __init__(self, key_expiry_ms: int):
+        self.key_expiry_ms = key_expiry_ms
+        self.handshakes = 0
+        self.delay = 0.1
+        _, self.key = create_key(get_timestamp_ms())
+
+    async def send_post_request(self, path, data):
+        return self.sync_send_post_request(path, data)
+
+    def sync_send_post_request(self, path, data):
+        assert path.get_as_string_dangerous() == '/recipe/handshake'
+        self.handshakes += 1
+        time.sleep(self.delay)
+        key = {**self.key, 'expiryTime': get_timestamp_ms() + self.key_expiry_ms}
+        return {
+            'accessTokenBlacklistingEnabled': False,
+            'accessTokenValidity': 3600,
+            'refreshTokenValidity': 144000,
+            'jwtSigningPublicKeyList': [key],
+            'jwtSigningPublicKey': key['publicKey'],
+            'jwtSigningPublicKeyExpiryTime': key['expiryTime']
+        }
+
+
+@mark.asyncio
+async def test_handshake_info_is_fetched_once_and_refreshed_before_the_keys_expire():
+    querier = FakeHandshakeQuerier(1500)
+    config = SessionConfig(None, None, 'lax', False, 401, None, 'NONE', None, 'fastapi', 'asgi', None,
+                           AccessTokenVerificationConfig(refresh_signing_keys_ahead_seconds=1))
+    recipe_implementation = RecipeImplementation(querier, config)
+    try:
+        handshake_infos = await gather(*[recipe_implementation.get_handshake_info() for _ in range(10)])
+        assert querier.handshakes == 1
+        assert all(handshake_info is handshake_infos[0] for handshake_info in handshake_infos)
+
+        # the refresh starts 0.5s later, and the old keys are used until it is done
+        querier.key_expiry_ms = 3600000
+        querier.delay = 0.5
+        await sleep(0.55)
+        assert querier.handshakes == 2
+        assert await recipe_implementation.get_handshake_info() is handshake_infos[0]
+        await sleep(0.5)
+        handshake_info = await recipe_implementation.get_handshake_info()
+        assert handshake_info is not handshake_infos[0]
+        assert handshake_info.signing_key_ring.keys[0].expiry_time > get_timestamp_ms() + 60000
+        assert querier.handshakes == 2
+    finally:
+        recipe_implementation.stop_handshake_refresh()
+
+
+@mark.asyncio
+async def test_handshake_info_is_only_refreshed_ahead_on_request():
+    querier = FakeHandshakeQuerier(500)
+    config = SessionConfig(None, None, 'lax', False, 401, None, 'NONE', None, 'fastapi', 'asgi', None,
+                           AccessTokenVerificationConfig())
+    recipe_implementation = RecipeImplementation(querier, config)
+    await recipe_implementation.get_handshake_info()
+    await sleep(0.7)
+    assert querier.handshakes == 1
+
+
+def test_handshake_info_is_refreshed_after_the_event_loop_that_fetched_it_is_closed():
+    querier = FakeHandshakeQuerier(1500)
+    config = SessionConfig(None, None, 'lax', False, 401, None, 'NONE', None, 'fastapi', 'asgi', None,
+                           AccessTokenVerificationConfig(refresh_signing_keys_ahead_seconds=1))
+    recipe_implementation = RecipeImplementation(querier, config)
+    try:
+        handshake_info = asyncio.run(recipe_implementation.get_handshake_info())
+        querier.key_expiry_ms = 3600000
+        time.sleep(0.7)
+        assert querier.handshakes == 2
+        assert recipe_implementation.handshake_info is not handshake_info
+    finally:
+        recipe_implementation.stop_handshake_refresh()
+    time.sleep(0.1)
+    assert querier.handshakes == 2
@@ -0,0 +1,66 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import time
+
+from pytest import fixture, mark
+
+from supertokens_python.hedging import HedgingConfig, HedgingPolicy
+from supertokens_python.normalised_url_domain import NormalisedURLDomain
+from supertokens_python.normalised_url_path import NormalisedURLPath
+from supertokens_python.querier import Querier
+from supertokens_python.supertokens import Host
+from tests.utils import start_core
+
+
+@fixture(scope='function')
+def slow_and_fast_core():
+    servers = [start_core(1), start_core(0)]
+    Querier.reset()
+    Querier.init([Host(NormalisedURLDomain('http://127.0.0.1:' + str(server.server_port)), NormalisedURLPath(''))
+                  for server in servers],
+                 hedging_config=HedgingConfig(initial_delay_ms=20, max_hedge_ratio=0.1, max_hedge_burst=1))
+    yield
+    Querier.close_connection_pool()
+    Querier.reset()
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_hedge_delay_follows_the_latency_percentile():
+    policy = HedgingPolicy(HedgingConfig(delay_percentile=90, initial_delay_ms=100, min_samples=10))
+
+    assert policy.get_delay_seconds() == 0.1
+    for latency in range(1, 11):
+        policy.record_latency(latency)
+    assert policy.get_delay_seconds() == 0.01
+    assert policy.get_stats()['delayMs'] == 10
+
+
+@mark.asyncio
+async def test_slow_requests_are_hedged_within_the_budget(slow_and_fast_core):
+    querier = Querier.get_instance()
+    results = []
+    for _ in range(4):
+        start = time.time()
+        response = await querier.send_get_request(NormalisedURLPath('/recipe/user'), {'userId': 'u'})
+        results.append((response['delay'], time.time() - start < 0.5))
+
+    stats = Querier.get_hedging_policy().get_stats()
+    # only one backup request fits in the budget, after that requests sent
+    # to the slow host have to wait for it
+    assert stats['hedgedRequests'] == 1
+    assert stats['hedgeWins'] == 1
+    assert stats['throttledHedges'] == len([r for r in results if r[0] == 1]) >= 1
+    assert all(is_fast == (delay == 0) for delay, is_fast in results)
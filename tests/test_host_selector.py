@@ -0,0 +1,137 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import asyncio
+from time import sleep
+
+from pytest import mark, raises
+
+from supertokens_python.host_selector import HealthAwareHostSelector, RoundRobinHostSelector, get_host_key
+from supertokens_python.normalised_url_domain import NormalisedURLDomain
+from supertokens_python.normalised_url_path import NormalisedURLPath
+from supertokens_python.querier import Querier
+from supertokens_python.supertokens import Host
+from tests.utils import start_core
+
+
+def get_hosts():
+    return [Host(NormalisedURLDomain(uri), NormalisedURLPath(uri))
+            for uri in ['http://localhost:3567', 'http://localhost:3568', 'http://localhost:3569']]
+
+
+def test_round_robin_host_selector_skips_tried_hosts():
+    hosts = get_hosts()
+    selector = RoundRobinHostSelector()
+    assert selector.select_host(hosts, set()) is hosts[0]
+    assert selector.select_host(hosts, set()) is hosts[1]
+    assert selector.select_host(hosts, {get_host_key(hosts[2])}) is hosts[0]
+    assert selector.select_host(hosts, {get_host_key(h) for h in hosts}) is None
+
+
+def test_health_aware_host_selector_prefers_the_fastest_host():
+    hosts = get_hosts()
+    selector = HealthAwareHostSelector()
+    for _ in range(5):
+        selector.on_request_success(hosts[0], 50)
+        selector.on_request_success(hosts[1], 5)
+        selector.on_request_success(hosts[2], 500)
+
+    for _ in range(10):
+        assert selector.select_host(hosts, set()) is hosts[1]
+    assert selector.select_host(hosts, {get_host_key(hosts[1])}) is hosts[0]
+
+
+def test_health_aware_host_selector_avoids_hosts_that_only_failed():
+    hosts = get_hosts()
+    selector = HealthAwareHostSelector()
+    # no host has a latency yet
+    selector.on_request_failure(hosts[2])
+    for _ in range(10):
+        assert selector.select_host(hosts, set()) is not hosts[2]
+
+    for _ in range(5):
+        selector.on_request_success(hosts[0], 50)
+        selector.on_request_success(hosts[1], 60)
+    selector.on_request_failure(hosts[2])
+    for _ in range(10):
+        assert selector.select_host(hosts, set()) is hosts[0]
+    assert {s['host']: s for s in selector.get_host_stats()}[get_host_key(hosts[2])]['state'] == 'CLOSED'
+
+
+def test_health_aware_host_selector_circuit_breaker():
+    hosts = get_hosts()[:2]
+    transitions = []
+    selector = HealthAwareHostSelector(failure_threshold=2, open_duration_seconds=0.05,
+                                       on_state_change=lambda host, old, new: transitions.append(new))
+    selector.on_request_success(hosts[0], 100)
+    selector.on_request_success(hosts[1], 1)
+    selector.on_request_failure(hosts[1])
+    selector.on_request_failure(hosts[1])
+    assert transitions == ['OPEN']
+
+    for _ in range(5):
+        assert selector.select_host(hosts, set()) is hosts[0]
+
+    sleep(0.06)
+    # only a single probe is allowed through while the circuit is half open
+    assert selector.select_host(hosts, set()) is hosts[1]
+    assert selector.select_host(hosts, set()) is hosts[0]
+    selector.on_request_success(hosts[1], 1)
+    assert transitions == ['OPEN', 'HALF_OPEN', 'CLOSED']
+
+    stats = {s['host']: s for s in selector.get_host_stats()}
+    assert stats[get_host_key(hosts[1])]['state'] == 'CLOSED'
+    assert stats[get_host_key(hosts[1])]['totalFailures'] == 2
+
+
+def test_health_aware_host_selector_releases_probes():
+    hosts = get_hosts()[:2]
+    selector = HealthAwareHostSelector(failure_threshold=1, open_duration_seconds=0.05)
+    selector.on_request_success(hosts[0], 100)
+    selector.on_request_failure(hosts[1])
+    sleep(0.06)
+
+    def get_probes_in_flight():
+        return {s['host']: s for s in selector.get_host_stats()}[get_host_key(hosts[1])]['probesInFlight']
+
+    assert selector.select_host(hosts, {get_host_key(hosts[0])}) is hosts[1]
+    assert get_probes_in_flight() == 1
+    assert selector.select_host(hosts, set()) is hosts[0]
+    selector.release_probe(hosts[1])
+    assert get_probes_in_flight() == 0
+    assert selector.select_host(hosts, {get_host_key(hosts[0])}) is hosts[1]
+    assert get_probes_in_flight() == 1
+
+
+@mark.asyncio
+async def test_cancelled_probes_are_released_by_the_querier():
+    server = start_core(1)
+    host = Host(NormalisedURLDomain('http://127.0.0.1:' + str(server.server_port)), NormalisedURLPath(''))
+    selector = HealthAwareHostSelector(failure_threshold=1, open_duration_seconds=0.05)
+    Querier.reset()
+    Querier.init([host], host_selector=selector)
+    try:
+        querier = Querier.get_instance()
+        await querier.get_api_version()
+        selector.on_request_failure(host)
+        sleep(0.06)
+
+        with raises(asyncio.TimeoutError):
+            await asyncio.wait_for(querier.send_get_request(NormalisedURLPath('/recipe/user'), {}), 0.2)
+        stats = selector.get_host_stats()[0]
+        assert stats['state'] == 'HALF_OPEN' and stats['probesInFlight'] == 0
+    finally:
+        Querier.close_connection_pool()
+        Querier.reset()
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,79 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import json
+import subprocess
+import sys
+from os import environ, path
+
+from pytest import mark, raises
+
+# `import supertokens_python` took ~430ms when it loaded every dependency
+# eagerly and takes ~90ms without them
+IMPORT_TIME_BUDGET_MS = 250
+
+LAZY_MODULES = ['jsonschema', 'tldextract', 'Crypto', 'cryptography', 'jwt', 'httpx', 'phonenumbers',
+                'fastapi', 'starlette', 'flask', 'werkzeug', 'django']
+
+
+def run_python(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          cwd=path.dirname(path.dirname(path.abspath(__file__))),
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+
+
+def get_import_time_ms() -> float:
+    result = run_python('import supertokens_python')
+    for line in result.stderr.splitlines():
+        columns = line.split('|')
+        if len(columns) == 3 and columns[2].strip() == 'supertokens_python':
+            return int(columns[1]) / 1000
+    raise Exception('supertokens_python is missing in the -X importtime output')
+
+
+# timings depend on the machine, so the budget is only checked on request
+@mark.skipif('SUPERTOKENS_CHECK_IMPORT_TIME' not in environ, reason='set SUPERTOKENS_CHECK_IMPORT_TIME to check it')
+def test_import_time_is_within_budget():
+    # the fastest of a few runs, so that a busy machine does not fail the test
+    import_time_ms = min(get_import_time_ms() for _ in range(3))
+    assert import_time_ms < IMPORT_TIME_BUDGET_MS
+
+
+def test_optional_dependencies_are_imported_on_first_use():
+    result = run_python(
+        'import sys, json\n'
+        'import supertokens_python\n'
+        'from supertokens_python.recipe import session, emailpassword, passwordless, thirdparty, '
+        'thirdpartyemailpassword\n'
+        'print(json.dumps(sorted(m for m in ' + repr(LAZY_MODULES) + ' if m in sys.modules)))\n'
+        'thirdparty.Google\n'
+        'from supertokens_python.utils import FRAMEWORKS\n'
+        'FRAMEWORKS["flask"]\n'
+        'print(json.dumps(sorted(m for m in ' + repr(LAZY_MODULES) + ' if m in sys.modules)))\n'
+    )
+    before_use, after_use = [json.loads(line) for line in result.stdout.splitlines()]
+    assert before_use == []
+    assert 'httpx' in after_use and 'werkzeug' in after_use and 'django' not in after_use
+
+
+def test_only_providers_are_looked_up_on_first_use():
+    from supertokens_python.recipe import thirdparty, thirdpartyemailpassword
+    from supertokens_python.recipe.thirdparty.providers.github import Github
+
+    for module in [thirdparty, thirdpartyemailpassword]:
+        assert module.Github is Github
+        with raises(AttributeError, match=module.__name__):
+            getattr(module, 'Unknown')
+        namespace = {}
+        exec('from ' + module.__name__ + ' import *', namespace)
+        assert namespace['Github'] is Github and 'init' in namespace
@@ -0,0 +1,80 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import json
+from base64 import b64decode
+from importlib.util import find_spec
+
+from pytest import mark, raises
+
+from supertokens_python.exceptions import GeneralError
+from supertokens_python.json_codec import (
+    OrjsonJSONCodec,
+    StdlibJSONCodec,
+    create_json_codec,
+    get_json_codec,
+    set_json_codec
+)
+from supertokens_python.recipe.session.cookie_and_header import set_front_token_in_headers
+
+codecs = [StdlibJSONCodec()]
+if find_spec('orjson') is not None:
+    codecs.append(OrjsonJSONCodec())
+
+
+@mark.parametrize('codec', codecs, ids=lambda c: c.name)
+def test_codecs_produce_the_same_compact_json(codec):
+    value = {'uid': 'ü1', 'ate': 1643723000000, 'up': {'b': [1, 2.5, None, True], 'a': 'x'}}
+
+    assert codec.dumps(value, sort_keys=True) == \
+        b'{"ate":1643723000000,"uid":"\xc3\xbc1","up":{"a":"x","b":[1,2.5,null,true]}}'
+    assert codec.loads(codec.dumps(value)) == value
+    assert codec.loads('{"status":"OK"}') == {'status': 'OK'}
+    with raises(json.JSONDecodeError):
+        codec.loads(b'Not found')
+
+
+def test_codec_selection():
+    assert isinstance(create_json_codec(None), StdlibJSONCodec)
+    assert isinstance(create_json_codec('stdlib'), StdlibJSONCodec)
+    with raises(GeneralError):
+        create_json_codec('simplejson')
+
+    try:
+        set_json_codec('auto')
+        assert get_json_codec().name == ('orjson' if find_spec('orjson') is not None else 'stdlib')
+    finally:
+        set_json_codec(None)
+
+
+class FakeResponse:
+    def __init__(self):
+        self.headers = {}
+
+    def get_header(self, key):
+        return self.headers.get(key)
+
+    def set_header(self, key, value):
+        self.headers[key] = value
+
+
+@mark.parametrize('codec', codecs, ids=lambda c: c.name)
+def test_front_token_is_ascii_json(codec):
+    set_json_codec(codec)
+    try:
+        response = FakeResponse()
+        set_front_token_in_headers(None, response, 'ü1', 1643723000000, {'b': 1, 'a': 'ü'})
+        assert b64decode(response.headers['front-token']) == \
+            b'{"ate":1643723000000,"uid":"\\u00fc1","up":{"a":"\\u00fc","b":1}}'
+    finally:
+        set_json_codec(None)
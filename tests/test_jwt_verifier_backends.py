@@ -0,0 +1,33 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from pytest import mark, raises
+
+from supertokens_python.recipe.session.jwt import benchmark_verifier_backends, create_verifier_backend, get_payload
+from supertokens_python.utils import get_timestamp_ms
+from tests.utils import create_key, create_access_token
+
+
+@mark.parametrize('backend', ['pycryptodome', 'cryptography'])
+def test_verifier_backends(backend):
+    private_key, key = create_key(get_timestamp_ms())
+    _, other_key = create_key(get_timestamp_ms())
+    access_token = create_access_token(private_key, get_timestamp_ms())
+    verifier = create_verifier_backend(backend).create_verifier(key['publicKey'])
+
+    assert get_payload(access_token, verifier)['userId'] == 'userId'
+    with raises(Exception):
+        get_payload(access_token, create_verifier_backend(backend).create_verifier(other_key['publicKey']))
+    with raises(Exception):
+        get_payload(access_token[:-4] + 'AAA=', verifier)
+    assert benchmark_verifier_backends(iterations=5).keys() == {'pycryptodome', 'cryptography'}
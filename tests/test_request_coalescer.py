@@ -0,0 +1,55 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import asyncio
+
+from pytest import mark, raises
+
+from supertokens_python.request_coalescer import RequestCoalescer
+
+
+@mark.asyncio
+async def test_concurrent_identical_requests_share_one_call():
+    coalescer = RequestCoalescer()
+    calls = []
+
+    async def func():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {'status': 'OK', 'user': {'id': 'u1'}}
+
+    results = await asyncio.gather(*[coalescer.run(('/recipe/user', (('userId', 'u1'),)), func) for _ in range(10)])
+
+    assert len(calls) == 1
+    assert all(result == results[0] for result in results)
+    results[0]['user']['id'] = 'changed'
+    assert results[1]['user']['id'] == 'u1'
+    assert coalescer.get_stats() == {'totalRequests': 10, 'coalescedRequests': 9, 'dedupeRatio': 0.9}
+
+    await coalescer.run('other', func)
+    assert len(calls) == 2
+
+
+@mark.asyncio
+async def test_errors_are_shared_with_waiting_callers():
+    coalescer = RequestCoalescer()
+
+    async def func():
+        await asyncio.sleep(0.01)
+        raise Exception('core down')
+
+    results = await asyncio.gather(*[coalescer.run('key', func) for _ in range(3)], return_exceptions=True)
+    assert all(str(result) == 'core down' for result in results)
+
+    with raises(Exception):
+        await coalescer.run('key', func)
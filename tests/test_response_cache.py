@@ -0,0 +1,126 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from time import sleep
+
+from pytest import mark
+
+from supertokens_python.recipe.emailpassword.recipe_implementation import \
+    RecipeImplementation as EmailPasswordRecipeImplementation
+from supertokens_python.recipe.passwordless.recipe_implementation import \
+    RecipeImplementation as PasswordlessRecipeImplementation
+from supertokens_python.recipe.thirdparty.recipe_implementation import \
+    RecipeImplementation as ThirdPartyRecipeImplementation
+from supertokens_python.response_cache import DEFAULT_TTL_SECONDS, ResponseCache, ResponseCacheConfig
+
+
+def put(cache, path, params, value, size=10):
+    params_key = tuple(sorted(params.items()))
+    key = (path, params_key, None)
+    cache.put(key, path, params_key, value, size, cache.get_generation(path))
+    return key
+
+
+def test_cache_hit_returns_a_copy():
+    cache = ResponseCache(ResponseCacheConfig({'/recipe/user': 10}))
+    key = put(cache, '/recipe/user', {'userId': 'u1'}, {'status': 'OK', 'user': {'id': 'u1'}})
+
+    value = cache.get(key)
+    assert value == {'status': 'OK', 'user': {'id': 'u1'}}
+    value['user']['id'] = 'changed'
+    assert cache.get(key)['user']['id'] == 'u1'
+    assert cache.get(('/recipe/user', (), None)) is None
+    assert cache.get_stats()['hits'] == 2
+    assert cache.get_stats()['misses'] == 1
+
+
+def test_only_paths_with_a_ttl_are_cached_and_entries_expire():
+    cache = ResponseCache(ResponseCacheConfig({'/recipe/session': 0.05}))
+    assert not cache.is_cacheable('/recipe/user')
+    key = put(cache, '/recipe/user', {'userId': 'u1'}, {'status': 'OK'})
+    assert cache.get(key) is None
+
+    key = put(cache, '/recipe/session', {'sessionHandle': 'h1'}, {'status': 'OK'})
+    assert cache.get(key) is not None
+    sleep(0.06)
+    assert cache.get(key) is None
+
+
+def test_lru_eviction_by_entries_and_size():
+    cache = ResponseCache(ResponseCacheConfig({'/recipe/user': 10}, max_entries=2, max_size_bytes=25))
+    key1 = put(cache, '/recipe/user', {'userId': 'u1'}, {'status': 'OK'})
+    key2 = put(cache, '/recipe/user', {'userId': 'u2'}, {'status': 'OK'})
+    cache.get(key1)
+    key3 = put(cache, '/recipe/user', {'userId': 'u3'}, {'status': 'OK'})
+    assert cache.get(key2) is None
+    assert cache.get(key1) is not None
+    assert cache.get(key3) is not None
+
+    put(cache, '/recipe/user', {'userId': 'u4'}, {'status': 'OK'}, size=20)
+    assert cache.get_stats()['entries'] == 1
+    assert cache.get_stats()['sizeBytes'] == 20
+
+
+def test_targeted_invalidation():
+    cache = ResponseCache(ResponseCacheConfig({'/recipe/user/email/verify': 10}))
+    path = '/recipe/user/email/verify'
+    key1 = put(cache, path, {'userId': 'u1', 'email': 'a@b.com'}, {'status': 'OK', 'isVerified': False})
+    key2 = put(cache, path, {'userId': 'u2', 'email': 'c@d.com'}, {'status': 'OK', 'isVerified': False})
+
+    cache.invalidate(path, {'userId': 'u1'})
+    assert cache.get(key1) is None
+    assert cache.get(key2) is not None
+
+    # a response fetched before an invalidation must not be cached
+    generation = cache.get_generation(path)
+    cache.invalidate(path)
+    params_key = (('email', 'a@b.com'), ('userId', 'u1'))
+    cache.put(key1, path, params_key, {'status': 'OK', 'isVerified': False}, 10, generation)
+    assert cache.get(key1) is None
+    assert cache.get(key2) is None
+
+
+def test_configs_do_not_share_the_default_ttls():
+    config = ResponseCacheConfig()
+    config.ttl_seconds['/recipe/user'] = 0
+    assert DEFAULT_TTL_SECONDS['/recipe/user'] == 30.0
+    assert ResponseCacheConfig().ttl_seconds['/recipe/user'] == 30.0
+
+
+class FakeUserQuerier:
+    def __init__(self, created_new_user: bool):
+        self.created_new_user = created_new_user
+        self.user_count_invalidations = 0
+
+    async def send_post_request(self, path, data):
+        user = {'id': 'u1', 'email': 'a@b.com', 'timeJoined': 0, 'thirdParty': {'id': 'google', 'userId': 'g1'}}
+        return {'status': 'OK', 'user': user, 'createdNewUser': self.created_new_user}
+
+    def invalidate_cached_responses(self, path, params=None):
+        pass
+
+    def invalidate_cached_user_counts(self):
+        self.user_count_invalidations += 1
+
+
+@mark.asyncio
+async def test_user_counts_are_invalidated_when_a_user_is_created():
+    for created_new_user in [True, False]:
+        querier = FakeUserQuerier(created_new_user)
+        await ThirdPartyRecipeImplementation(querier).sign_in_up('google', 'g1', 'a@b.com', True)
+        await PasswordlessRecipeImplementation(querier).consume_code('session', 'code', 'device')
+        assert querier.user_count_invalidations == (2 if created_new_user else 0)
+
+    querier = FakeUserQuerier(True)
+    await EmailPasswordRecipeImplementation(querier).sign_up('a@b.com', 'password')
+    assert querier.user_count_invalidations == 1
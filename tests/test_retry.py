@@ -0,0 +1,68 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import time
+
+from httpx import ConnectError, ReadTimeout
+from pytest import raises
+
+from supertokens_python.exceptions import GeneralError
+from supertokens_python.retry import (
+    RetryBudget,
+    RetryConfig,
+    check_deadline,
+    deadline,
+    get_attempt_timeout,
+    get_backoff_seconds,
+    is_retryable_error
+)
+
+
+def test_retry_budget_stops_retries_when_half_empty():
+    budget = RetryBudget(max_tokens=10, token_ratio=0.5)
+
+    assert [budget.try_acquire() for _ in range(6)] == [True, True, True, True, True, False]
+    budget.on_success()
+    assert budget.try_acquire()
+    assert not budget.try_acquire()
+
+
+def test_read_timeouts_are_only_retried_when_safe():
+    connect_error = ConnectError('refused')
+    read_timeout = ReadTimeout('timed out')
+
+    assert is_retryable_error(connect_error, 'POST', '/recipe/session')
+    assert is_retryable_error(read_timeout, 'GET', '/recipe/user')
+    assert is_retryable_error(read_timeout, 'POST', '/recipe/session/verify')
+    assert not is_retryable_error(read_timeout, 'POST', '/recipe/session')
+    assert not is_retryable_error(ValueError(), 'GET', '/recipe/user')
+
+
+def test_deadline_bounds_timeouts_and_backoff():
+    config = RetryConfig(timeout_seconds=5, backoff_base_seconds=10, backoff_max_seconds=20)
+
+    assert get_attempt_timeout(config) == 5
+    with deadline(1):
+        assert get_attempt_timeout(config) <= 1
+        assert get_backoff_seconds(config, 3) <= 1
+        with deadline(10):
+            assert get_attempt_timeout(config) <= 1
+    assert get_attempt_timeout(config) == 5
+    assert check_deadline() is None
+
+    with deadline(0.01):
+        time.sleep(0.02)
+        with raises(GeneralError):
+            check_deadline()
+        with raises(GeneralError):
+            get_attempt_timeout(config)
@@ -0,0 +1,93 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import time
+
+from pytest import raises
+
+from supertokens_python.recipe.session.exceptions import UnauthorisedError
+from supertokens_python.recipe.session.recipe_implementation import HandshakeInfo
+from supertokens_python.recipe.session.revocation_cache import RevocationCache
+from supertokens_python.recipe.session.session_functions import get_session_without_calling_core
+from supertokens_python.recipe.session.utils import RevocationCacheConfig
+from supertokens_python.utils import get_timestamp_ms
+from tests.utils import create_access_token, create_key
+
+
+def test_sessions_are_confirmed_by_the_core_once_per_staleness_window():
+    cache = RevocationCache(RevocationCacheConfig(staleness_seconds=0.2))
+    assert cache.check('handle') is None
+
+    cache.on_session_verified('handle')
+    assert cache.check('handle') is True
+    assert cache.check('other') is None
+
+    time.sleep(0.25)
+    assert cache.check('handle') is None
+    assert cache.get_stats()['localVerifications'] == 1
+    assert cache.get_stats()['coreVerifications'] == 3
+
+
+def test_revoked_sessions_are_rejected_until_their_access_tokens_expire():
+    cache = RevocationCache(RevocationCacheConfig(revoked_session_ttl_seconds=0.2))
+    cache.on_session_verified('handle')
+    cache.add_revoked_sessions(['handle'])
+    assert cache.check('handle') is False
+
+    time.sleep(0.25)
+    # the handle is still in the previous bloom filter, so it is verified by the core
+    assert cache.check('handle') is None
+    time.sleep(0.25)
+    cache.on_session_verified('handle')
+    assert cache.check('handle') is True
+
+
+def test_evicted_revoked_sessions_are_verified_by_the_core():
+    cache = RevocationCache(RevocationCacheConfig(max_revoked_sessions=2))
+    cache.add_revoked_sessions(['handle1', 'handle2', 'handle3'])
+    cache.on_session_verified('handle1')
+
+    assert cache.check('handle1') is None
+    assert cache.check('handle3') is False
+    assert cache.get_stats()['revokedSessions'] == 2
+    assert cache.get_stats()['possibleHits'] == 1
+
+
+def test_blacklisted_sessions_are_verified_without_calling_the_core():
+    now = get_timestamp_ms()
+    private_key, key = create_key(now - 10000)
+    handshake_info = HandshakeInfo({
+        'accessTokenBlacklistingEnabled': True,
+        'antiCsrf': 'NONE',
+        'accessTokenValidity': 3600000,
+        'refreshTokenValidity': 144000000
+    })
+    handshake_info.set_jwt_signing_public_key_list([key])
+    access_token = create_access_token(private_key, now)
+    cache = RevocationCache(RevocationCacheConfig())
+
+    assert get_session_without_calling_core(handshake_info, access_token, None, False, False) is None
+    assert get_session_without_calling_core(handshake_info, access_token, None, False, False, None, cache) is None
+
+    cache.on_session_verified('handle')
+    result = get_session_without_calling_core(handshake_info, access_token, None, False, False, None, cache)
+    assert result['session']['handle'] == 'handle'
+
+    # the core has to revoke the parent refresh token
+    refreshed_access_token = create_access_token(private_key, now, 'parentHash')
+    assert get_session_without_calling_core(handshake_info, refreshed_access_token, None, False, False, None,
+                                            cache) is None
+
+    cache.add_revoked_sessions(['handle'])
+    with raises(UnauthorisedError):
+        get_session_without_calling_core(handshake_info, access_token, None, False, False, None, cache)
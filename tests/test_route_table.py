@@ -0,0 +1,64 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from supertokens_python import init, SupertokensConfig, InputAppInfo, Supertokens
+from supertokens_python.recipe import session, emailpassword
+from supertokens_python.recipe.emailpassword import EmailPasswordRecipe
+from supertokens_python.recipe.session import SessionRecipe
+from tests.utils import reset
+
+
+def setup_function(f):
+    reset()
+    init(
+        supertokens_config=SupertokensConfig('http://localhost:3567'),
+        app_info=InputAppInfo(
+            app_name='SuperTokens Demo',
+            api_domain='api.supertokens.io',
+            website_domain='supertokens.io',
+            api_base_path='/Auth/'
+        ),
+        framework='fastapi',
+        recipe_list=[session.init(), emailpassword.init()]
+    )
+
+
+def teardown_function(f):
+    reset()
+
+
+def test_routes_are_looked_up_by_method_and_normalised_path():
+    st = Supertokens.get_instance()
+    route_table = st.get_route_table()
+    assert route_table is st.get_route_table()
+
+    recipe, request_id = route_table.routes[('post', '/auth/session/refresh')]
+    assert recipe is SessionRecipe.get_instance() and request_id == '/session/refresh'
+    recipe, request_id = route_table.routes[('post', '/auth/signin')]
+    assert recipe is EmailPasswordRecipe.get_instance() and request_id == '/signin'
+    assert ('get', '/auth/signin') not in route_table.routes
+
+    recipe, rid_routes = route_table.routes_by_rid['session']
+    assert recipe is SessionRecipe.get_instance()
+    assert ('post', '/auth/signin') not in rid_routes
+    assert rid_routes[('post', '/auth/signout')] == '/signout'
+
+
+def test_route_table_is_compiled_again_once_invalidated():
+    st = Supertokens.get_instance()
+    assert st.is_api_request('/auth/session/refresh', 'POST')
+
+    SessionRecipe.get_instance().api_implementation.disable_refresh_post = True
+    assert ('post', '/auth/session/refresh') in st.get_route_table().routes
+    st.invalidate_route_table()
+    assert ('post', '/auth/session/refresh') not in st.get_route_table().routes
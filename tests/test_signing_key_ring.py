@@ -0,0 +1,102 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import time
+
+from supertokens_python.recipe.session import access_token as access_token_module
+from supertokens_python.recipe.session.session_functions import get_session_without_calling_core, \
+    verify_access_token_with_signing_keys
+from supertokens_python.utils import get_timestamp_ms
+from tests.utils import create_key, create_access_token, create_handshake_info
+
+
+def test_keys_are_tried_starting_with_the_one_that_signed_the_token():
+    now = get_timestamp_ms()
+    old_private_key, old_key = create_key(now - 20000)
+    new_private_key, new_key = create_key(now - 10000)
+    handshake_info = create_handshake_info()
+    handshake_info.set_jwt_signing_public_key_list([old_key, new_key])
+    ring = handshake_info.signing_key_ring
+
+    assert [key.created_at for key in ring.keys] == [new_key['createdAt'], old_key['createdAt']]
+    assert [key.created_at for key in ring.get_keys_for_token(now - 15000)] == \
+        [old_key['createdAt'], new_key['createdAt']]
+    assert [key.created_at for key in ring.get_keys_for_token(None)] == \
+        [new_key['createdAt'], old_key['createdAt']]
+
+    for private_key, time_created in [(old_private_key, now - 15000), (new_private_key, now)]:
+        result = get_session_without_calling_core(handshake_info, create_access_token(private_key, time_created),
+                                                  None, False, False)
+        assert result['session']['userId'] == 'userId'
+
+
+def test_the_token_is_decoded_once_when_it_is_verified(monkeypatch):
+    now = get_timestamp_ms()
+    old_private_key, old_key = create_key(now - 20000)
+    _, new_key = create_key(now - 10000)
+    handshake_info = create_handshake_info()
+    handshake_info.set_jwt_signing_public_key_list([old_key, new_key])
+    ring = handshake_info.signing_key_ring
+    decoded_tokens = []
+    decode_jwt = access_token_module.decode_jwt
+
+    def counting_decode_jwt(jwt):
+        decoded_tokens.append(jwt)
+        return decode_jwt(jwt)
+
+    monkeypatch.setattr(access_token_module, 'decode_jwt', counting_decode_jwt)
+    found, access_token_info, key = verify_access_token_with_signing_keys(
+        ring, create_access_token(old_private_key, now - 15000), False)
+    assert found and access_token_info['userId'] == 'userId' and key.public_key == old_key['publicKey']
+    assert len(decoded_tokens) == 1
+
+    # the token claims to be signed by the newest key, which fails to verify it
+    assert verify_access_token_with_signing_keys(ring, create_access_token(old_private_key, now), False) == \
+        (True, None, None)
+    assert len(decoded_tokens) == 2
+
+
+def test_valid_keys_are_only_recomputed_when_a_key_expires():
+    now = get_timestamp_ms()
+    _, key = create_key(now - 10000)
+    _, expiring_key = create_key(now - 20000)
+    expiring_key['expiryTime'] = get_timestamp_ms() + 300
+    handshake_info = create_handshake_info()
+    handshake_info.set_jwt_signing_public_key_list([expiring_key, key])
+    ring = handshake_info.signing_key_ring
+
+    valid_keys = ring.get_valid_keys()
+    assert len(valid_keys) == 2
+    assert ring.get_valid_keys() is valid_keys
+    assert ring.get_keys_for_token(now - 15000) is ring.get_keys_for_token(now - 15000)
+    assert handshake_info.get_jwt_signing_public_key_list() == [key, expiring_key]
+
+    time.sleep(0.35)
+    assert [k.public_key for k in ring.get_valid_keys()] == [key['publicKey']]
+    assert handshake_info.get_jwt_signing_public_key_list() == [key]
+
+
+def test_parsed_keys_are_reused_when_the_key_list_is_updated():
+    now = get_timestamp_ms()
+    _, key = create_key(now)
+    handshake_info = create_handshake_info()
+    handshake_info.set_jwt_signing_public_key_list([key])
+    ring = handshake_info.signing_key_ring
+
+    handshake_info.set_jwt_signing_public_key_list([dict(key)])
+    assert handshake_info.signing_key_ring is ring
+
+    _, new_key = create_key(now + 1000)
+    handshake_info.set_jwt_signing_public_key_list([new_key, {**key, 'createdAt': now + 1}])
+    assert handshake_info.signing_key_ring is not ring
+    assert handshake_info.signing_key_ring.keys[1].verifier is ring.keys[0].verifier
@@ -0,0 +1,81 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+from pytest import fixture
+
+from supertokens_python.normalised_url_domain import NormalisedURLDomain
+from supertokens_python.normalised_url_path import NormalisedURLPath
+from supertokens_python.querier import Querier
+from supertokens_python.supertokens import Host
+
+
+class CoreHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == '/apiversion':
+            self.send_json({'versions': ['2.9']})
+        else:
+            self.send_json({'status': 'OK', 'path': self.path, 'cdi': self.headers.get('cdi-version')})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['content-length'])))
+        self.send_json({'status': 'OK', 'body': body})
+
+    def send_json(self, body):
+        content = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('content-type', 'application/json')
+        self.send_header('content-length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+@fixture(scope='function')
+def core_host():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), CoreHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    uri = 'http://127.0.0.1:' + str(server.server_port)
+    Querier.reset()
+    Querier.init([Host(NormalisedURLDomain('http://127.0.0.1:1'), NormalisedURLPath('')),
+                  Host(NormalisedURLDomain(uri), NormalisedURLPath(''))])
+    yield
+    Querier.close_connection_pool()
+    Querier.reset()
+    server.shutdown()
+    server.server_close()
+
+
+def test_sync_requests_fail_over_and_do_not_need_an_event_loop(core_host):
+    querier = Querier.get_instance('session')
+    responses = []
+
+    def send_requests():
+        # threads other than the main one do not have an event loop
+        for _ in range(3):
+            responses.append(querier.sync_send_get_request(NormalisedURLPath('/recipe/session'),
+                                                           {'sessionHandle': 'h'}))
+        responses.append(querier.sync_send_post_request(NormalisedURLPath('/recipe/session/verify'),
+                                                        {'accessToken': 't'}))
+
+    thread = Thread(target=send_requests)
+    thread.start()
+    thread.join(10)
+
+    assert responses[:3] == [{'status': 'OK', 'path': '/recipe/session?sessionHandle=h', 'cdi': '2.9'}] * 3
+    assert responses[3] == {'status': 'OK', 'body': {'accessToken': 't'}}
@@ -0,0 +1,103 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from asyncio import gather
+
+from pytest import mark
+
+from supertokens_python import init, SupertokensConfig, InputAppInfo
+from supertokens_python.recipe import session
+from supertokens_python.recipe.session.access_token import AccessTokenPayloadView
+from supertokens_python.recipe.session.exceptions import TryRefreshTokenError
+from supertokens_python.recipe.session.recipe import SessionRecipe
+from supertokens_python.recipe.session.signing_key_ring import SigningKeyRing
+from supertokens_python.recipe.session.utils import AccessTokenVerificationConfig
+from supertokens_python.recipe.session.verification_executor import VerificationExecutor
+from supertokens_python.utils import get_timestamp_ms
+from tests.utils import create_key, create_access_token, reset
+
+
+def setup_function(f):
+    reset()
+
+
+def teardown_function(f):
+    reset()
+
+
+@mark.asyncio
+async def test_slow_verifications_are_offloaded_to_the_executor():
+    private_key, key = create_key(get_timestamp_ms() - 1000)
+    ring = SigningKeyRing([key])
+    access_token = create_access_token(private_key, get_timestamp_ms())
+    executor = VerificationExecutor(AccessTokenVerificationConfig(executor='thread', offload_threshold_us=0,
+                                                                  max_pending_verifications=5))
+    try:
+        results = await gather(*[executor.verify(ring, access_token, False) for _ in range(10)])
+    finally:
+        executor.shutdown()
+
+    assert all(found and info['userId'] == 'userId' and verified_by is ring.keys[0]
+               for found, info, verified_by in results)
+    stats = executor.get_stats()
+    # the first token is verified inline to measure the cost, and then the
+    # tokens that do not fit in the queue wait for it instead of being
+    # verified on the event loop
+    assert stats['inlineVerifications'] == 1
+    assert stats['offloadedVerifications'] == 9
+    assert stats['queueFullVerifications'] == 4
+    assert stats['pending'] == 0
+
+    executor = VerificationExecutor(AccessTokenVerificationConfig(executor='thread', offload_threshold_us=1000000))
+    await gather(*[executor.verify(ring, access_token, False) for _ in range(3)])
+    assert executor.get_stats()['offloadedVerifications'] == 0
+
+
+@mark.asyncio
+async def test_process_executor_returns_the_keys_of_the_ring():
+    private_key, key = create_key(get_timestamp_ms() - 1000)
+    ring = SigningKeyRing([key])
+    access_token = create_access_token(private_key, get_timestamp_ms())
+    executor = VerificationExecutor(AccessTokenVerificationConfig(executor='process', offload_threshold_us=0,
+                                                                  executor_max_workers=1))
+    try:
+        await executor.verify(ring, access_token, False)
+        found, info, verified_by = await executor.verify(ring, access_token, False)
+        verifications = await executor.verify_many(ring, [access_token, 'invalid'])
+    finally:
+        executor.shutdown()
+
+    assert executor.get_stats()['offloadedVerifications'] == 3
+    # keys can not be sent across processes, so they are looked up by their public key
+    assert found and info['userId'] == 'userId' and verified_by is ring.keys[0]
+    assert isinstance(info['userData'], AccessTokenPayloadView) and info['userData'].materialise() == {}
+    assert verifications[0][1]['userId'] == 'userId' and verifications[0][2] is ring.keys[0]
+    assert isinstance(verifications[1], TryRefreshTokenError)
+
+
+def test_executor_is_shut_down_when_the_recipe_is_reset(monkeypatch):
+    init(
+        supertokens_config=SupertokensConfig('http://localhost:3567'),
+        app_info=InputAppInfo(
+            app_name='SuperTokens Demo',
+            api_domain='api.supertokens.io',
+            website_domain='supertokens.io'
+        ),
+        framework='fastapi',
+        recipe_list=[session.init(access_token_verification=AccessTokenVerificationConfig(executor='thread'))]
+    )
+    executor = SessionRecipe.get_instance().recipe_implementation.verification_executor
+    shutdowns = []
+    monkeypatch.setattr(executor, 'shutdown', lambda: shutdowns.append(executor))
+    reset()
+    assert shutdowns == [executor]
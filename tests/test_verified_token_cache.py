@@ -0,0 +1,52 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from supertokens_python.recipe.session.access_token import materialise_access_token_payload
+from supertokens_python.recipe.session.session_functions import get_session_without_calling_core
+from supertokens_python.recipe.session.utils import AccessTokenVerificationConfig
+from supertokens_python.recipe.session.verified_token_cache import VerifiedAccessTokenCache
+from supertokens_python.utils import get_timestamp_ms
+from tests.utils import create_key, create_access_token, create_handshake_info
+
+
+def test_verified_tokens_are_only_cached_on_request():
+    assert AccessTokenVerificationConfig().cache_verified_tokens is False
+
+
+def test_verified_tokens_are_cached_until_their_signing_key_is_removed():
+    now = get_timestamp_ms()
+    private_key, key = create_key(now - 10000)
+    handshake_info = create_handshake_info()
+    handshake_info.set_jwt_signing_public_key_list([key])
+    cache = VerifiedAccessTokenCache(max_size=1)
+    access_token = create_access_token(private_key, now)
+
+    for _ in range(3):
+        result = get_session_without_calling_core(handshake_info, access_token, None, False, False, cache)
+        access_token_payload = materialise_access_token_payload(result['session']['userDataInJWT'])
+        assert access_token_payload == {}
+        access_token_payload['changed'] = True
+    assert cache.get_stats()['hits'] == 2
+    assert cache.get_stats()['entries'] == 1
+
+    other_token = create_access_token(private_key, now + 1)
+    get_session_without_calling_core(handshake_info, other_token, None, False, False, cache)
+    assert cache.get_stats()['evictions'] == 1
+    assert cache.get(access_token, handshake_info.signing_key_ring) is None
+
+    _, new_key = create_key(now)
+    handshake_info.set_jwt_signing_public_key_list([new_key, key])
+    assert cache.get(other_token, handshake_info.signing_key_ring) is not None
+    handshake_info.set_jwt_signing_public_key_list([new_key])
+    assert cache.get(other_token, handshake_info.signing_key_ring) is None
+    assert cache.get_stats()['entries'] == 0
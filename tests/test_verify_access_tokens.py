@@ -0,0 +1,126 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from asyncio import sleep
+
+from pytest import mark
+
+from supertokens_python.recipe.session.interfaces import RecipeInterface
+from supertokens_python.recipe.session.recipe_implementation import HandshakeInfo
+from supertokens_python.recipe.session.session_functions import verify_access_tokens, \
+    MAX_CONCURRENT_CORE_VERIFICATIONS
+from supertokens_python.recipe.session.utils import AccessTokenVerificationConfig
+from supertokens_python.recipe.session.verification_executor import VerificationExecutor
+from supertokens_python.recipe.session.verified_token_cache import VerifiedAccessTokenCache
+from supertokens_python.utils import get_timestamp_ms
+from tests.utils import create_key, create_access_token, create_handshake_info
+
+
+class FakeQuerier:
+    def __init__(self):
+        self.verified_tokens = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def send_post_request(self, path, data):
+        assert path.get_as_string_dangerous() == '/recipe/session/verify'
+        self.verified_tokens.append(data['accessToken'])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await sleep(0.001)
+        self.in_flight -= 1
+        return {
+            'status': 'OK',
+            'session': {'handle': 'handle', 'userId': 'userId', 'userDataInJWT': {}},
+            'accessToken': {'token': 'newAccessToken'},
+            'jwtSigningPublicKeyList': None,
+            'jwtSigningPublicKey': None,
+            'jwtSigningPublicKeyExpiryTime': None
+        }
+
+
+class FakeRecipeImplementation:
+    def __init__(self, handshake_info: HandshakeInfo, verification_executor=None):
+        self.handshake_info = handshake_info
+        self.querier = FakeQuerier()
+        self.verified_token_cache = VerifiedAccessTokenCache()
+        self.verification_executor = verification_executor
+        self.revocation_cache = None
+
+    async def get_handshake_info(self, force_refetch=False):
+        return self.handshake_info
+
+    def update_jwt_signing_public_key_info(self, key_list, public_key, expiry_time):
+        pass
+
+
+@mark.asyncio
+@mark.parametrize('executor', [None, 'thread'])
+async def test_verify_access_tokens(executor):
+    now = get_timestamp_ms()
+    old_private_key, old_key = create_key(now - 20000)
+    new_private_key, new_key = create_key(now - 10000)
+    handshake_info = create_handshake_info()
+    handshake_info.set_jwt_signing_public_key_list([old_key, new_key])
+    verification_executor = None
+    if executor is not None:
+        verification_executor = VerificationExecutor(AccessTokenVerificationConfig(executor=executor,
+                                                                                   offload_threshold_us=0))
+    recipe_implementation = FakeRecipeImplementation(handshake_info, verification_executor)
+    old_token = create_access_token(old_private_key, now - 15000)
+    new_token = create_access_token(new_private_key, now)
+    refreshed_token = create_access_token(new_private_key, now, 'parentHash')
+    tokens = [old_token, new_token, 'invalid', refreshed_token, old_token]
+
+    for _ in range(2):
+        results = await verify_access_tokens(recipe_implementation, tokens)
+        assert [result.status for result in results] == ['OK', 'OK', 'TRY_REFRESH_TOKEN_ERROR', 'OK', 'OK']
+        assert results[0].user_id == 'userId' and results[0].new_access_token is None
+        assert results[3].new_access_token == {'token': 'newAccessToken'}
+    if verification_executor is not None:
+        verification_executor.shutdown()
+
+    # only the token that has a parent refresh token has to be verified by the core
+    assert recipe_implementation.querier.verified_tokens == [refreshed_token, refreshed_token]
+    assert recipe_implementation.verified_token_cache.get_stats()['hits'] >= 2
+
+
+@mark.asyncio
+async def test_core_verifications_of_a_batch_are_bounded():
+    now = get_timestamp_ms()
+    private_key, key = create_key(now - 10000)
+    handshake_info = create_handshake_info()
+    handshake_info.set_jwt_signing_public_key_list([key])
+    recipe_implementation = FakeRecipeImplementation(handshake_info)
+    tokens = [create_access_token(private_key, now + i, 'parentHash') for i in range(50)]
+
+    results = await verify_access_tokens(recipe_implementation, tokens)
+    assert all(result.status == 'OK' for result in results)
+    assert sorted(recipe_implementation.querier.verified_tokens) == sorted(tokens)
+    assert recipe_implementation.querier.max_in_flight == MAX_CONCURRENT_CORE_VERIFICATIONS
+
+
+@mark.asyncio
+async def test_recipe_interfaces_verify_access_tokens_one_by_one_by_default():
+    assert 'verify_access_tokens' not in RecipeInterface.__abstractmethods__
+    now = get_timestamp_ms()
+    private_key, key = create_key(now - 10000)
+    handshake_info = create_handshake_info()
+    handshake_info.set_jwt_signing_public_key_list([key])
+    recipe_implementation = FakeRecipeImplementation(handshake_info)
+    tokens = [create_access_token(private_key, now), 'invalid', create_access_token(private_key, now, 'parentHash')]
+
+    results = await RecipeInterface.verify_access_tokens(recipe_implementation, tokens)
+    assert [result.status for result in results] == ['OK', 'TRY_REFRESH_TOKEN_ERROR', 'OK']
+    assert results[0].user_id == 'userId' and results[0].new_access_token is None
+    assert results[2].new_access_token == {'token': 'newAccessToken'}
@@ -11,24 +11,33 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+from base64 import b64encode
 from datetime import datetime, timezone
 from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps
 from os import environ, scandir, kill, remove
 from shutil import rmtree
 from signal import SIGTERM
 from subprocess import run, DEVNULL
+from threading import Thread
 from time import sleep
 
+from Crypto.Hash import SHA256
+from Crypto.PublicKey import RSA
+from Crypto.Signature.pkcs1_15 import PKCS115_SigScheme
 from requests.models import Response
 
 from supertokens_python.recipe.emailpassword import EmailPasswordRecipe
 from supertokens_python.recipe.emailverification import EmailVerificationRecipe
 from supertokens_python.recipe.jwt import JWTRecipe
 from supertokens_python.recipe.session import SessionRecipe
+from supertokens_python.recipe.session.recipe_implementation import HandshakeInfo
 from yaml import dump, load, FullLoader
 
 from supertokens_python import Supertokens
 from supertokens_python.process_state import ProcessState
+from supertokens_python.utils import get_timestamp_ms, utf_base64encode
 from supertokens_python.recipe.thirdparty import ThirdPartyRecipe
 from supertokens_python.recipe.thirdpartyemailpassword import ThirdPartyEmailPasswordRecipe
 
@@ -248,3 +257,61 @@ def email_verify_token_request(
             'sIdRefreshToken': idRefreshTokenFromCookie,
         },
         data=str.encode(userId))
+
+
+def create_key(created_at: int):
+    private_key = RSA.generate(2048)
+    public_key = private_key.publickey().export_key('DER')
+    return private_key, {
+        'publicKey': b64encode(public_key).decode('utf-8'),
+        'expiryTime': get_timestamp_ms() + 3600000,
+        'createdAt': created_at
+    }
+
+
+def create_access_token(private_key, time_created: int, parent_refresh_token_hash: str = None) -> str:
+    header = utf_base64encode(dumps({'alg': 'RS256', 'typ': 'JWT', 'version': '2'},
+                                    separators=(',', ':'), sort_keys=True))
+    payload = utf_base64encode(dumps({
+        'sessionHandle': 'handle',
+        'userId': 'userId',
+        'refreshTokenHash1': 'hash',
+        'parentRefreshTokenHash1': parent_refresh_token_hash,
+        'userData': {},
+        'antiCsrfToken': None,
+        'expiryTime': get_timestamp_ms() + 3600000,
+        'timeCreated': time_created
+    }))
+    signature = PKCS115_SigScheme(private_key).sign(SHA256.new((header + '.' + payload).encode('utf-8')))
+    return header + '.' + payload + '.' + b64encode(signature).decode('utf-8')
+
+
+def create_handshake_info() -> HandshakeInfo:
+    return HandshakeInfo({
+        'accessTokenBlacklistingEnabled': False,
+        'antiCsrf': 'NONE',
+        'accessTokenValidity': 3600,
+        'refreshTokenValidity': 144000
+    })
+
+
+def start_core(delay_seconds, keep_alive=False):
+    class CoreHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1' if keep_alive else 'HTTP/1.0'
+
+        def do_GET(self):
+            if self.path != '/apiversion':
+                sleep(delay_seconds)
+            content = dumps({'status': 'OK', 'versions': ['2.9'], 'delay': delay_seconds}).encode('utf-8')
+            self.send_response(200)
+            self.send_header('content-type', 'application/json')
+            self.send_header('content-length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), CoreHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server